@@ -0,0 +1,49 @@
+"""
+UptimeGuard Probe Agent
+Copyright (c) 2025 Mac GunJon
+Standalone Entry Point for Distributed Probing
+"""
+
+import argparse
+import asyncio
+import socket
+
+from core.config import COORDINATOR_HOST, COORDINATOR_PORT
+from core.logger import setup_logger
+from services.agent import run_agent
+
+logger = setup_logger()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="UptimeGuard probe agent")
+    parser.add_argument(
+        "--name",
+        default=socket.gethostname(),
+        help="Unique agent name (default: hostname)",
+    )
+    parser.add_argument(
+        "--host",
+        default=COORDINATOR_HOST,
+        help="Coordinator host",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=COORDINATOR_PORT,
+        help="Coordinator port",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if not args.port:
+        logger.critical("Coordinator port missing (--port or COORDINATOR_PORT)")
+        raise SystemExit(1)
+
+    try:
+        asyncio.run(run_agent(name=args.name, host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        logger.warning("Probe agent interrupted manually")
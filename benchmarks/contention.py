@@ -0,0 +1,258 @@
+"""
+Store Contention Benchmark
+Copyright (c) 2025 Mac GunJon
+Lock wait and command latency under check load: global-lock store
+vs single-writer store with batched ingest and view reads
+
+Usage: python -m benchmarks.contention [--targets 10000] [--results 50000]
+                                      [--batch INGEST_BATCH]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from core.config import INGEST_BATCH
+from data.store import MonitorStore
+from services.check_engine import CheckResult
+from services.ingest import ResultIngestor
+from services.monitor_service import status_update
+
+GUILD = 1
+PRODUCERS = 100  # concurrent check completions
+READ_EVERY = 0.005  # seconds between simulated slash commands
+
+
+# --------------------------------------------------
+# GLOBAL-LOCK STORE (BEFORE)
+# --------------------------------------------------
+class TimedLock(asyncio.Lock):
+    def __init__(self):
+        super().__init__()
+        self.acquired = 0
+        self.wait = 0.0
+        self.max_wait = 0.0
+        self.held = 0.0
+        self._since = 0.0
+
+    async def acquire(self):
+        started = time.perf_counter()
+        await super().acquire()
+        self._since = time.perf_counter()
+        waited = self._since - started
+        self.acquired += 1
+        self.wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return True
+
+    def release(self):
+        self.held += time.perf_counter() - self._since
+        super().release()
+
+
+class LockedStore:
+    """
+    The store as it was: dict targets, one asyncio.Lock around every
+    update and read, name lookups by scan.
+    """
+
+    def __init__(self, count: int):
+        self._lock = TimedLock()
+        self._targets = {
+            f"https://bench-{i}.example": {
+                "name": f"bench-{i}",
+                "url": f"https://bench-{i}.example",
+                "last_status": None,
+                "fails": 0,
+                "checks": 0,
+                "success": 0,
+                "response_times": [],
+            }
+            for i in range(count)
+        }
+
+    def _find_by_name(self, name: str):
+        for target in self._targets.values():
+            if target["name"].lower() == name.lower():
+                return target
+        return None
+
+    async def update_status(self, *, url, status, failed, response_time=None):
+        async with self._lock:
+            target = self._targets.get(url)
+            if not target:
+                return
+            target["last_status"] = status
+            target["checks"] += 1
+            if failed:
+                target["fails"] += 1
+            else:
+                target["fails"] = 0
+                target["success"] += 1
+            if response_time is not None:
+                target["response_times"].append(response_time)
+                target["response_times"] = target["response_times"][-20:]
+
+    async def all(self):
+        async with self._lock:
+            return list(self._targets.values())
+
+    async def uptime_percentage(self, name: str) -> float:
+        async with self._lock:
+            target = self._find_by_name(name)
+            if not target or target["checks"] == 0:
+                return 0.0
+            return (target["success"] / target["checks"]) * 100
+
+
+# --------------------------------------------------
+# LOAD
+# --------------------------------------------------
+def make_results(count: int, total: int):
+    results = []
+    for _ in range(total):
+        i = random.randrange(count)
+        key = f"1:https://bench-{i}.example"
+        if random.random() < 0.02:
+            results.append(CheckResult(key, None, None, {}))
+        else:
+            results.append(CheckResult(key, 200, random.uniform(0.05, 0.5), {}))
+    return results
+
+
+async def produce(results, submit):
+    async def producer(chunk):
+        for result in chunk:
+            await asyncio.sleep(0)  # the probe's I/O
+            await submit(result)
+
+    await asyncio.gather(
+        *(producer(results[i::PRODUCERS]) for i in range(PRODUCERS))
+    )
+
+
+async def read_loop(read, latencies, stop: asyncio.Event):
+    """
+    One simulated command every READ_EVERY: latency is the event
+    loop delay before it runs plus the read itself.
+    """
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(READ_EVERY)
+        await read()
+        latencies.append(time.perf_counter() - started - READ_EVERY)
+
+
+def summarize(latencies) -> str:
+    ms = sorted(l * 1000 for l in latencies)
+    p99 = ms[int(len(ms) * 0.99) - 1] if len(ms) >= 100 else ms[-1]
+    return (
+        f"reads {len(ms):>5} | p50 {statistics.median(ms):7.2f} ms | "
+        f"p99 {p99:7.2f} ms | max {ms[-1]:7.2f} ms"
+    )
+
+
+async def before(count: int, results) -> None:
+    store = LockedStore(count)
+    latencies = []
+    stop = asyncio.Event()
+    names = [f"BENCH-{random.randrange(count)}" for _ in range(64)]
+
+    async def read():
+        if random.random() < 0.5:
+            await store.all()  # /status
+        else:
+            await store.uptime_percentage(random.choice(names))  # /metrics
+
+    async def submit(result):
+        await store.update_status(
+            url=result.key.partition(":")[2],
+            status=result.status,
+            failed=result.failed,
+            response_time=result.elapsed,
+        )
+
+    reader = asyncio.create_task(read_loop(read, latencies, stop))
+    started = time.perf_counter()
+    await produce(results, submit)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await reader
+
+    lock = store._lock
+    print(
+        f"global lock   {len(results) / elapsed:>9,.0f} results/s | "
+        f"lock acquisitions {lock.acquired:,} | wait total "
+        f"{lock.wait * 1000:.1f} ms (max {lock.max_wait * 1000:.2f} ms) | "
+        f"held {lock.held:.2f}s"
+    )
+    print(f"              {summarize(latencies)}")
+
+
+async def after(count: int, results, *, batch_size: int) -> None:
+    store = MonitorStore()
+    for i in range(count):
+        await store.add(
+            guild_id=GUILD, name=f"bench-{i}", url=f"https://bench-{i}.example"
+        )
+    targets = {t.key: t for t in await store.all()}
+    await store.view(GUILD)  # first publish copies every target
+
+    ingestor = ResultIngestor(
+        capacity=10000, batch_size=batch_size, flush_interval=0.05
+    )
+    drained = asyncio.Event()
+
+    async def handler(batch):
+        await store.apply_batch([status_update(r) for _, r in batch])
+        if ingestor.applied + len(batch) >= len(results):
+            drained.set()
+
+    latencies = []
+    stop = asyncio.Event()
+    names = [f"BENCH-{random.randrange(count)}" for _ in range(64)]
+
+    async def read():
+        view = await store.view(GUILD)
+        if random.random() < 0.5:
+            view.targets  # /status
+        else:
+            view.get_by_name(random.choice(names))  # /metrics
+
+    async def submit(result):
+        await ingestor.submit(targets[result.key], result)
+
+    drainer = asyncio.create_task(ingestor.run(handler))
+    reader = asyncio.create_task(read_loop(read, latencies, stop))
+    started = time.perf_counter()
+    await produce(results, submit)
+    await drained.wait()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await reader
+    drainer.cancel()
+
+    print(
+        f"single writer {len(results) / elapsed:>9,.0f} results/s | "
+        f"no lock | avg batch {ingestor.stats()['avg_batch']:.0f}"
+    )
+    print(f"              {summarize(latencies)}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--targets", type=int, default=10000)
+    parser.add_argument("--results", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=INGEST_BATCH)
+    args = parser.parse_args()
+
+    results = make_results(args.targets, args.results)
+    print(f"{args.targets} targets, {len(results)} results, {PRODUCERS} producers")
+    await before(args.targets, results)
+    await after(args.targets, results, batch_size=args.batch)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+Result Ingestion Benchmark
+Copyright (c) 2025 Mac GunJon
+Results/second applied to the store, per result vs batched
+
+Usage: python -m benchmarks.ingest [--targets 10000] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from data.models import StatusUpdate, target_key
+from data.store import MonitorStore
+from services.check_engine import CheckResult
+from services.ingest import ResultIngestor
+from services.monitor_service import status_update
+
+GUILD = 1
+PHASES = {"dns": 0.002, "connect": 0.01, "tls": 0.02, "ttfb": 0.05}
+
+
+def make_results(keys, rounds: int):
+    results = []
+    for _ in range(rounds):
+        for key in keys:
+            if random.random() < 0.02:
+                results.append(CheckResult(key, None, None, {}))
+            else:
+                results.append(
+                    CheckResult(key, 200, random.uniform(0.05, 0.5), PHASES)
+                )
+    return results
+
+
+async def fresh_store(count: int) -> MonitorStore:
+    store = MonitorStore()
+    for i in range(count):
+        await store.add(
+            guild_id=GUILD, name=f"bench-{i}", url=f"https://bench-{i}.example"
+        )
+    return store
+
+
+async def per_result(count: int, results) -> float:
+    store = await fresh_store(count)
+
+    started = time.perf_counter()
+    for result in results:
+        update: StatusUpdate = status_update(result)
+        await store.update_status(
+            key=update.key,
+            status=update.status,
+            failed=update.failed,
+            response_time=update.response_time,
+            phases=update.phases,
+        )
+    return len(results) / (time.perf_counter() - started)
+
+
+async def batched(count: int, results, *, batch_size: int) -> tuple:
+    store = await fresh_store(count)
+    ingestor = ResultIngestor(
+        capacity=10000, batch_size=batch_size, flush_interval=0.05
+    )
+    done = asyncio.Event()
+
+    async def handler(batch):
+        await store.apply_batch([status_update(r) for _, r in batch])
+        if ingestor.applied + len(batch) >= len(results):
+            done.set()
+
+    drainer = asyncio.create_task(ingestor.run(handler))
+    targets = {t.key: t for t in await store.all()}
+
+    started = time.perf_counter()
+    for result in results:
+        await ingestor.submit(targets[result.key], result)
+    await done.wait()
+    rate = len(results) / (time.perf_counter() - started)
+
+    drainer.cancel()
+    return rate, ingestor.stats()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--targets", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    keys = [
+        target_key(GUILD, f"https://bench-{i}.example")
+        for i in range(args.targets)
+    ]
+    results = make_results(keys, args.rounds)
+    print(f"{args.targets} targets, {len(results)} results")
+
+    rate = await per_result(args.targets, results)
+    print(f"update_status per result   {rate:>10,.0f} results/s")
+
+    for batch_size in (100, 500, 2000):
+        rate, stats = await batched(args.targets, results, batch_size=batch_size)
+        print(
+            f"queue + apply_batch ({batch_size:>4})  {rate:>10,.0f} results/s | "
+            f"avg batch {stats['avg_batch']:.0f} | "
+            f"blocked {stats['blocked']} ({stats['blocked_time']:.2f}s) | "
+            f"peak depth {stats['max_depth']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Target Lookup Benchmark
+Copyright (c) 2025 Mac GunJon
+Name and URL lookups: linear scan (pre-index store) vs indexes
+
+Usage: python -m benchmarks.lookup [--targets 10000 100000] [--lookups 200]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from data.store import MonitorStore
+
+GUILD = 1
+
+
+# --------------------------------------------------
+# PRE-INDEX STORE (LINEAR SCANS)
+# --------------------------------------------------
+def scan_by_name(targets: dict, name: str):
+    for target in targets.values():
+        if target["name"].lower() == name.lower():
+            return target
+    return None
+
+
+def scan_by_url(targets: list, url: str):
+    # the alert path searched store.all() after every check
+    for target in targets:
+        if target["url"] == url:
+            return target
+    return None
+
+
+def per_lookup(fn, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - started) / len(items) * 1e6  # µs
+
+
+async def run(count: int, lookups: int):
+    legacy = {
+        f"https://bench-{i}.example": {
+            "name": f"bench-{i}",
+            "url": f"https://bench-{i}.example",
+        }
+        for i in range(count)
+    }
+    legacy_list = list(legacy.values())
+
+    store = MonitorStore()
+    for i in range(count):
+        await store.add(
+            guild_id=GUILD, name=f"bench-{i}", url=f"https://bench-{i}.example"
+        )
+    keys = {t.name: t.key for t in await store.all()}
+
+    picks = [f"bench-{random.randrange(count)}" for _ in range(lookups)]
+    urls = [f"https://{name}.example" for name in picks]
+    upper = [name.upper() for name in picks]  # names match case-insensitively
+
+    scan_name = per_lookup(lambda n: scan_by_name(legacy, n), upper)
+    scan_url = per_lookup(lambda u: scan_by_url(legacy_list, u), urls)
+    index_name = per_lookup(lambda n: store._find(GUILD, n), upper)
+    index_key = per_lookup(store._targets.get, [keys[n] for n in picks])
+
+    print(f"{count} targets")
+    print(f"  by name  scan {scan_name:>10.1f} µs | index {index_name:>6.2f} µs")
+    print(f"  by URL   scan {scan_url:>10.1f} µs | index {index_key:>6.2f} µs")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--targets", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    for count in args.targets:
+        await run(count, args.lookups)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
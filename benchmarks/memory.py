@@ -0,0 +1,175 @@
+"""
+Target Memory Benchmark
+Copyright (c) 2025 Mac GunJon
+Bytes per target: pre-slots dict record vs Target, empty and in steady
+state, with the record and each metric history reported separately
+
+Usage: python -m benchmarks.memory [--targets 200] [--days 1]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+from core.config import CHECK_INTERVAL
+from data.models import StatusUpdate, Target
+from data.store import MonitorStore
+
+PHASES = ("dns", "connect", "tls", "ttfb")
+
+
+# --------------------------------------------------
+# PRE-SLOTS RECORD
+# --------------------------------------------------
+def legacy_target(i: int) -> dict:
+    return {
+        "name": f"bench-{i}",
+        "url": f"https://bench-{i}.example",
+        "paused": False,
+        "last_status": None,
+        "last_checked": None,
+        "fails": 0,
+        "alerted_down": False,
+        "checks": 0,
+        "success": 0,
+        "response_times": [],
+        "created_at": datetime.utcnow(),
+    }
+
+
+def legacy_apply(target: dict, latency: float | None):
+    target["last_status"] = 200 if latency is not None else "DOWN"
+    target["last_checked"] = datetime.utcnow()
+    target["checks"] += 1
+    if latency is None:
+        target["fails"] += 1
+    else:
+        target["fails"] = 0
+        target["success"] += 1
+        target["response_times"].append(latency)
+        target["response_times"] = target["response_times"][-20:]
+
+
+# --------------------------------------------------
+# MEASUREMENT
+# --------------------------------------------------
+LEGACY_HISTORY = ("response_times",)
+TARGET_HISTORY = ("response_times", "phase_times", "rollups", "latency_sketches")
+
+
+def measure(build, fields, drop) -> tuple:
+    """
+    Bytes allocated by `build()`, split into the record itself and
+    each history field: a field's share is what dropping it from
+    every record frees.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = build()
+    gc.collect()
+    total = tracemalloc.get_traced_memory()[0] - before
+
+    history = {}
+    for name in fields:
+        held = tracemalloc.get_traced_memory()[0]
+        for record in records:
+            drop(record, name)
+        gc.collect()
+        history[name] = held - tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+    return total - sum(history.values()), history
+
+
+def drop_key(record: dict, name: str):
+    record[name] = None
+
+
+def drop_attr(record: Target, name: str):
+    setattr(record, name, None)
+
+
+def latency() -> float | None:
+    if random.random() < 0.02:
+        return None
+    return random.lognormvariate(-2.0, 0.6)  # median ~135ms
+
+
+def checks(days: float):
+    """
+    Unix timestamps of a target's checks over `days`, ending now.
+    """
+    count = int(days * 86400 / CHECK_INTERVAL)
+    start = time.time() - count * CHECK_INTERVAL
+    return [start + i * CHECK_INTERVAL for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--targets", type=int, default=200)
+    parser.add_argument("--days", type=float, default=1.0)
+    args = parser.parse_args()
+    count = args.targets
+    stamps = checks(args.days)
+
+    def legacy_empty():
+        return [legacy_target(i) for i in range(count)]
+
+    def target_empty():
+        return [
+            Target(name=f"bench-{i}", url=f"https://bench-{i}.example", id=i + 1)
+            for i in range(count)
+        ]
+
+    def legacy_steady():
+        targets = legacy_empty()
+        for target in targets:
+            for _ in stamps:
+                legacy_apply(target, latency())
+        return targets
+
+    def target_steady():
+        targets = target_empty()
+        for target in targets:
+            for now in stamps:
+                value = latency()
+                phases = (
+                    {p: value / 5 for p in PHASES} | {"total": value}
+                    if value is not None else None
+                )
+                MonitorStore._apply(
+                    target,
+                    StatusUpdate(
+                        target.key, 200 if value else "DOWN", value is None,
+                        value, phases,
+                    ),
+                    now,
+                )
+        return targets
+
+    print(
+        f"{count} targets | steady state = {len(stamps)} checks each "
+        f"({args.days:g} days at {CHECK_INTERVAL}s) | bytes per target"
+    )
+    for label, build, fields, drop in (
+        ("dict   empty ", legacy_empty, LEGACY_HISTORY, drop_key),
+        ("Target empty ", target_empty, TARGET_HISTORY, drop_attr),
+        ("dict   steady", legacy_steady, LEGACY_HISTORY, drop_key),
+        ("Target steady", target_steady, TARGET_HISTORY, drop_attr),
+    ):
+        record, history = measure(build, fields, drop)
+        parts = " ".join(
+            f"{name}={size / count:,.0f}" for name, size in history.items()
+        )
+        print(
+            f"{label}  record {record / count:>6,.0f} | "
+            f"history {sum(history.values()) / count:>7,.0f} ({parts})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Snapshot Benchmark
+Copyright (c) 2025 Mac GunJon
+Save / restore time and size for steady-state targets, and the
+first view publish restore leaves for the first read
+
+Usage: python -m benchmarks.snapshot [--targets 100000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from data.models import StatusUpdate, Target
+from data.rollups import Rollups
+from data.store import MonitorStore
+
+GUILD = 1
+HISTORY_DAYS = 92  # fills every rollup tier
+
+
+def template_rollups() -> bytes:
+    """
+    Rollups of one target checked hourly for HISTORY_DAYS; every
+    benchmark target gets a copy instead of replaying the checks.
+    """
+    target = Target(name="template", url="https://template.example")
+    now = time.time()
+    for hour in range(HISTORY_DAYS * 24, 0, -1):
+        latency = random.uniform(0.05, 0.5)
+        MonitorStore._apply(
+            target,
+            StatusUpdate(target.key, 200, False, latency, None),
+            now - hour * 3600,
+        )
+    return target.rollups.to_bytes()
+
+
+async def run(count: int, path: str):
+    rollups = template_rollups()
+    store = MonitorStore()
+    for i in range(count):
+        target = Target(
+            name=f"bench-{i}",
+            url=f"https://bench-{i}.example",
+            id=i + 1,
+            guild_id=GUILD,
+            last_status=200,
+            last_checked=time.time(),
+            checks=HISTORY_DAYS * 24,
+            success=HISTORY_DAYS * 24,
+        )
+        target.rollups = Rollups()
+        target.rollups.load_bytes(rollups)
+        store._index(target)
+
+    started = time.perf_counter()
+    await store.save_snapshot(path)
+    saved = time.perf_counter() - started
+    size = os.path.getsize(path)
+    del store, target  # restore into a process holding one copy
+
+    restored = MonitorStore()
+    started = time.perf_counter()
+    await restored.load_snapshot(path)
+    loaded = time.perf_counter() - started
+    restored._snapshotter.cancel()
+
+    # the views restore leaves for the first read
+    started = time.perf_counter()
+    restored._partition(GUILD).view()
+    viewed = time.perf_counter() - started
+
+    assert len(restored._targets) == count
+    print(
+        f"{count} targets | {size / count:,.0f} bytes/target | "
+        f"{size / 1e6:.1f}MB\n"
+        f"save     {saved:.2f}s\n"
+        f"restore  {loaded:.2f}s\n"
+        f"1st view {viewed:.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--targets", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args.targets, os.path.join(directory, "bench.snap")))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ from discord.ext import commands
 
 from core.config import BOT_TOKEN
 from core.logger import setup_logger
+from data.store import store
 from services.monitor_service import start_monitor_loop
 from web.keep_alive import run_server 
 
@@ -96,9 +97,21 @@ async def on_app_command_error(interaction: discord.Interaction, error):
 # --------------------------------------------------
 # GRACEFUL SHUTDOWN (RENDER SAFE)
 # --------------------------------------------------
+async def close_store():
+    try:
+        await store.close()
+    except Exception as e:
+        logger.exception("Final state flush failed", exc_info=e)
+
+
+async def shutdown():
+    await close_store()
+    await bot.close()
+
+
 def shutdown_handler():
     logger.warning("Shutdown signal received. Closing bot safely...")
-    asyncio.create_task(bot.close())
+    asyncio.create_task(shutdown())
 
 
 def register_signal_handlers():
@@ -131,6 +144,12 @@ async def main():
 
     register_signal_handlers()
 
+    # --------------------------------------------------
+    # RESTORE STATE (BEFORE THE MONITOR LOOP STARTS)
+    # --------------------------------------------------
+    await store.load_from_db()
+    await store.load_snapshot()
+
     try:
         async with bot:
             await load_extensions_safe()
@@ -141,6 +160,8 @@ async def main():
     except Exception as e:
         logger.critical("Fatal startup error", exc_info=e)
         sys.exit(1)
+    finally:
+        await close_store()
 
 
 # --------------------------------------------------
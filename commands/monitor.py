@@ -8,15 +8,23 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
+from data.partition import NO_GUILD
 from data.store import store
 from core.embeds import success, error, info
+from services.probes import DEFAULT_PROBE, PROBE_LABELS, PROBE_MODES
 from services.url_utils import normalize_url
 
+PROBE_CHOICES = [
+    app_commands.Choice(name=PROBE_LABELS[mode], value=mode)
+    for mode in PROBE_MODES
+]
+
 
 class Monitor(commands.Cog):
     """
     Slash commands for managing monitored services.
-    All operations use SERVICE NAME except /add.
+    All operations use SERVICE NAME except /add, within the
+    invoking guild.
     """
 
     def __init__(self, bot: commands.Bot):
@@ -32,12 +40,15 @@ class Monitor(commands.Cog):
     @app_commands.describe(
         name="Service name (example: Main Website)",
         url="Website URL to monitor",
+        probe="How the service is checked (default: HTTP GET)",
     )
+    @app_commands.choices(probe=PROBE_CHOICES)
     async def add(
         self,
         interaction: discord.Interaction,
         name: str,
         url: str,
+        probe: app_commands.Choice[str] | None=None,
     ):
         await interaction.response.defer(ephemeral=True)
 
@@ -47,7 +58,19 @@ class Monitor(commands.Cog):
                 embed=error("Invalid URL format. Please provide a valid URL."),
             )
 
-        added = await store.add(name=name, url=normalized)
+        mode = probe.value if probe else DEFAULT_PROBE
+
+        guild_id = interaction.guild_id or NO_GUILD
+        if await store.guild_full(guild_id):
+            return await interaction.followup.send(
+                embed=error(
+                    "This server has reached its monitored service limit."
+                ),
+            )
+
+        added = await store.add(
+            guild_id=guild_id, name=name, url=normalized, probe=mode
+        )
         if not added:
             return await interaction.followup.send(
                 embed=error(
@@ -59,7 +82,8 @@ class Monitor(commands.Cog):
             embed=success(
                 "Monitoring started successfully.\n\n"
                 f"**Service Name:** `{name}`\n"
-                f"**URL:** `{normalized}`",
+                f"**URL:** `{normalized}`\n"
+                f"**Probe:** `{PROBE_LABELS[mode]}`",
                 requester=interaction.user,
             )
         )
@@ -78,7 +102,9 @@ class Monitor(commands.Cog):
     ):
         await interaction.response.defer(ephemeral=True)
 
-        removed = await store.remove_by_name(name)
+        removed = await store.remove_by_name(
+            interaction.guild_id or NO_GUILD, name
+        )
         if not removed:
             return await interaction.followup.send(
                 embed=error(f"No service found with name `{name}`."),
@@ -105,7 +131,9 @@ class Monitor(commands.Cog):
     ):
         await interaction.response.defer(ephemeral=True)
 
-        paused = await store.pause_by_name(name)
+        paused = await store.pause_by_name(
+            interaction.guild_id or NO_GUILD, name
+        )
         if not paused:
             return await interaction.followup.send(
                 embed=error(f"No service found with name `{name}`."),
@@ -133,7 +161,9 @@ class Monitor(commands.Cog):
     ):
         await interaction.response.defer(ephemeral=True)
 
-        resumed = await store.resume_by_name(name)
+        resumed = await store.resume_by_name(
+            interaction.guild_id or NO_GUILD, name
+        )
         if not resumed:
             return await interaction.followup.send(
                 embed=error(f"No service found with name `{name}`."),
@@ -146,6 +176,50 @@ class Monitor(commands.Cog):
             )
         )
 
+    # --------------------------------------------------
+    # /claim (NAME ONLY)
+    # --------------------------------------------------
+    @app_commands.command(
+        name="claim",
+        description="Move a service added before servers were separated into this server",
+    )
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_guild=True)
+    async def claim(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+    ):
+        await interaction.response.defer(ephemeral=True)
+
+        guild_id = interaction.guild_id
+        if not await store.get_by_name(NO_GUILD, name):
+            return await interaction.followup.send(
+                embed=error(f"No unclaimed service found with name `{name}`."),
+            )
+
+        if await store.guild_full(guild_id):
+            return await interaction.followup.send(
+                embed=error(
+                    "This server has reached its monitored service limit."
+                ),
+            )
+
+        claimed = await store.claim(guild_id, name)
+        if not claimed:
+            return await interaction.followup.send(
+                embed=error(
+                    "This service name or URL is already being monitored."
+                ),
+            )
+
+        await interaction.followup.send(
+            embed=success(
+                f"Service `{name}` now belongs to this server.",
+                requester=interaction.user,
+            )
+        )
+
 
 # --------------------------------------------------
 # COG SETUP
@@ -4,18 +4,65 @@ Copyright (c) 2025 Mac GunJon
 Production-Grade Monitoring Statistics
 """
 
+import time
+
 import discord
 from discord.ext import commands
 from discord import app_commands
 
+from data.partition import NO_GUILD
+from data.sketch import SKETCH_RESOLUTION
 from data.store import store
-from core.embeds import info, error, success
+from core.embeds import STATUS_BADGES, info, error, success, resolve_state
+from services.probes import (
+    LATENCY_PHASES,
+    PHASE_LABELS,
+    PROBE_LABELS,
+)
+from services import monitor_service
+from services.scheduler import scheduler
+
+RECENT_SAMPLES = 20  # response times listed by /latency
+
+HISTORY_WINDOWS = {
+    "1h": 3600,
+    "24h": 86400,
+    "7d": 7 * 86400,
+    "30d": 30 * 86400,
+}
+
+HISTORY_CHOICES = [
+    app_commands.Choice(name=label, value=label) for label in HISTORY_WINDOWS
+]
+
+
+def format_uptime(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:.2f}%"
+
+
+def format_percentiles(summary: dict) -> str:
+    parts = [
+        f"{label} `{summary[label]:.3f}s`"
+        for label in ("p50", "p90", "p99", "max")
+        if label in summary
+    ]
+    return " · ".join(parts) if parts else "n/a"
+
+
+def format_phases(phases: dict) -> str:
+    parts = [
+        f"{PHASE_LABELS[phase]} `{phases[phase]:.3f}s`"
+        for phase in LATENCY_PHASES
+        if phase in phases
+    ]
+    return " · ".join(parts) if parts else "n/a"
 
 
 class Stats(commands.Cog):
     """
     Read-only monitoring statistics & metrics commands.
-    All commands operate using SERVICE NAME.
+    All commands operate using SERVICE NAME, within the invoking
+    guild.
     """
 
     def __init__(self, bot: commands.Bot):
@@ -30,8 +77,9 @@ class Stats(commands.Cog):
     )
     async def status(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
+        guild_id = interaction.guild_id or NO_GUILD
 
-        targets = await store.all()
+        targets = (await store.view(guild_id)).targets
         if not targets:
             return await interaction.followup.send(
                 embed=info(
@@ -43,19 +91,11 @@ class Stats(commands.Cog):
 
         lines = []
         for t in targets:
-            status = t["last_status"]
-            paused = t["paused"]
-
-            if paused:
-                badge = "⏸️ PAUSED"
-            elif isinstance(status, int) and status < 400:
-                badge = "🟢 UP"
-            elif status:
-                badge = "🔴 DOWN"
-            else:
-                badge = "⚪ UNKNOWN"
+            state = resolve_state(t.last_status, paused=t.paused)
+            badge = STATUS_BADGES[state]
+            day = format_uptime(t.uptime_24h)
 
-            lines.append(f"**{t['name']}** → {badge}")
+            lines.append(f"**{t.name}** → {badge} · 24h `{day}`")
 
         await interaction.followup.send(
             embed=info(
@@ -74,36 +114,44 @@ class Stats(commands.Cog):
     )
     async def details(self, interaction: discord.Interaction, name: str):
         await interaction.response.defer(ephemeral=True)
+        guild_id = interaction.guild_id or NO_GUILD
 
-        target = await store.get_by_name(name)
+        target = (await store.view(guild_id)).get_by_name(name)
         if not target:
             return await interaction.followup.send(
                 embed=error(f"No service found with name `{name}`."),
             )
 
-        status = target["last_status"]
-        if target["paused"]:
-            state = "PAUSED"
-        elif isinstance(status, int) and status < 400:
-            state = "UP"
-        elif status:
-            state = "DOWN"
-        else:
-            state = "UNKNOWN"
+        status = target.last_status
+        state = resolve_state(status, paused=target.paused)
+        probe = target.probe
+
+        lateness = scheduler.lateness(target.key)
+        lateness_text = "n/a" if lateness is None else f"{lateness:.3f}s"
+
+        day = format_uptime(target.uptime_24h)
+
+        circuit = "n/a"
+        if monitor_service.engine:
+            circuit = monitor_service.engine.breaker_state(target.key)
 
         await interaction.followup.send(
             embed=info(
                 "Service Details",
                 (
-                    f"**Service:** `{target['name']}`\n"
-                    f"**URL:** `{target['url']}`\n"
+                    f"**Service:** `{target.name}`\n"
+                    f"**URL:** `{target.url}`\n"
+                    f"**Probe:** `{PROBE_LABELS.get(probe, probe)}`\n"
                     f"**Last Status:** `{status}`\n"
-                    f"**Fails:** `{target['fails']}`\n"
-                    f"**Last Checked:** `{target['last_checked']}`"
+                    f"**Fails:** `{target.fails}`\n"
+                    f"**Uptime (24h):** `{day}`\n"
+                    f"**Last Checked:** `{target.last_checked_at}`\n"
+                    f"**Check Lateness:** `{lateness_text}`\n"
+                    f"**Circuit:** `{circuit}`"
                 ),
                 requester=interaction.user,
-                service_name=target["name"],
-                service_url=target["url"],
+                service_name=target.name,
+                service_url=target.url,
                 status=state,
             )
         )
@@ -117,28 +165,41 @@ class Stats(commands.Cog):
     )
     async def metrics(self, interaction: discord.Interaction, name: str):
         await interaction.response.defer(ephemeral=True)
+        guild_id = interaction.guild_id or NO_GUILD
 
-        target = await store.get_by_name(name)
+        target = await store.get_by_name(guild_id, name)
         if not target:
             return await interaction.followup.send(
                 embed=error(f"No service found with name `{name}`."),
             )
 
-        uptime = await store.uptime_percentage(name)
-        avg_latency = await store.average_latency(name)
+        uptime = await store.uptime_percentage(guild_id, name)
+        avg_latency = await store.average_latency(guild_id, name)
+        avg_phases = await store.average_phases(guild_id, name)
+        percentiles = await store.latency_percentiles(guild_id, name, HISTORY_WINDOWS["24h"])
+
+        windows = [
+            f"{label} `{format_uptime(await store.recent_uptime(guild_id, name, label))}`"
+            for label in ("1h", "24h", "7d")
+        ]
+        month = await store.window_summary(guild_id, name, HISTORY_WINDOWS["30d"])
+        windows.append(f"30d `{format_uptime(month['uptime'] if month else None)}`")
 
         await interaction.followup.send(
             embed=info(
                 "Service Metrics",
                 (
                     f"**Uptime:** `{uptime:.2f}%`\n"
+                    f"**Recent Uptime:** {' · '.join(windows)}\n"
                     f"**Average Latency:** `{avg_latency:.3f}s`\n"
-                    f"**Total Checks:** `{target['checks']}`\n"
-                    f"**Successful Checks:** `{target['success']}`"
+                    f"**Latency (24h):** {format_percentiles(percentiles)}\n"
+                    f"**Latency Breakdown:** {format_phases(avg_phases)}\n"
+                    f"**Total Checks:** `{target.checks}`\n"
+                    f"**Successful Checks:** `{target.success}`"
                 ),
                 requester=interaction.user,
-                service_name=target["name"],
-                service_url=target["url"],
+                service_name=target.name,
+                service_url=target.url,
             )
         )
 
@@ -151,22 +212,39 @@ class Stats(commands.Cog):
     )
     async def latency(self, interaction: discord.Interaction, name: str):
         await interaction.response.defer(ephemeral=True)
+        guild_id = interaction.guild_id or NO_GUILD
 
-        target = await store.get_by_name(name)
-        if not target or not target["response_times"]:
+        target = await store.get_by_name(guild_id, name)
+        if not target or not target.response_times:
             return await interaction.followup.send(
                 embed=error("No latency data available for this service."),
             )
 
-        times = ", ".join(f"{t:.2f}s" for t in target["response_times"])
+        times = ", ".join(
+            f"{t:.2f}s" for t in target.response_times.window(RECENT_SAMPLES)
+        )
+        last_phases = {
+            phase: history.last()
+            for phase, history in (target.phase_times or {}).items()
+            if history
+        }
+        avg_phases = await store.average_phases(guild_id, name)
+        recent = await store.latency_percentiles(guild_id, name, SKETCH_RESOLUTION)
+        last_day = await store.latency_percentiles(guild_id, name, HISTORY_WINDOWS["24h"])
 
         await interaction.followup.send(
             embed=info(
                 "Latency History",
-                f"**Recent Response Times:**\n{times}",
+                (
+                    f"**Recent Response Times:**\n{times}\n\n"
+                    f"**Percentiles ({SKETCH_RESOLUTION // 3600}h):** {format_percentiles(recent)}\n"
+                    f"**Percentiles (24h):** {format_percentiles(last_day)}\n"
+                    f"**Last Check:** {format_phases(last_phases)}\n"
+                    f"**Average:** {format_phases(avg_phases)}"
+                ),
                 requester=interaction.user,
-                service_name=target["name"],
-                service_url=target["url"],
+                service_name=target.name,
+                service_url=target.url,
             )
         )
 
@@ -179,25 +257,76 @@ class Stats(commands.Cog):
     )
     async def clearstats(self, interaction: discord.Interaction, name: str):
         await interaction.response.defer(ephemeral=True)
+        guild_id = interaction.guild_id or NO_GUILD
 
-        target = await store.get_by_name(name)
+        target = await store.reset_metrics(guild_id, name)
         if not target:
             return await interaction.followup.send(
                 embed=error(f"No service found with name `{name}`."),
             )
 
-        # reset metrics safely
-        target["checks"] = 0
-        target["success"] = 0
-        target["fails"] = 0
-        target["response_times"].clear()
-
         await interaction.followup.send(
             embed=success(
                 "Metrics have been reset successfully.",
                 requester=interaction.user,
-                service_name=target["name"],
-                service_url=target["url"],
+                service_name=target.name,
+                service_url=target.url,
+            )
+        )
+
+    # --------------------------------------------------
+    # /history (CHECK LOG)
+    # --------------------------------------------------
+    @app_commands.command(
+        name="history",
+        description="View uptime history for a service",
+    )
+    @app_commands.describe(window="Time range (default: 24h)")
+    @app_commands.choices(window=HISTORY_CHOICES)
+    async def history(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+        window: app_commands.Choice[str] | None=None,
+    ):
+        await interaction.response.defer(ephemeral=True)
+        guild_id = interaction.guild_id or NO_GUILD
+
+        target = await store.get_by_name(guild_id, name)
+        if not target:
+            return await interaction.followup.send(
+                embed=error(f"No service found with name `{name}`."),
+            )
+
+        label = window.value if window else "24h"
+        summary = await store.history(
+            guild_id,
+            name, since=time.time() - HISTORY_WINDOWS[label]
+        )
+        if not summary or not summary["checks"]:
+            return await interaction.followup.send(
+                embed=error(f"No check history for the last {label}."),
+            )
+
+        avg = summary["avg_latency"]
+        avg_text = f"{avg:.3f}s" if avg is not None else "n/a"
+        failures = ", ".join(
+            f"<t:{int(ts)}:R>" for ts in reversed(summary["recent_failures"])
+        )
+
+        await interaction.followup.send(
+            embed=info(
+                f"History ({label})",
+                (
+                    f"**Uptime:** `{summary['uptime']:.2f}%`\n"
+                    f"**Checks:** `{summary['checks']}`\n"
+                    f"**Failures:** `{summary['failures']}`\n"
+                    f"**Average Latency:** `{avg_text}`\n"
+                    f"**Recent Failures:** {failures or 'none'}"
+                ),
+                requester=interaction.user,
+                service_name=target.name,
+                service_url=target.url,
             )
         )
 
@@ -210,8 +339,9 @@ class Stats(commands.Cog):
     )
     async def count(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
+        guild_id = interaction.guild_id or NO_GUILD
 
-        total = len(await store.all())
+        total = len(await store.view(guild_id))
 
         await interaction.followup.send(
             embed=info(
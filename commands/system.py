@@ -11,7 +11,16 @@ from discord import app_commands
 
 from core.embeds import info, success, error
 from core.config import ENVIRONMENT
+from data.partition import NO_GUILD
 from data.store import store
+from services import monitor_service
+from services.alert_dispatch import dispatcher
+from services.correlation import correlator
+from services.http_pool import pool_stats
+from services.ingest import ingestor
+from services.limiter import limiter
+from services.scheduler import scheduler
+from services.workers import worker_pool
 
 
 class System(commands.Cog):
@@ -117,6 +126,36 @@ class System(commands.Cog):
     )
     async def health(self, interaction: discord.Interaction):
         status = "🟢 Healthy" if self.bot.is_ready() else "🔴 Not Ready"
+        sched = scheduler.stats()
+        limits = limiter.stats()
+        pool = pool_stats.stats()
+        ingest = ingestor.stats()
+        alerts = dispatcher.stats()
+        incidents = correlator.stats()
+
+        workers = ""
+        if worker_pool.enabled:
+            shards = worker_pool.stats()
+            workers = (
+                f"\n**Check Workers:** `{shards['alive']}/{shards['workers']}` "
+                f"| shards `{shards['assigned']}`"
+            )
+
+        if monitor_service.engine:
+            flights = monitor_service.engine.flights.stats()
+            workers += (
+                f"\n**Open Circuits:** "
+                f"`{monitor_service.engine.open_circuits()}`\n"
+                f"**Coalesced Checks:** `{flights['shared']}` shared / "
+                f"`{flights['executed']}` sent"
+            )
+
+        if monitor_service.coordinator:
+            probes = monitor_service.coordinator.stats()
+            workers += (
+                f"\n**Probe Agents:** `{len(probes['agents'])}` "
+                f"| unconfirmed failures `{probes['unconfirmed']}`"
+            )
 
         await interaction.response.send_message(
             embed=info(
@@ -125,7 +164,29 @@ class System(commands.Cog):
                     f"**Status:** {status}\n"
                     f"**Guilds:** `{len(self.bot.guilds)}`\n"
                     f"**Users Cached:** `{len(self.bot.users)}`\n"
-                    f"**Environment:** `{ENVIRONMENT}`"
+                    f"**Environment:** `{ENVIRONMENT}`\n"
+                    f"**Scheduled Checks:** `{sched['scheduled']}` "
+                    f"(`{sched['in_flight']}` in flight)\n"
+                    f"**Check Lateness:** avg `{sched['lateness_avg']:.3f}s` "
+                    f"| max `{sched['lateness_max']:.3f}s`\n"
+                    f"**Skipped Slots:** `{sched['skipped']}`\n"
+                    f"**Check Concurrency:** `{limits['limit']}` "
+                    f"(`{limits['floor']}`–`{limits['ceiling']}`) | "
+                    f"queued `{limits['queued']}`\n"
+                    f"**Connection Reuse:** `{pool['reuse_ratio'] * 100:.1f}%` "
+                    f"(`{pool['reused']}` reused / `{pool['created']}` new)\n"
+                    f"**Result Queue:** `{ingest['queued']}/{ingest['capacity']}` "
+                    f"(peak `{ingest['max_depth']}`) | avg batch "
+                    f"`{ingest['avg_batch']:.1f}` | blocked `{ingest['blocked']}` "
+                    f"(`{ingest['blocked_time']:.1f}s`)\n"
+                    f"**Alert Queue:** `{alerts['queued']}/{alerts['capacity']}` "
+                    f"(peak `{alerts['max_depth']}`) | `{alerts['messages']}` sent "
+                    f"for `{alerts['delivered']}` alerts | 429s "
+                    f"`{alerts['rate_limited']}` | dropped `{alerts['dropped']}`\n"
+                    f"**Incidents:** `{incidents['open']}` open | "
+                    f"`{incidents['opened']}` opened | "
+                    f"`{incidents['absorbed']}` alerts grouped"
+                    f"{workers}"
                 ),
                 requester=interaction.user,
             ),
@@ -142,17 +203,28 @@ class System(commands.Cog):
     async def services(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
-        targets = await store.all()
+        guild_id = interaction.guild_id or NO_GUILD
+        targets = (await store.view(guild_id)).targets
+
+        unclaimed = ""
+        if guild_id != NO_GUILD:
+            legacy = len(await store.view(NO_GUILD))
+            if legacy:
+                unclaimed = (
+                    f"\n\n`{legacy}` services predate per-server lists. "
+                    "Use `/claim` to move one into this server."
+                )
+
         if not targets:
             return await interaction.followup.send(
                 embed=info(
                     "Services",
-                    "No services are currently being monitored.",
+                    "No services are currently being monitored." + unclaimed,
                     requester=interaction.user,
                 )
             )
 
-        names = ", ".join(t["name"] for t in targets[:10])
+        names = ", ".join(t.name for t in targets[:10])
         more = "" if len(targets) <= 10 else f"\n…and {len(targets) - 10} more"
 
         await interaction.followup.send(
@@ -160,7 +232,7 @@ class System(commands.Cog):
                 "Monitored Services",
                 (
                     f"**Total:** `{len(targets)}`\n\n"
-                    f"**Services:**\n{names}{more}"
+                    f"**Services:**\n{names}{more}{unclaimed}"
                 ),
                 requester=interaction.user,
             )
@@ -49,7 +49,8 @@ def get_env_int(key: str, default: int, min_value: int | None=None):
 # --------------------------------------------------
 # CORE BOT CONFIG
 # --------------------------------------------------
-BOT_TOKEN = get_env_str("DISCORD_TOKEN", required=True)
+# validated in bot.py, so probe agents can load config without it
+BOT_TOKEN = get_env_str("DISCORD_TOKEN")
 
 # --------------------------------------------------
 # MONITORING CONFIG
@@ -85,3 +86,286 @@ ALERT_FAILURE_THRESHOLD = get_env_int(
 ALERT_CHANNEL_ID = int(
     get_env_str("ALERT_CHANNEL_ID", default="0")
 )
+
+# --------------------------------------------------
+# CHECK ENGINE CONFIG
+# --------------------------------------------------
+CHECK_CONCURRENCY_MIN = get_env_int(
+    key="CHECK_CONCURRENCY_MIN",
+    default=4,
+    min_value=1,
+)
+
+CHECK_CONCURRENCY_MAX = get_env_int(
+    key="CHECK_CONCURRENCY_MAX",
+    default=200,
+    min_value=CHECK_CONCURRENCY_MIN,
+)
+
+CHECK_CONCURRENCY_INITIAL = get_env_int(
+    key="CHECK_CONCURRENCY_INITIAL",
+    default=10,
+    min_value=CHECK_CONCURRENCY_MIN,
+)
+
+# --------------------------------------------------
+# HTTP POOL CONFIG
+# --------------------------------------------------
+HTTP_POOL_LIMIT = get_env_int(
+    key="HTTP_POOL_LIMIT",
+    default=200,
+    min_value=1,
+)
+
+HTTP_POOL_LIMIT_PER_HOST = get_env_int(
+    key="HTTP_POOL_LIMIT_PER_HOST",
+    default=10,
+    min_value=0,  # 0 = no per-host cap
+)
+
+DNS_CACHE_TTL = get_env_int(
+    key="DNS_CACHE_TTL",
+    default=300,
+    min_value=0,
+)
+
+HTTP_KEEPALIVE_TIMEOUT = get_env_int(
+    key="HTTP_KEEPALIVE_TIMEOUT",
+    default=30,
+    min_value=1,
+)
+
+HTTP_DRAIN_LIMIT = get_env_int(
+    key="HTTP_DRAIN_LIMIT",
+    default=64 * 1024,
+    min_value=0,
+)
+
+CHECK_WORKERS = get_env_int(
+    key="CHECK_WORKERS",
+    default=0,  # 0 = run checks inside the bot process
+    min_value=0,
+)
+
+# --------------------------------------------------
+# DISTRIBUTED PROBING CONFIG
+# --------------------------------------------------
+COORDINATOR_HOST = get_env_str("COORDINATOR_HOST", default="127.0.0.1")
+
+COORDINATOR_PORT = get_env_int(
+    key="COORDINATOR_PORT",
+    default=0,  # 0 = coordinator mode disabled
+    min_value=0,
+)
+
+COORDINATOR_TOKEN = get_env_str("COORDINATOR_TOKEN", default="")
+
+COORDINATOR_LOCAL_AGENTS = get_env_int(
+    key="COORDINATOR_LOCAL_AGENTS",
+    default=0,  # agents spawned on this host by the coordinator
+    min_value=0,
+)
+
+PROBE_REPLICAS = get_env_int(
+    key="PROBE_REPLICAS",
+    default=2,  # agents probing each target
+    min_value=1,
+)
+
+PROBE_QUORUM = get_env_int(
+    key="PROBE_QUORUM",
+    default=2,  # agents that must agree before DOWN is declared
+    min_value=1,
+)
+
+# --------------------------------------------------
+# CIRCUIT BREAKER CONFIG
+# --------------------------------------------------
+BREAKER_THRESHOLD = get_env_int(
+    key="BREAKER_THRESHOLD",
+    default=3,  # consecutive DOWN verdicts before the circuit opens
+    min_value=1,
+)
+
+BREAKER_MAX_DELAY = get_env_int(
+    key="BREAKER_MAX_DELAY",
+    default=900,  # slowest probe period while open (seconds)
+    min_value=10,
+)
+
+# --------------------------------------------------
+# REQUEST COALESCING CONFIG
+# --------------------------------------------------
+COALESCE_WINDOW = get_env_int(
+    key="COALESCE_WINDOW",
+    default=5,  # seconds a successful probe result is shared
+    min_value=0,
+)
+
+# --------------------------------------------------
+# METRICS HISTORY CONFIG
+# --------------------------------------------------
+LATENCY_HISTORY_DEPTH = get_env_int(
+    key="LATENCY_HISTORY_DEPTH",
+    default=120,  # response times kept per target (2h at 60s; days come from rollups)
+    min_value=1,
+)
+
+PHASE_HISTORY_DEPTH = get_env_int(
+    key="PHASE_HISTORY_DEPTH",
+    default=60,  # samples kept per latency phase per target
+    min_value=1,
+)
+
+# --------------------------------------------------
+# PERSISTENCE CONFIG
+# --------------------------------------------------
+DATABASE_PATH = get_env_str(
+    "DATABASE_PATH",
+    default="uptimeguard.db",  # "" = in-memory only
+)
+
+DB_FLUSH_INTERVAL = get_env_int(
+    key="DB_FLUSH_INTERVAL",
+    default=5,  # seconds between write-behind flushes
+    min_value=1,
+)
+
+DB_FLUSH_BATCH = get_env_int(
+    key="DB_FLUSH_BATCH",
+    default=500,  # dirty targets that trigger an early flush
+    min_value=1,
+)
+
+# --------------------------------------------------
+# CHECK LOG CONFIG
+# --------------------------------------------------
+CHECK_LOG_DIR = get_env_str(
+    "CHECK_LOG_DIR",
+    default="checklog",  # "" = no check history
+)
+
+CHECK_LOG_SEGMENT_MB = get_env_int(
+    key="CHECK_LOG_SEGMENT_MB",
+    default=16,  # segment size before rotation
+    min_value=1,
+)
+
+CHECK_LOG_RETENTION_DAYS = get_env_int(
+    key="CHECK_LOG_RETENTION_DAYS",
+    default=30,
+    min_value=1,
+)
+
+CHECK_LOG_COMPACT_INTERVAL = get_env_int(
+    key="CHECK_LOG_COMPACT_INTERVAL",
+    default=3600,  # seconds between compaction passes
+    min_value=60,
+)
+
+# --------------------------------------------------
+# SNAPSHOT CONFIG
+# --------------------------------------------------
+SNAPSHOT_PATH = get_env_str(
+    "SNAPSHOT_PATH",
+    default="uptimeguard.snap",  # "" = no snapshots
+)
+
+SNAPSHOT_INTERVAL = get_env_int(
+    key="SNAPSHOT_INTERVAL",
+    default=300,  # seconds between periodic snapshots
+    min_value=10,
+)
+
+# --------------------------------------------------
+# READ VIEW CONFIG
+# --------------------------------------------------
+VIEW_PUBLISH_INTERVAL_MS = get_env_int(
+    key="VIEW_PUBLISH_INTERVAL_MS",
+    default=250,  # max staleness of command reads
+    min_value=10,
+)
+
+VIEW_PUBLISH_BATCH = get_env_int(
+    key="VIEW_PUBLISH_BATCH",
+    default=1000,  # check results that trigger an early publish
+    min_value=1,
+)
+
+# --------------------------------------------------
+# RESULT INGEST CONFIG
+# --------------------------------------------------
+INGEST_QUEUE_SIZE = get_env_int(
+    key="INGEST_QUEUE_SIZE",
+    default=10000,  # pending results before checks wait (backpressure)
+    min_value=1,
+)
+
+INGEST_BATCH = get_env_int(
+    key="INGEST_BATCH",
+    default=500,  # results applied to the store per pass
+    min_value=1,
+)
+
+INGEST_FLUSH_MS = get_env_int(
+    key="INGEST_FLUSH_MS",
+    default=50,  # max wait for a batch to fill
+    min_value=1,
+)
+
+# --------------------------------------------------
+# GUILD LIMITS
+# --------------------------------------------------
+GUILD_MAX_TARGETS = get_env_int(
+    key="GUILD_MAX_TARGETS",
+    default=0,  # targets per guild, 0 = unlimited
+    min_value=0,
+)
+
+GUILD_CHECKS_PER_MINUTE = get_env_int(
+    key="GUILD_CHECKS_PER_MINUTE",
+    default=0,  # check budget per guild, 0 = unlimited
+    min_value=0,
+)
+
+# --------------------------------------------------
+# ALERT DISPATCH CONFIG
+# --------------------------------------------------
+ALERT_QUEUE_SIZE = get_env_int(
+    key="ALERT_QUEUE_SIZE",
+    default=5000,  # pending alerts before new ones are dropped
+    min_value=1,
+)
+
+ALERT_COALESCE_MS = get_env_int(
+    key="ALERT_COALESCE_MS",
+    default=2000,  # alerts within this window share one digest
+    min_value=0,
+)
+
+ALERT_MESSAGES_PER_MINUTE = get_env_int(
+    key="ALERT_MESSAGES_PER_MINUTE",
+    default=30,  # sustained alert channel send rate
+    min_value=1,
+)
+
+ALERT_BURST = get_env_int(
+    key="ALERT_BURST",
+    default=5,  # sends allowed back to back (Discord: 5 per 5s per channel)
+    min_value=1,
+)
+
+# --------------------------------------------------
+# INCIDENT CORRELATION CONFIG
+# --------------------------------------------------
+INCIDENT_MIN_TARGETS = get_env_int(
+    key="INCIDENT_MIN_TARGETS",
+    default=3,  # DOWN targets sharing a cause that open an incident, 0 = disabled
+    min_value=0,
+)
+
+INCIDENT_WINDOW = get_env_int(
+    key="INCIDENT_WINDOW",
+    default=120,  # seconds between failures that count as correlated
+    min_value=1,
+)
@@ -35,6 +35,21 @@ STATUS_BADGES = {
 }
 
 
+def resolve_state(status, *, paused: bool=False) -> str:
+    """
+    Map a recorded check status to a STATUS_BADGES key.
+    Integer statuses are HTTP codes; other non-DOWN values come from
+    socket-level probes that succeeded.
+    """
+    if paused:
+        return "PAUSED"
+    if status is None:
+        return "UNKNOWN"
+    if status == "DOWN" or (isinstance(status, int) and status >= 400):
+        return "DOWN"
+    return "UP"
+
+
 # --------------------------------------------------
 # BASE EMBED BUILDER
 # --------------------------------------------------
@@ -0,0 +1,450 @@
+"""
+Check Result Log
+Copyright (c) 2025 Mac GunJon
+Production-Grade Append-Only Check History
+"""
+
+import math
+import mmap
+import os
+import struct
+from array import array
+from typing import Collection, Dict, Iterator, List, NamedTuple
+
+from core.logger import setup_logger
+from data.models import STATUS_TCP_OPEN, STATUS_TLS_OK
+
+logger = setup_logger()
+
+# target id, unix timestamp, status code, latency (NaN = none), failed
+RECORD = struct.Struct("<IdhfB")
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+# sealed segment index: header, one entry per target (sorted by id),
+# then every target's record numbers in time order
+INDEX_MAGIC = b"UGIX"
+INDEX_HEADER = struct.Struct("<4sII")  # magic, segment records, targets
+INDEX_ENTRY = struct.Struct("<III")  # target id, first posting, postings
+
+# non-HTTP statuses are stored as small negative codes, 0 = no status
+STATUS_CODES = {STATUS_TCP_OPEN: -1, STATUS_TLS_OK: -2, "DOWN": -3}
+STATUS_NAMES = {code: status for status, code in STATUS_CODES.items()}
+
+
+def encode_status(status) -> int:
+    if isinstance(status, int):
+        return status
+    return STATUS_CODES.get(status, 0)
+
+
+def decode_status(code: int):
+    if code > 0:
+        return code
+    return STATUS_NAMES.get(code)
+
+
+class CheckRecord(NamedTuple):
+    target_id: int
+    timestamp: float
+    status: object
+    latency: float | None
+    failed: bool
+
+
+def _segment_name(seq: int) -> str:
+    return f"{seq:08d}{SEGMENT_SUFFIX}"
+
+
+def _records(buf) -> int:
+    return len(buf) // RECORD.size
+
+
+def _timestamp(buf, index: int) -> float:
+    return RECORD.unpack_from(buf, index * RECORD.size)[1]
+
+
+def _first_at_or_after(buf, since: float, positions=None) -> int:
+    """
+    Binary search for the first record with timestamp >= since.
+    Records are appended in time order. With `positions` (record
+    numbers in time order), searches those and returns an index
+    into them.
+    """
+    lo, hi = 0, _records(buf) if positions is None else len(positions)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        index = mid if positions is None else positions[mid]
+        if _timestamp(buf, index) < since:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _index_path(segment: str) -> str:
+    return segment[: -len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+
+
+def _build_index(target_ids) -> bytes:
+    """
+    Index of a segment from its records' target ids, in record order.
+    """
+    postings: Dict[int, array] = {}
+    count = 0
+    for index, tid in enumerate(target_ids):
+        positions = postings.get(tid)
+        if positions is None:
+            positions = postings[tid] = array("I")
+        positions.append(index)
+        count += 1
+
+    parts = [INDEX_HEADER.pack(INDEX_MAGIC, count, len(postings))]
+    start = 0
+    for tid in sorted(postings):
+        parts.append(INDEX_ENTRY.pack(tid, start, len(postings[tid])))
+        start += len(postings[tid])
+    parts.extend(postings[tid].tobytes() for tid in sorted(postings))
+    return b"".join(parts)
+
+
+def _write_index(segment: str, raw: bytes):
+    path = _index_path(segment)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as out:
+        out.write(raw)
+    os.replace(tmp, path)
+
+
+def _read_index(segment: str, records: int) -> bytes | None:
+    """
+    A segment's index, or None when it has none (active, or not
+    indexed yet) or the index does not match the segment.
+    """
+    try:
+        with open(_index_path(segment), "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+
+    if len(raw) < INDEX_HEADER.size:
+        return None
+    magic, indexed, _ = INDEX_HEADER.unpack_from(raw)
+    if magic != INDEX_MAGIC or indexed != records:
+        return None
+    return raw
+
+
+def _postings(raw: bytes, target_id: int) -> array:
+    """
+    Record numbers of `target_id` in an indexed segment, oldest first.
+    """
+    targets = INDEX_HEADER.unpack_from(raw)[2]
+    lo, hi = 0, targets
+    while lo < hi:
+        mid = (lo + hi) // 2
+        tid, start, count = INDEX_ENTRY.unpack_from(
+            raw, INDEX_HEADER.size + mid * INDEX_ENTRY.size
+        )
+        if tid < target_id:
+            lo = mid + 1
+        elif tid > target_id:
+            hi = mid
+        else:
+            offset = INDEX_HEADER.size + targets * INDEX_ENTRY.size + start * 4
+            positions = array("I")
+            positions.frombytes(raw[offset: offset + count * 4])
+            return positions
+    return array("I")
+
+
+class CheckLog:
+    """
+    Append-only log of check results in fixed-width binary records,
+    split into numbered segment files.
+
+    Appends are sequential buffered writes from the event loop; the
+    active segment is sealed and a new one started once it reaches
+    `segment_bytes`. Reads map segments with mmap and binary search
+    by timestamp, so a range scan touches only the bytes in range.
+    Compaction drops expired segments, rewrites sealed ones without
+    the records of removed targets and gives every sealed segment an
+    index of record numbers per target, so a scan of an indexed
+    segment reads only that target's records.
+
+    Reads and compaction are blocking; run them in an executor on
+    a segment list taken from the event loop.
+    """
+
+    def __init__(self, directory: str, *, segment_bytes: int, retention: float):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.retention = retention
+
+        self._seq = 0
+        self._file = None
+        self._size = 0
+
+        # metrics
+        self.appended = 0
+
+    # --------------------------------------------------
+    # LIFECYCLE
+    # --------------------------------------------------
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+
+        existing = self._segment_seqs()
+        if existing:
+            self._seq = existing[-1]
+            path = self._path(self._seq)
+
+            # drop a torn record left by a crash mid-write
+            size = os.path.getsize(path)
+            whole = size - size % RECORD.size
+            if whole != size:
+                os.truncate(path, whole)
+                logger.warning(f"Check log torn record dropped | {path}")
+        else:
+            self._seq = 1
+
+        self._open_active()
+        logger.info(
+            f"Check log ready | {self.directory} | "
+            f"segments={len(self.segments())}"
+        )
+
+    def _open_active(self):
+        path = self._path(self._seq)
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+
+    def flush(self):
+        if self._file:
+            self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    # --------------------------------------------------
+    # APPEND (EVENT LOOP)
+    # --------------------------------------------------
+    def append(
+        self,
+        target_id: int,
+        *,
+        timestamp: float,
+        status,
+        latency: float | None,
+        failed: bool,
+    ):
+        self._file.write(
+            RECORD.pack(
+                target_id,
+                timestamp,
+                encode_status(status),
+                math.nan if latency is None else latency,
+                failed,
+            )
+        )
+        self._size += RECORD.size
+        self.appended += 1
+
+        if self._size >= self.segment_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self.close()
+        self._seq += 1
+        self._open_active()
+
+    # --------------------------------------------------
+    # SEGMENTS
+    # --------------------------------------------------
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, _segment_name(seq))
+
+    def _segment_seqs(self) -> List[int]:
+        return sorted(
+            int(name[: -len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX)
+            and name[: -len(SEGMENT_SUFFIX)].isdigit()
+        )
+
+    def segments(self) -> List[str]:
+        """
+        All segment paths, oldest first (the last one is active).
+        """
+        return [self._path(seq) for seq in self._segment_seqs()]
+
+    def sealed_segments(self) -> List[str]:
+        return [
+            self._path(seq) for seq in self._segment_seqs() if seq != self._seq
+        ]
+
+    # --------------------------------------------------
+    # RANGE SCAN (EXECUTOR)
+    # --------------------------------------------------
+    @staticmethod
+    def scan(
+        segments: List[str],
+        target_id: int,
+        *,
+        since: float,
+        until: float,
+    ) -> Iterator[CheckRecord]:
+        for path in segments:
+            try:
+                with open(path, "rb") as f:
+                    if os.fstat(f.fileno()).st_size < RECORD.size:
+                        continue
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                        count = _records(buf)
+                        if _timestamp(buf, count - 1) < since:
+                            continue
+                        if _timestamp(buf, 0) > until:
+                            return
+
+                        raw = _read_index(path, count)
+                        positions = (
+                            range(count) if raw is None
+                            else _postings(raw, target_id)
+                        )
+                        first = _first_at_or_after(buf, since, positions)
+
+                        for index in positions[first:]:
+                            tid, ts, code, latency, failed = RECORD.unpack_from(
+                                buf, index * RECORD.size
+                            )
+                            if ts > until:
+                                return
+                            if tid != target_id:
+                                continue
+                            yield CheckRecord(
+                                target_id=tid,
+                                timestamp=ts,
+                                status=decode_status(code),
+                                latency=None if math.isnan(latency) else latency,
+                                failed=bool(failed),
+                            )
+
+            except FileNotFoundError:
+                # removed by compaction after the list was taken
+                continue
+
+    @classmethod
+    def summarize(
+        cls,
+        segments: List[str],
+        target_id: int,
+        *,
+        since: float,
+        until: float,
+        recent_failures: int=5,
+    ) -> dict:
+        checks = 0
+        failures = 0
+        latency_sum = 0.0
+        latency_count = 0
+        failed_at: List[float] = []
+
+        for record in cls.scan(segments, target_id, since=since, until=until):
+            checks += 1
+            if record.failed:
+                failures += 1
+                failed_at.append(record.timestamp)
+                del failed_at[:-recent_failures]
+            if record.latency is not None:
+                latency_sum += record.latency
+                latency_count += 1
+
+        return {
+            "checks": checks,
+            "failures": failures,
+            "uptime": (checks - failures) / checks * 100 if checks else None,
+            "avg_latency": latency_sum / latency_count if latency_count else None,
+            "recent_failures": failed_at,
+        }
+
+    # --------------------------------------------------
+    # COMPACTION (EXECUTOR)
+    # --------------------------------------------------
+    def compact(self, segments: List[str], live_ids: Collection[int], *, now: float):
+        """
+        Drop sealed segments past retention, rewrite the others
+        without expired records or records of removed targets, and
+        index the sealed segments that have no index yet.
+        """
+        cutoff = now - self.retention
+        dropped = 0
+        rewritten = 0
+        indexed = 0
+
+        for path in segments:
+            try:
+                with open(path, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if size < RECORD.size:
+                        keep = None
+                    else:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                            count = _records(buf)
+                            if _timestamp(buf, count - 1) < cutoff:
+                                keep = None
+                            else:
+                                view = memoryview(buf)[: count * RECORD.size]
+                                kept = [
+                                    record
+                                    for record in RECORD.iter_unpack(view)
+                                    if record[0] in live_ids and record[1] >= cutoff
+                                ]
+                                view.release()
+                                keep = kept if len(kept) < count else False
+                                if keep is False and _read_index(
+                                    path, count
+                                ) is None:
+                                    _write_index(path, _build_index(
+                                        record[0] for record in kept
+                                    ))
+                                    indexed += 1
+            except FileNotFoundError:
+                continue
+
+            if keep is False:
+                continue  # nothing to drop
+
+            if not keep:
+                os.remove(path)
+                try:
+                    os.remove(_index_path(path))
+                except FileNotFoundError:
+                    pass
+                dropped += 1
+                continue
+
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as out:
+                out.write(b"".join(RECORD.pack(*record) for record in keep))
+            os.replace(tmp, path)
+            _write_index(path, _build_index(record[0] for record in keep))
+            rewritten += 1
+
+        if dropped or rewritten or indexed:
+            logger.info(
+                f"Check log compacted | dropped={dropped} | "
+                f"rewritten={rewritten} | indexed={indexed}"
+            )
+
+    # --------------------------------------------------
+    # METRICS
+    # --------------------------------------------------
+    def stats(self) -> dict:
+        return {
+            "segments": len(self._segment_seqs()),
+            "appended": self.appended,
+            "active_bytes": self._size,
+        }
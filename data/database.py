@@ -0,0 +1,219 @@
+"""
+SQLite Backend
+Copyright (c) 2025 Mac GunJon
+Production-Grade Local Persistence
+"""
+
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Tuple
+
+from core.logger import setup_logger
+from data.models import Target
+
+logger = setup_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    id             INTEGER PRIMARY KEY,
+    guild_id       INTEGER NOT NULL DEFAULT 0,
+    url            TEXT NOT NULL,
+    name           TEXT NOT NULL,
+    probe          TEXT NOT NULL,
+    paused         INTEGER NOT NULL,
+    created_at     REAL NOT NULL,
+    last_status,
+    last_checked   REAL,
+    fails          INTEGER NOT NULL,
+    alerted_down   INTEGER NOT NULL,
+    checks         INTEGER NOT NULL,
+    success        INTEGER NOT NULL,
+    response_times BLOB,
+    UNIQUE (guild_id, url)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value
+);
+"""
+
+# last_status is declared without a type so SQLite keeps HTTP codes
+# as integers and probe labels ("OPEN", "TLS OK") as text
+
+# tables created before guild partitioning keyed targets by URL alone
+MIGRATE_GUILDS = """
+BEGIN;
+ALTER TABLE targets RENAME TO targets_unpartitioned;
+{schema}
+INSERT INTO targets (
+    id, guild_id, url, name, probe, paused, created_at, last_status,
+    last_checked, fails, alerted_down, checks, success, response_times
+)
+SELECT
+    id, 0, url, name, probe, paused, created_at, last_status,
+    last_checked, fails, alerted_down, checks, success, response_times
+FROM targets_unpartitioned;
+DROP TABLE targets_unpartitioned;
+COMMIT;
+"""
+
+INSERT_TARGET = """
+INSERT OR REPLACE INTO targets (
+    guild_id, url, name, probe, paused, created_at, last_status,
+    last_checked, fails, alerted_down, checks, success, response_times, id
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_TARGET = """
+UPDATE targets SET
+    guild_id = ?, url = ?, name = ?, probe = ?, paused = ?,
+    created_at = ?, last_status = ?, last_checked = ?, fails = ?,
+    alerted_down = ?, checks = ?, success = ?, response_times = ?
+WHERE id = ?
+"""
+
+Row = Tuple
+
+
+def target_row(target: Target) -> Row:
+    """
+    Plain tuple copy of a target, taken on the event loop so the
+    database thread never reads live objects.
+    """
+    return (
+        target.guild_id,
+        target.url,
+        target.name,
+        target.probe,
+        int(target.paused),
+        target.created_at,
+        target.last_status,
+        target.last_checked,
+        target.fails,
+        int(target.alerted_down),
+        target.checks,
+        target.success,
+        target.response_times.to_bytes() if target.response_times else None,
+        target.id,
+    )
+
+
+def row_target(row: sqlite3.Row) -> Target:
+    target = Target(
+        name=row["name"],
+        url=row["url"],
+        id=row["id"],
+        guild_id=row["guild_id"],
+        probe=row["probe"],
+        paused=bool(row["paused"]),
+        last_status=row["last_status"],
+        last_checked=row["last_checked"],
+        fails=row["fails"],
+        alerted_down=bool(row["alerted_down"]),
+        checks=row["checks"],
+        success=row["success"],
+        created_at=row["created_at"],
+    )
+    if row["response_times"]:
+        target.latency_history().load_bytes(row["response_times"])
+    return target
+
+
+class Database:
+    """
+    SQLite database in WAL mode.
+    Every call runs on one dedicated thread, so the connection is
+    never shared across threads and writes are applied in the order
+    they were submitted.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sqlite"
+        )
+        self._conn: sqlite3.Connection | None = None
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    # --------------------------------------------------
+    # LIFECYCLE
+    # --------------------------------------------------
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        columns = {
+            row["name"] for row in conn.execute("PRAGMA table_info(targets)")
+        }
+        if columns and "guild_id" not in columns:
+            conn.executescript(MIGRATE_GUILDS.format(schema=SCHEMA))
+            logger.warning("Database migrated | targets partitioned by guild")
+
+        conn.executescript(SCHEMA)
+        conn.commit()
+        self._conn = conn
+
+    def _close(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    async def open(self):
+        await self._run(self._open)
+        logger.info(f"Database ready | {self.path} (WAL)")
+
+    async def close(self):
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+    # --------------------------------------------------
+    # BULK LOAD
+    # --------------------------------------------------
+    def _load(self) -> Tuple[List[Target], int]:
+        rows = self._conn.execute("SELECT * FROM targets").fetchall()
+        meta = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'next_id'"
+        ).fetchone()
+        return [row_target(row) for row in rows], meta[0] if meta else 1
+
+    async def load(self) -> Tuple[List[Target], int]:
+        """
+        Every target plus the next unused target id.
+        """
+        return await self._run(self._load)
+
+    # --------------------------------------------------
+    # WRITES
+    # --------------------------------------------------
+    def _write(self, sql: str, rows: Iterable[Row]):
+        with self._conn:
+            self._conn.executemany(sql, rows)
+
+    def _insert(self, row: Row, next_id: int):
+        with self._conn:
+            self._conn.execute(INSERT_TARGET, row)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)",
+                (next_id,),
+            )
+
+    async def insert(self, target: Target, *, next_id: int):
+        await self._run(self._insert, target_row(target), next_id)
+
+    async def update(self, rows: List[Row]):
+        """
+        Apply many target updates in one transaction.
+        """
+        await self._run(self._write, UPDATE_TARGET, rows)
+
+    async def delete(self, target_id: int):
+        await self._run(
+            self._write, "DELETE FROM targets WHERE id = ?", [(target_id,)]
+        )
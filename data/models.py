@@ -0,0 +1,109 @@
+"""
+Data Models
+Copyright (c) 2025 Mac GunJon
+Production-Grade Compact Target Records
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, NamedTuple
+
+from core.config import LATENCY_HISTORY_DEPTH
+from data.ring_buffer import RingBuffer
+from data.rollups import Rollups
+from data.sketch import LatencySketches
+
+# statuses recorded by socket-level probes (Target.last_status)
+STATUS_TCP_OPEN = "OPEN"
+STATUS_TLS_OK = "TLS OK"
+
+
+def target_key(guild_id: int, url: str) -> str:
+    """
+    Check-path key of a target. URLs are unique per guild, so the
+    URL alone for guild 0 (keeps pre-partitioning keys stable), else
+    guild-qualified.
+    """
+    return f"{guild_id}:{url}" if guild_id else url
+
+
+@dataclass(slots=True, eq=False)
+class Target:
+    """
+    One monitored service.
+    Slotted (no per-instance __dict__), timestamps are unix floats and
+    latency history lives in fixed-size packed ring buffers.
+    Metric structures are None until the first check that writes
+    them (see MonitorStore._apply), so idle targets stay small.
+    """
+
+    # identity
+    name: str
+    url: str
+    id: int = 0  # stable numeric id, never reused (check log key)
+    guild_id: int = 0  # owning guild (0 = DMs / pre-partitioning)
+
+    # control
+    probe: str = "get"
+    paused: bool = False
+    interval: float | None = None  # None = CHECK_INTERVAL (guild budget)
+
+    # status
+    last_status: int | str | None = None
+    last_checked: float | None = None  # unix seconds
+
+    # failure tracking
+    fails: int = 0
+    alerted_down: bool = False
+
+    # metrics
+    checks: int = 0
+    success: int = 0
+    response_times: RingBuffer | None = None
+    phase_times: Dict[str, RingBuffer] | None = None
+    rollups: Rollups | None = None
+    latency_sketches: LatencySketches | None = None
+
+    # audit
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def key(self) -> str:
+        return target_key(self.guild_id, self.url)
+
+    def latency_history(self) -> RingBuffer:
+        if self.response_times is None:
+            self.response_times = RingBuffer(LATENCY_HISTORY_DEPTH)
+        return self.response_times
+
+    @property
+    def last_checked_at(self) -> datetime | None:
+        if self.last_checked is None:
+            return None
+        return datetime.utcfromtimestamp(self.last_checked)
+
+
+class StatusUpdate(NamedTuple):
+    """
+    One check result to apply to a target (see MonitorStore.apply_batch).
+    """
+
+    key: str  # Target.key
+    status: int | str | None
+    failed: bool
+    response_time: float | None = None
+    phases: Dict[str, float] | None = None
+
+
+class Alert(NamedTuple):
+    """
+    One DOWN or RECOVERY transition to deliver (see services.alert_dispatch).
+    """
+
+    kind: str  # "DOWN" | "UP"
+    key: str  # Target.key
+    name: str
+    url: str
+    fails: int
+    error: str | None = None  # probes.ERROR_* class of the failing check
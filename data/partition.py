@@ -0,0 +1,167 @@
+"""
+Guild Partitions
+Copyright (c) 2025 Mac GunJon
+Production-Grade Per-Guild Target Indexes
+"""
+
+import time
+from typing import Dict, Optional, Set
+
+from core.config import (
+    CHECK_INTERVAL,
+    GUILD_CHECKS_PER_MINUTE,
+    GUILD_MAX_TARGETS,
+    VIEW_PUBLISH_BATCH,
+    VIEW_PUBLISH_INTERVAL_MS,
+)
+from data.models import Target
+from data.view import StoreView
+
+NO_GUILD = 0  # DMs and targets created before partitioning
+
+
+class GuildPartition:
+    """
+    One guild's slice of the store: its targets by URL and by
+    casefolded name (both unique within the guild), its read view
+    and its limits. Commands only touch their own partition, so
+    they cost O(that guild's targets) however many guilds there are.
+
+    The view is an immutable StoreView republished copy-on-write in
+    batches (every VIEW_PUBLISH_BATCH results or
+    VIEW_PUBLISH_INTERVAL_MS), and on the next read after a user
+    changes a target.
+    """
+
+    __slots__ = (
+        "guild_id", "targets", "names", "interval", "revision",
+        "_view", "_stale", "_names_changed", "_publish_due",
+    )
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.targets: Dict[str, Target] = {}  # URL -> target
+        self.names: Dict[str, str] = {}  # casefolded name -> URL
+        self.interval: float | None = None  # None = CHECK_INTERVAL
+        self.revision = 0  # bumped on user changes
+
+        # published read view and what changed since
+        self._view = StoreView.empty()
+        self._stale: Set[str] = set()
+        self._names_changed = False
+        self._publish_due = False  # a user change awaits publishing
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    # --------------------------------------------------
+    # INDEXES
+    # --------------------------------------------------
+    def find(self, name: str) -> Optional[Target]:
+        url = self.names.get(name.casefold())
+        return self.targets.get(url) if url else None
+
+    def insert(self, target: Target):
+        target.interval = self.interval
+        self.targets[target.url] = target
+        self.names[target.name.casefold()] = target.url
+        self._names_changed = True
+        self.touch(target.url)
+
+    def load(self, target: Target):
+        """
+        insert() without publishing (bulk loads end with invalidate()).
+        """
+        target.interval = self.interval
+        self.targets[target.url] = target
+        self.names[target.name.casefold()] = target.url
+
+    def delete(self, target: Target):
+        del self.targets[target.url]
+        del self.names[target.name.casefold()]
+        self._names_changed = True
+        self.touch(target.url)
+
+    # --------------------------------------------------
+    # LIMITS
+    # --------------------------------------------------
+    @property
+    def full(self) -> bool:
+        return bool(GUILD_MAX_TARGETS) and len(self.targets) >= GUILD_MAX_TARGETS
+
+    def retune(self) -> bool:
+        """
+        Stretch the guild's check interval so its targets stay within
+        GUILD_CHECKS_PER_MINUTE. Returns True if the interval changed
+        (every target of the guild is updated).
+        """
+        interval = None
+        if GUILD_CHECKS_PER_MINUTE:
+            needed = len(self.targets) * 60 / GUILD_CHECKS_PER_MINUTE
+            if needed > CHECK_INTERVAL:
+                interval = needed
+
+        if interval == self.interval:
+            return False
+
+        self.interval = interval
+        for target in self.targets.values():
+            target.interval = interval
+        return True
+
+    # --------------------------------------------------
+    # READ VIEW
+    # --------------------------------------------------
+    def touch(self, url: str):
+        """
+        A user changed `url`: publish before the next read.
+        """
+        self._stale.add(url)
+        self._publish_due = True
+        self.revision += 1
+
+    def mark_stale(self, urls):
+        self._stale.update(urls)
+        if (
+            len(self._stale) >= VIEW_PUBLISH_BATCH
+            or self._view_age() >= VIEW_PUBLISH_INTERVAL_MS / 1000
+        ):
+            self.publish()
+
+    def _view_age(self) -> float:
+        return time.monotonic() - self._view.published
+
+    def view(self) -> StoreView:
+        if self._publish_due or (
+            self._stale and self._view_age() >= VIEW_PUBLISH_INTERVAL_MS / 1000
+        ):
+            self.publish()
+        return self._view
+
+    def invalidate(self):
+        """
+        Every target changed (bulk loads): republish them all on the
+        next read instead of now.
+        """
+        self._stale.update(self.targets)
+        self._names_changed = self._publish_due = True
+
+    def publish(self, *, full: bool=False):
+        """
+        Build and swap in the next view. `full` re-copies every
+        target (after bulk loads).
+        """
+        if full:
+            self._stale.update(self.targets)
+            self._names_changed = True
+
+        self._view = self._view.replace(
+            self.targets,
+            self._stale,
+            names=self.names if self._names_changed else None,
+            revision=self.revision,
+            now=time.time(),
+            published=time.monotonic(),
+        )
+        self._stale.clear()
+        self._names_changed = self._publish_due = False
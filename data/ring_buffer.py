@@ -0,0 +1,102 @@
+"""
+Ring Buffer
+Copyright (c) 2025 Mac GunJon
+Production-Grade Fixed-Size Sample History
+"""
+
+from array import array
+from typing import Iterable, Iterator
+
+
+class RingBuffer:
+    """
+    Fixed-capacity float history backed by one array('d').
+    The array grows lazily up to `capacity`, after which new samples
+    overwrite the oldest in place. A running sum makes the mean O(1);
+    it is recomputed once per full wrap so float drift cannot build up.
+    """
+
+    __slots__ = ("capacity", "_data", "_head", "_sum", "_writes")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = array("d")
+        self._head = 0  # next slot to overwrite once full
+        self._sum = 0.0
+        self._writes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def append(self, value: float):
+        data = self._data
+
+        if len(data) < self.capacity:
+            data.append(value)
+            self._sum += value
+            return
+
+        self._sum += value - data[self._head]
+        data[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+
+        self._writes += 1
+        if self._writes >= self.capacity:
+            self._writes = 0
+            self._sum = sum(data)
+
+    def extend(self, values: Iterable[float]):
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        del self._data[:]
+        self._head = 0
+        self._sum = 0.0
+        self._writes = 0
+
+    # --------------------------------------------------
+    # READS (NO COPIES)
+    # --------------------------------------------------
+    @property
+    def total(self) -> float:
+        return self._sum
+
+    def mean(self) -> float:
+        return self._sum / len(self._data) if self._data else 0.0
+
+    def last(self) -> float | None:
+        if not self._data:
+            return None
+        return self._data[self._head - 1]
+
+    def window(self, count: int) -> Iterator[float]:
+        """
+        Yield the newest `count` samples, oldest first.
+        """
+        data = self._data
+        size = len(data)
+        count = min(count, size)
+        start = self._head - count
+
+        for i in range(start, start + count):
+            yield data[i % size]
+
+    def __iter__(self) -> Iterator[float]:
+        return self.window(len(self._data))
+
+    # --------------------------------------------------
+    # SERIALIZATION (OLDEST FIRST)
+    # --------------------------------------------------
+    def to_bytes(self) -> bytes:
+        return array("d", self).tobytes()
+
+    def load_bytes(self, raw: bytes):
+        samples = array("d")
+        samples.frombytes(raw)
+        del samples[: -self.capacity]  # keep the newest
+
+        self._data = samples
+        self._head = 0
+        self._sum = sum(samples)
+        self._writes = 0
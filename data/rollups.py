@@ -0,0 +1,378 @@
+"""
+Uptime Rollups
+Copyright (c) 2025 Mac GunJon
+Production-Grade Multi-Resolution Check Aggregates
+"""
+
+import math
+import struct
+import sys
+from array import array
+from typing import Dict, Tuple
+
+_LENGTH = struct.Struct("<I")
+
+# packed tier: newest bucket, bucket count, 32-bit check counts
+_PACKED = struct.Struct("<qIB")
+_NARROW_MAX = 0xFFFF  # check counts above it need 32 bits
+_LOW_HALF = 0 if sys.byteorder == "little" else 1
+
+# (bucket seconds, bucket count) from fine to coarse
+ROLLUP_TIERS: Tuple[Tuple[int, int], ...] = (
+    (60, 120),      # 1 minute buckets, 2 hours
+    (3600, 170),    # 1 hour buckets, 7 days + slack
+    (86400, 92),    # 1 day buckets, 3 months
+)
+
+MAX_QUERY_BUCKETS = 200  # reads allowed before a coarser tier is used
+
+# sliding uptime windows shown by commands: label -> seconds
+UPTIME_WINDOWS: Dict[str, int] = {
+    "1h": 3600,         # minute tier, 61 buckets
+    "24h": 86400,       # hour tier, 25 buckets
+    "7d": 7 * 86400,    # hour tier, 169 buckets
+}
+
+
+class RollupTier:
+    """
+    Circular array of time buckets at one resolution.
+    Each slot remembers which bucket it holds, so a stale slot is
+    recycled on write and ignored on read; no sweeping is needed.
+    Storage is allocated on first write.
+    """
+
+    __slots__ = (
+        "resolution", "size", "_epoch", "_newest", "checks", "success",
+        "latency_sum", "latency_min", "latency_max",
+    )
+
+    def __init__(self, resolution: int, size: int):
+        self.resolution = resolution
+        self.size = size
+        self._epoch = None  # bucket number held by each slot
+
+    def _allocate(self):
+        self._epoch = array("q", [-1]) * self.size
+        self._newest = -1  # latest bucket written
+        self.checks = array("I", [0]) * self.size
+        self.success = array("I", [0]) * self.size
+        self.latency_sum = array("d", [0.0]) * self.size
+        self.latency_min = array("f", [math.inf]) * self.size
+        self.latency_max = array("f", [0.0]) * self.size
+
+    def covers(self, since: float, until: float) -> bool:
+        return until // self.resolution - since // self.resolution < self.size
+
+    def record(self, timestamp: float, *, failed: bool, latency: float | None):
+        if self._epoch is None:
+            self._allocate()
+
+        bucket = int(timestamp // self.resolution)
+        slot = bucket % self.size
+
+        if self._epoch[slot] != bucket:
+            self._epoch[slot] = bucket
+            if bucket > self._newest:
+                self._newest = bucket
+            self.checks[slot] = 0
+            self.success[slot] = 0
+            self.latency_sum[slot] = 0.0
+            self.latency_min[slot] = math.inf
+            self.latency_max[slot] = 0.0
+
+        self.checks[slot] += 1
+        if not failed:
+            self.success[slot] += 1
+
+        if latency is not None:
+            self.latency_sum[slot] += latency
+            self.latency_min[slot] = min(self.latency_min[slot], latency)
+            self.latency_max[slot] = max(self.latency_max[slot], latency)
+
+    def summarize(self, since: float, until: float) -> dict:
+        checks = success = 0
+        latency_sum = 0.0
+        latency_min = latency_max = None
+
+        if self._epoch is not None:
+            for bucket in range(
+                int(since // self.resolution), int(until // self.resolution) + 1
+            ):
+                slot = bucket % self.size
+                if self._epoch[slot] != bucket:
+                    continue
+
+                checks += self.checks[slot]
+                success += self.success[slot]
+                if self.latency_min[slot] != math.inf:
+                    latency_sum += self.latency_sum[slot]
+                    low, high = self.latency_min[slot], self.latency_max[slot]
+                    latency_min = low if latency_min is None else min(latency_min, low)
+                    latency_max = high if latency_max is None else max(latency_max, high)
+
+        return {
+            "checks": checks,
+            "success": success,
+            "uptime": success / checks * 100 if checks else None,
+            "avg_latency": latency_sum / success if latency_min is not None else None,
+            "min_latency": latency_min,
+            "max_latency": latency_max,
+        }
+
+    def uptime(self, since: float, until: float) -> float | None:
+        """
+        Success ratio only: the hot path of views and list commands.
+        """
+        checks = success = 0
+
+        epochs = self._epoch
+        if epochs is not None:
+            size = self.size
+            for bucket in range(
+                int(since // self.resolution), int(until // self.resolution) + 1
+            ):
+                slot = bucket % size
+                if epochs[slot] == bucket:
+                    checks += self.checks[slot]
+                    success += self.success[slot]
+
+        return success / checks * 100 if checks else None
+
+    def clear(self):
+        self._epoch = None
+
+    # --------------------------------------------------
+    # SERIALIZATION
+    # --------------------------------------------------
+    def to_bytes(self) -> bytes:
+        """
+        Live buckets only, oldest to newest, as columns: _PACKED
+        header, then checks, success (16-bit unless a count needs
+        32), latency sum, min and max. Slot epochs are implied by the
+        bucket range; buckets in the range that hold no checks are
+        written empty.
+        """
+        epochs = self._epoch
+        if epochs is None or self._newest < 0:
+            return b""
+        newest = self._newest
+
+        size = self.size
+        floor = newest - size  # buckets at or below it are stale
+        lowest = min(epochs)
+        oldest = lowest if lowest > floor else min(e for e in epochs if e > floor)
+        count = newest - oldest + 1
+        start = oldest % size
+        end = start + count
+
+        def rotate(column: array) -> array:
+            if end <= size:
+                return column[start:end]
+            return column[start:] + column[: end - size]
+
+        columns = [
+            rotate(column) for column in (
+                self.checks, self.success,
+                self.latency_sum, self.latency_min, self.latency_max,
+            )
+        ]
+
+        # a slot in the range holds either its bucket or a stale one
+        if lowest <= floor:
+            held = rotate(epochs)
+            checks, success, total, low, high = columns
+            for i, epoch in enumerate(held):
+                if epoch != oldest + i:
+                    checks[i] = success[i] = 0
+                    total[i] = high[i] = 0.0
+                    low[i] = math.inf
+
+        wide = max(columns[0]) > _NARROW_MAX
+        parts = [_PACKED.pack(newest, count, wide)]
+        for index, column in enumerate(columns):
+            if index < 2 and not wide:
+                parts.append(_halves(column)[_LOW_HALF::2].tobytes())
+            else:
+                parts.append(column.tobytes())
+        return b"".join(parts)
+
+    def load_bytes(self, raw: bytes):
+        if not raw:
+            self.clear()
+            return
+
+        newest, count, wide = _PACKED.unpack_from(raw)
+        oldest = newest - count + 1
+        start = oldest % self.size
+        split = min(count, self.size - start)  # the range wraps after it
+
+        self._allocate()
+        self._newest = newest
+        columns = [array("q", range(oldest, newest + 1))]
+        pos = _PACKED.size
+        for typecode in ("I", "I", "d", "f", "f"):
+            if typecode == "I" and not wide:
+                column = array("I", [0]) * count
+                width = 2 * count
+                _halves(column)[_LOW_HALF::2] = (
+                    memoryview(raw[pos : pos + width]).cast("H")
+                )
+            else:
+                column = array(typecode)
+                width = column.itemsize * count
+                column.frombytes(raw[pos : pos + width])
+            columns.append(column)
+            pos += width
+
+        for target, column in zip(self._arrays(), columns):
+            target[start : start + split] = column[:split]
+            if split < count:
+                target[: count - split] = column[split:]
+
+    def _arrays(self):
+        return (
+            self._epoch, self.checks, self.success,
+            self.latency_sum, self.latency_min, self.latency_max,
+        )
+
+
+def _halves(column: array) -> memoryview:
+    """
+    A 32-bit column as 16-bit halves; counts that fit are stored as
+    their low halves.
+    """
+    return memoryview(column).cast("B").cast("H")
+
+
+def _packed_uptime(
+    raw: bytes, resolution: int, since: float, until: float,
+) -> float | None:
+    """
+    RollupTier.uptime straight from to_bytes() output: the buckets
+    are contiguous, so the window is one slice of each column.
+    """
+    if not raw:
+        return None
+
+    newest, count, wide = _PACKED.unpack_from(raw)
+    oldest = newest - count + 1
+    first = max(int(since // resolution), oldest) - oldest
+    last = min(int(until // resolution), newest) - oldest + 1
+    if first >= last:
+        return None
+
+    checks = array("I" if wide else "H")
+    width = checks.itemsize
+    success = array(checks.typecode)
+    base = _PACKED.size
+    checks.frombytes(raw[base + first * width : base + last * width])
+    base += count * width
+    success.frombytes(raw[base + first * width : base + last * width])
+
+    total = sum(checks)
+    return sum(success) / total * 100 if total else None
+
+
+class Rollups:
+    """
+    Per-target check aggregates at minute, hour and day resolution.
+    Every tier is updated on each check (equivalent to downsampling
+    the finer tiers, without a compaction pass), memory is fixed per
+    target, and a range query reads at most MAX_QUERY_BUCKETS buckets
+    of the finest tier that covers it. Range edges are rounded out to
+    that tier's bucket size.
+
+    Rollups.packed() wraps to_bytes() output without decoding it:
+    uptime() reads the packed columns directly and anything else
+    unpacks on first use, so a restart only pays for what it touches.
+    """
+
+    __slots__ = ("_tiers", "_packed")
+
+    def __init__(self):
+        self._tiers = tuple(
+            RollupTier(resolution, size) for resolution, size in ROLLUP_TIERS
+        )
+        self._packed = None
+
+    @classmethod
+    def packed(cls, raw: bytes) -> "Rollups":
+        rollups = cls.__new__(cls)
+        rollups._tiers = None
+        rollups._packed = raw
+        return rollups
+
+    @property
+    def tiers(self) -> Tuple[RollupTier, ...]:
+        if self._tiers is None:
+            raw = self._packed
+            self.__init__()
+            self.load_bytes(raw)
+        return self._tiers
+
+    def record(self, timestamp: float, *, failed: bool, latency: float | None):
+        for tier in self.tiers:
+            tier.record(timestamp, failed=failed, latency=latency)
+
+    @staticmethod
+    def _tier_index(since: float, until: float) -> int:
+        for index, (resolution, size) in enumerate(ROLLUP_TIERS):
+            buckets = until // resolution - since // resolution + 1
+            if buckets <= MAX_QUERY_BUCKETS and buckets <= size:
+                return index
+        return len(ROLLUP_TIERS) - 1
+
+    def tier_for(self, since: float, until: float) -> RollupTier:
+        return self.tiers[self._tier_index(since, until)]
+
+    def summarize(self, since: float, until: float) -> dict:
+        return self.tier_for(since, until).summarize(since, until)
+
+    def uptime(self, since: float, until: float) -> float | None:
+        index = self._tier_index(since, until)
+        if self._tiers is None:
+            return _packed_uptime(
+                self._segment(index), ROLLUP_TIERS[index][0], since, until
+            )
+        return self._tiers[index].uptime(since, until)
+
+    def clear(self):
+        self.__init__()
+
+    def to_bytes(self, *, first_tier: int=0) -> bytes:
+        """
+        Tiers before `first_tier` are written empty.
+        """
+        if self._tiers is None and not any(
+            self._segment(index) for index in range(first_tier)
+        ):
+            return bytes(self._packed)
+
+        parts = []
+        for index, tier in enumerate(self.tiers):
+            raw = tier.to_bytes() if index >= first_tier else b""
+            parts.append(_LENGTH.pack(len(raw)))
+            parts.append(raw)
+        return b"".join(parts)
+
+    def _segment(self, index: int) -> bytes:
+        """
+        Tier `index` of the packed form.
+        """
+        raw = self._packed
+        pos = 0
+        for _ in range(index):
+            (length,) = _LENGTH.unpack_from(raw, pos)
+            pos += _LENGTH.size + length
+        (length,) = _LENGTH.unpack_from(raw, pos)
+        pos += _LENGTH.size
+        return raw[pos : pos + length]
+
+    def load_bytes(self, raw: bytes):
+        pos = 0
+        for tier in self.tiers:
+            (length,) = _LENGTH.unpack_from(raw, pos)
+            pos += _LENGTH.size
+            tier.load_bytes(raw[pos : pos + length])
+            pos += length
@@ -0,0 +1,232 @@
+"""
+Latency Sketches
+Copyright (c) 2025 Mac GunJon
+Production-Grade Streaming Quantiles (DDSketch)
+"""
+
+import math
+import struct
+from array import array
+from typing import Dict, List
+
+SKETCH_ALPHA = 0.01      # relative accuracy of every quantile
+SKETCH_MAX_BINS = 512    # lowest bins are collapsed beyond this (1ms..28s at 1%)
+MIN_TRACKED = 1e-6       # seconds; smaller values count as zero
+
+SKETCH_RESOLUTION = 4 * 3600  # one sketch per 4 hours
+SKETCH_BUCKETS = 6            # a day kept per target
+
+PERCENTILES = (("p50", 0.50), ("p90", 0.90), ("p99", 0.99))
+
+# offset, zero count, count, total, min, max (bins follow)
+_SKETCH_HEADER = struct.Struct("<qQQddd")
+
+# hour bucket, sketch length
+_ENTRY_HEADER = struct.Struct("<qI")
+
+
+class DDSketch:
+    """
+    Quantile sketch with relative error guarantee (Masson et al.).
+    Value x lands in bin ceil(log_gamma(x)) with
+    gamma = (1 + alpha) / (1 - alpha), so any reported quantile is
+    within alpha of the true value. Bins are a dense array('I')
+    spanning only the observed range; two sketches with the same
+    alpha merge by adding bin counts.
+    """
+
+    __slots__ = (
+        "alpha", "_gamma_log", "_bins", "_offset",
+        "zero_count", "count", "total", "min", "max",
+    )
+
+    def __init__(self, alpha: float=SKETCH_ALPHA):
+        self.alpha = alpha
+        self._gamma_log = math.log((1 + alpha) / (1 - alpha))
+        self._bins = array("I")
+        self._offset = 0  # key of _bins[0]
+
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    # --------------------------------------------------
+    # BIN MAPPING
+    # --------------------------------------------------
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._gamma_log)
+
+    def _value(self, key: int) -> float:
+        # midpoint (in relative terms) of the bin's range
+        return 2 * math.exp(key * self._gamma_log) / (
+            1 + math.exp(self._gamma_log)
+        )
+
+    def _add_to_bin(self, key: int, weight: int):
+        bins = self._bins
+
+        if not bins:
+            self._offset = key
+            bins.append(0)
+        elif key < self._offset:
+            self._bins = bins = array("I", [0]) * (self._offset - key) + bins
+            self._offset = key
+        elif key >= self._offset + len(bins):
+            bins.extend([0] * (key - self._offset - len(bins) + 1))
+
+        bins[key - self._offset] += weight
+
+        # keep memory bounded: fold the lowest bins together
+        excess = len(bins) - SKETCH_MAX_BINS
+        if excess > 0:
+            folded = sum(bins[: excess + 1])
+            del bins[:excess]
+            bins[0] = folded
+            self._offset += excess
+
+    # --------------------------------------------------
+    # WRITES
+    # --------------------------------------------------
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if value <= MIN_TRACKED:
+            self.zero_count += 1
+        else:
+            self._add_to_bin(self._key(value), 1)
+
+    def merge(self, other: "DDSketch"):
+        if other.alpha != self.alpha:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        if not other.count:
+            return
+
+        self.count += other.count
+        self.total += other.total
+        self.zero_count += other.zero_count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        if other._bins:
+            # size the bin range once instead of growing per bin
+            self._add_to_bin(other._offset, 0)
+            self._add_to_bin(other._offset + len(other._bins) - 1, 0)
+
+        for index, weight in enumerate(other._bins):
+            if weight:
+                self._add_to_bin(other._offset + index, weight)
+
+    # --------------------------------------------------
+    # READS
+    # --------------------------------------------------
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for index, weight in enumerate(self._bins):
+            seen += weight
+            if rank < seen:
+                value = self._value(self._offset + index)
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    def to_bytes(self) -> bytes:
+        return _SKETCH_HEADER.pack(
+            self._offset, self.zero_count, self.count,
+            self.total, self.min, self.max,
+        ) + self._bins.tobytes()
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "DDSketch":
+        sketch = cls()
+        (
+            sketch._offset, sketch.zero_count, sketch.count,
+            sketch.total, sketch.min, sketch.max,
+        ) = _SKETCH_HEADER.unpack_from(raw)
+        sketch._bins.frombytes(raw[_SKETCH_HEADER.size :])
+        return sketch
+
+    def summary(self) -> Dict[str, float]:
+        if not self.count:
+            return {}
+        result = {name: self.quantile(q) for name, q in PERCENTILES}
+        result["max"] = self.max
+        return result
+
+
+class LatencySketches:
+    """
+    DDSketches of SKETCH_RESOLUTION seconds each in a circular buffer
+    (SKETCH_BUCKETS of them). A window query merges the sketches of
+    the buckets it spans, so the cost is bounded by the bucket count,
+    not the sample count, and windows are rounded out to whole buckets.
+    Sketches are allocated on the first sample of each bucket.
+    """
+
+    __slots__ = ("_epochs", "_sketches")
+
+    def __init__(self):
+        self._epochs: List[int] = [-1] * SKETCH_BUCKETS
+        self._sketches: List[DDSketch | None] = [None] * SKETCH_BUCKETS
+
+    def record(self, timestamp: float, latency: float):
+        bucket = int(timestamp // SKETCH_RESOLUTION)
+        slot = bucket % SKETCH_BUCKETS
+
+        if self._epochs[slot] != bucket or self._sketches[slot] is None:
+            self._epochs[slot] = bucket
+            self._sketches[slot] = DDSketch()
+
+        self._sketches[slot].add(latency)
+
+    def window(self, since: float, until: float) -> DDSketch:
+        merged = DDSketch()
+        first = int(since // SKETCH_RESOLUTION)
+        last = int(until // SKETCH_RESOLUTION)
+
+        for bucket in range(max(first, last - SKETCH_BUCKETS + 1), last + 1):
+            slot = bucket % SKETCH_BUCKETS
+            sketch = self._sketches[slot]
+            if sketch is not None and self._epochs[slot] == bucket:
+                merged.merge(sketch)
+
+        return merged
+
+    def clear(self):
+        self._epochs = [-1] * SKETCH_BUCKETS
+        self._sketches = [None] * SKETCH_BUCKETS
+
+    def to_bytes(self) -> bytes:
+        parts = []
+        for epoch, sketch in zip(self._epochs, self._sketches):
+            if sketch is None:
+                continue
+            raw = sketch.to_bytes()
+            parts.append(_ENTRY_HEADER.pack(epoch, len(raw)))
+            parts.append(raw)
+        return b"".join(parts)
+
+    def load_bytes(self, raw: bytes):
+        self.clear()
+        pos = 0
+        while pos < len(raw):
+            epoch, length = _ENTRY_HEADER.unpack_from(raw, pos)
+            pos += _ENTRY_HEADER.size
+            slot = epoch % SKETCH_BUCKETS
+            self._epochs[slot] = epoch
+            self._sketches[slot] = DDSketch.from_bytes(raw[pos : pos + length])
+            pos += length
@@ -0,0 +1,194 @@
+"""
+State Snapshots
+Copyright (c) 2025 Mac GunJon
+Production-Grade Binary Warm Restart
+"""
+
+import math
+import mmap
+import os
+import struct
+from typing import List, NamedTuple, Sequence, Tuple
+
+from data.check_log import decode_status, encode_status
+from data.models import Target
+from data.rollups import Rollups
+
+MAGIC = b"UGSNAP05"  # 02: guild_id, 03: no uptime windows, 04: compact, 05: sections
+
+# rollups from the hour tier up; minute buckets and raw samples age out
+# within hours, so they are rebuilt by the first checks after a restart
+SNAPSHOT_FIRST_TIER = 1
+
+# magic, created (unix), target count, text section bytes
+HEADER = struct.Struct("<8sdIQ")
+
+# id, guild_id, created_at, last_checked (NaN = never), fails, checks,
+# success, paused, alerted_down, status code, then the byte lengths of
+# name, url, probe and rollups
+FIXED = struct.Struct("<IQddIIIBBhHHBI")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+# --------------------------------------------------
+# ENCODING (EVENT LOOP)
+# --------------------------------------------------
+class EncodedTarget(NamedTuple):
+    """
+    One target's share of each file section.
+    """
+    fixed: bytes
+    text: bytes
+    rollups: bytes
+
+
+def encode_target(target: Target) -> EncodedTarget:
+    name = target.name.encode()
+    url = target.url.encode()
+    probe = target.probe.encode()
+    rollups = (
+        target.rollups.to_bytes(first_tier=SNAPSHOT_FIRST_TIER)
+        if target.rollups else b""
+    )
+    return EncodedTarget(
+        FIXED.pack(
+            target.id,
+            target.guild_id,
+            target.created_at,
+            math.nan if target.last_checked is None else target.last_checked,
+            target.fails,
+            target.checks,
+            target.success,
+            target.paused,
+            target.alerted_down,
+            encode_status(target.last_status),
+            len(name),
+            len(url),
+            len(probe),
+            len(rollups),
+        ),
+        name + url + probe,
+        rollups,
+    )
+
+
+# --------------------------------------------------
+# DECODING
+# --------------------------------------------------
+def _parse(view: memoryview, count: int, text_size: int) -> List[Target]:
+    """
+    Fixed fields in one iter_unpack pass; strings are sliced from
+    the text section, and rollups stay packed views of the section
+    after it until a target first needs them.
+    """
+    fixed_end = HEADER.size + count * FIXED.size
+    text = bytes(view[fixed_end : fixed_end + text_size])
+    rollups = fixed_end + text_size
+    pos = 0
+    saved: List[Target] = []
+    append = saved.append
+    isnan = math.isnan
+    packed = Rollups.packed
+
+    for (
+        target_id, guild_id, created_at, last_checked, fails, checks,
+        success, paused, alerted_down, status,
+        name_len, url_len, probe_len, rollups_len,
+    ) in FIXED.iter_unpack(view[HEADER.size : fixed_end]):
+        url_at = pos + name_len
+        probe_at = url_at + url_len
+        end = probe_at + probe_len
+
+        append(Target(
+            name=text[pos:url_at].decode(),
+            url=text[url_at:probe_at].decode(),
+            id=target_id,
+            guild_id=guild_id,
+            probe=text[probe_at:end].decode(),
+            paused=bool(paused),
+            last_status=decode_status(status),
+            last_checked=None if isnan(last_checked) else last_checked,
+            fails=fails,
+            alerted_down=bool(alerted_down),
+            checks=checks,
+            success=success,
+            rollups=(
+                packed(view[rollups : rollups + rollups_len])
+                if rollups_len else None
+            ),
+            created_at=created_at,
+        ))
+        pos = end
+        rollups += rollups_len
+
+    if pos != text_size or rollups != len(view):
+        raise SnapshotError("snapshot length does not match its records")
+    return saved
+
+
+def restore_state(target: Target, saved: Target, *, status: bool=True):
+    """
+    Take the rollups of the restored `saved` and, unless `status` is
+    False, its status, counters and failure tracking too.
+    """
+    if saved.rollups is not None:
+        target.rollups = saved.rollups
+
+    if status:
+        target.last_status = saved.last_status
+        target.last_checked = saved.last_checked
+        target.fails = saved.fails
+        target.alerted_down = saved.alerted_down
+        target.checks = saved.checks
+        target.success = saved.success
+
+
+# --------------------------------------------------
+# FILE I/O (EXECUTOR)
+# --------------------------------------------------
+def write_snapshot(
+    path: str,
+    records: Sequence[EncodedTarget],
+    *,
+    created: float,
+):
+    """
+    Write to a temp file, fsync, then atomically replace, so a crash
+    mid-write never leaves a truncated snapshot behind.
+    """
+    text_size = sum(len(record.text) for record in records)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, created, len(records), text_size))
+        for section in EncodedTarget._fields:
+            f.write(b"".join(getattr(record, section) for record in records))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: str) -> Tuple[float, List[Target]]:
+    """
+    Targets as they were saved, not yet indexed. The file is mapped
+    rather than read: restored rollups stay views of it, and pages
+    nothing touches are never loaded. Replacing the
+    file later leaves the mapping valid.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise SnapshotError("snapshot is truncated")
+        view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    magic, created, count, text_size = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise SnapshotError("not a snapshot file or unsupported version")
+    if HEADER.size + count * FIXED.size + text_size > len(view):
+        raise SnapshotError("snapshot is truncated")
+
+    try:
+        return created, _parse(view, count, text_size)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise SnapshotError(f"snapshot is corrupt: {e}") from e
@@ -5,185 +5,734 @@ Production-Grade Data Layer
 """
 
 import asyncio
-from typing import Dict, List, Optional
-from datetime import datetime
-
+import gc
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Set
+
+from core.config import (
+    CHECK_LOG_COMPACT_INTERVAL,
+    CHECK_LOG_DIR,
+    CHECK_LOG_RETENTION_DAYS,
+    CHECK_LOG_SEGMENT_MB,
+    DATABASE_PATH,
+    DB_FLUSH_BATCH,
+    DB_FLUSH_INTERVAL,
+    PHASE_HISTORY_DEPTH,
+    SNAPSHOT_INTERVAL,
+    SNAPSHOT_PATH,
+)
 from core.logger import setup_logger
+from data.check_log import CheckLog
+from data.database import Database, target_row
+from data.models import StatusUpdate, Target, target_key
+from data.ring_buffer import RingBuffer
+from data.snapshot import (
+    EncodedTarget,
+    SnapshotError,
+    encode_target,
+    read_snapshot,
+    restore_state,
+    write_snapshot,
+)
+from data.partition import NO_GUILD, GuildPartition
+from data.rollups import UPTIME_WINDOWS, Rollups
+from data.sketch import LatencySketches
+from data.view import StoreView
 
 logger = setup_logger()
 
+SNAPSHOT_CHUNK = 2000  # targets encoded between event loop yields
+
 
 class MonitorStore:
     """
-    Async-safe in-memory store.
-    URL is the internal key.
-    All user operations are performed via SERVICE NAME.
+    Async-safe in-memory store, partitioned by guild.
+    Each guild's targets live in a GuildPartition (names and URLs are
+    unique per guild); the check path addresses targets by
+    Target.key through one global index.
+    All user operations are performed via GUILD + SERVICE NAME.
+
+    Concurrency model: single writer, no lock.
+    The store is only touched from the bot's event loop thread
+    (worker and agent results are marshalled onto it), and no method
+    awaits between reading and writing state, so every call runs to
+    completion atomically. Methods stay async so a future backend
+    can do I/O without changing callers.
+
+    Persistence: target CRUD is written through to SQLite at once;
+    check results only mark the target dirty and are flushed in
+    batches by a background write-behind task. Every check result is
+    also appended to the binary check log for long-range history.
+    Compact binary snapshots of status, counters and hour / day
+    rollups make restarts warm.
+
+    Reads for slash commands go through view(guild_id): the guild's
+    immutable, copy-on-write StoreView, so readers never copy the
+    target set and never see a target half-updated.
     """
 
     def __init__(self):
-        self._targets: Dict[str, dict] = {}
-        self._lock = asyncio.Lock()
+        self._targets: Dict[str, Target] = {}  # Target.key -> target
+        self._guilds: Dict[int, GuildPartition] = {}
+
+        # bumped when targets are added, removed, paused, resumed or
+        # re-timed so consumers can skip unchanged sets
+        self.revision = 0
+
+        # persistence (disabled until load_from_db)
+        self.db: Database | None = None
+        self.check_log: CheckLog | None = None
+        self._next_id = 1
+        self._dirty: Set[str] = set()
+        self._flush_wanted = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+        self._compactor: asyncio.Task | None = None
+        self._snapshotter: asyncio.Task | None = None
+        self._snapshot_path = ""
+        self._closed = False
 
     # --------------------------------------------------
     # INTERNAL RESOLVER
     # --------------------------------------------------
-    def _find_by_name(self, name: str) -> Optional[dict]:
-        for target in self._targets.values():
-            if target["name"].lower() == name.lower():
-                return target
-        return None
+    def _partition(self, guild_id: int) -> GuildPartition:
+        partition = self._guilds.get(guild_id)
+        if partition is None:
+            partition = self._guilds[guild_id] = GuildPartition(guild_id)
+        return partition
+
+    def _find(self, guild_id: int, name: str) -> Optional[Target]:
+        partition = self._guilds.get(guild_id)
+        return partition.find(name) if partition else None
+
+    def _index(self, target: Target):
+        self._targets[target.key] = target
+        self._partition(target.guild_id).insert(target)
+
+    def _retune(self, partition: GuildPartition):
+        if partition.retune():
+            self.revision += 1
+            logger.info(
+                f"Guild check interval | {partition.guild_id} | "
+                f"{partition.interval or 'default'}"
+            )
+
+    def _mark_dirty(self, *keys: str):
+        if not self.db:
+            return
+        self._dirty.update(keys)
+        if len(self._dirty) >= DB_FLUSH_BATCH:
+            self._flush_wanted.set()
+
+    def _publish_all(self):
+        for partition in self._guilds.values():
+            partition.retune()
+            partition.publish(full=True)
+
+    async def _write_through(self, target: Target):
+        if self.db:
+            await self.db.update([target_row(target)])
 
     # --------------------------------------------------
-    # CREATE (NAME + URL)
+    # CREATE (GUILD + NAME + URL)
     # --------------------------------------------------
-    async def add(self, *, name: str, url: str) -> bool:
-        async with self._lock:
-            # duplicate URL
-            if url in self._targets:
-                logger.warning(f"Duplicate URL attempt: {url}")
-                return False
-
-            # duplicate NAME
-            if self._find_by_name(name):
-                logger.warning(f"Duplicate service name attempt: {name}")
-                return False
-
-            self._targets[url] = {
-                # identity
-                "name": name,
-                "url": url,
-
-                # control
-                "paused": False,
-
-                # status
-                "last_status": None,
-                "last_checked": None,
-
-                # failure tracking
-                "fails": 0,
-                "alerted_down": False,
-
-                # metrics
-                "checks": 0,
-                "success": 0,
-                "response_times": [],
-
-                # audit
-                "created_at": datetime.utcnow(),
-            }
+    async def guild_full(self, guild_id: int) -> bool:
+        partition = self._guilds.get(guild_id)
+        return bool(partition and partition.full)
 
-            logger.info(f"Monitoring started | {name} -> {url}")
-            return True
+    async def add(
+        self,
+        *,
+        guild_id: int,
+        name: str,
+        url: str,
+        probe: str="get",
+    ) -> bool:
+        partition = self._partition(guild_id)
+
+        # per-guild target limit
+        if partition.full:
+            logger.warning(f"Guild target limit reached: {guild_id}")
+            return False
+
+        # duplicate URL
+        if url in partition.targets:
+            logger.warning(f"Duplicate URL attempt: {url}")
+            return False
+
+        # duplicate NAME
+        if partition.find(name):
+            logger.warning(f"Duplicate service name attempt: {name}")
+            return False
+
+        target = Target(
+            name=name,
+            url=url,
+            id=self._next_id,
+            guild_id=guild_id,
+            probe=probe,
+        )
+        self._index(target)
+        self._next_id += 1
+        self.revision += 1
+        self._retune(partition)
+
+        if self.db:
+            await self.db.insert(target, next_id=self._next_id)
+
+        logger.info(f"Monitoring started | {name} -> {url} ({probe})")
+        return True
 
     # --------------------------------------------------
-    # DELETE (NAME)
+    # DELETE (GUILD + NAME)
     # --------------------------------------------------
-    async def remove_by_name(self, name: str) -> bool:
-        async with self._lock:
-            target = self._find_by_name(name)
-            if not target:
-                return False
+    async def remove_by_name(self, guild_id: int, name: str) -> bool:
+        target = self._find(guild_id, name)
+        if not target:
+            return False
+
+        partition = self._guilds[guild_id]
+        partition.delete(target)
+        del self._targets[target.key]
+        self._dirty.discard(target.key)
+        self.revision += 1
+        self._retune(partition)
+
+        if self.db:
+            await self.db.delete(target.id)
+        logger.info(f"Monitoring removed | {name}")
+        return True
 
-            del self._targets[target["url"]]
-            logger.info(f"Monitoring removed | {name}")
-            return True
+    # --------------------------------------------------
+    # CLAIM (LEGACY -> GUILD)
+    # --------------------------------------------------
+    async def claim(self, guild_id: int, name: str) -> bool:
+        """
+        Move a target created before partitioning (NO_GUILD) into
+        `guild_id`, metrics and check history included. Refused when
+        the guild is full or already has that name or URL.
+        """
+        legacy = self._guilds.get(NO_GUILD)
+        target = legacy.find(name) if legacy else None
+        if not target or guild_id == NO_GUILD:
+            return False
+
+        partition = self._partition(guild_id)
+        if (
+            partition.full
+            or target.url in partition.targets
+            or partition.find(name)
+        ):
+            logger.warning(f"Claim refused | {name} -> guild {guild_id}")
+            return False
+
+        # the check-path key changes with the guild; the id does not
+        legacy.delete(target)
+        del self._targets[target.key]
+        self._dirty.discard(target.key)
+        target.guild_id = guild_id
+        self._index(target)
+        self.revision += 1
+        self._retune(legacy)
+        self._retune(partition)
+
+        await self._write_through(target)
+        logger.info(f"Legacy service claimed | {name} -> guild {guild_id}")
+        return True
 
     # --------------------------------------------------
     # READ
     # --------------------------------------------------
-    async def get_by_name(self, name: str) -> Optional[dict]:
-        async with self._lock:
-            return self._find_by_name(name)
-
-    async def all(self) -> List[dict]:
-        async with self._lock:
-            return list(self._targets.values())
+    async def get_by_name(self, guild_id: int, name: str) -> Optional[Target]:
+        return self._find(guild_id, name)
+
+    async def get_by_key(self, key: str) -> Optional[Target]:
+        return self._targets.get(key)
+
+    async def all(self) -> List[Target]:
+        """
+        Live targets of every guild, for the check path.
+        Commands use view().
+        """
+        return list(self._targets.values())
+
+    async def view(self, guild_id: int) -> StoreView:
+        """
+        The guild's current read-only view. Lock-free and copy-free;
+        pending changes are published first if a user changed a
+        target or the view is older than the publish interval.
+        """
+        partition = self._guilds.get(guild_id)
+        return partition.view() if partition else StoreView.empty()
 
     # --------------------------------------------------
-    # CONTROL (NAME)
+    # CONTROL (GUILD + NAME)
     # --------------------------------------------------
-    async def pause_by_name(self, name: str) -> bool:
-        async with self._lock:
-            target = self._find_by_name(name)
-            if not target:
-                return False
-
-            target["paused"] = True
-            logger.info(f"Monitoring paused | {name}")
-            return True
-
-    async def resume_by_name(self, name: str) -> bool:
-        async with self._lock:
-            target = self._find_by_name(name)
-            if not target:
-                return False
-
-            target["paused"] = False
-            logger.info(f"Monitoring resumed | {name}")
-            return True
+    async def pause_by_name(self, guild_id: int, name: str) -> bool:
+        target = self._find(guild_id, name)
+        if not target:
+            return False
+
+        target.paused = True
+        self.revision += 1
+        self._guilds[guild_id].touch(target.url)
+        await self._write_through(target)
+        logger.info(f"Monitoring paused | {name}")
+        return True
+
+    async def resume_by_name(self, guild_id: int, name: str) -> bool:
+        target = self._find(guild_id, name)
+        if not target:
+            return False
+
+        target.paused = False
+        self.revision += 1
+        self._guilds[guild_id].touch(target.url)
+        await self._write_through(target)
+        logger.info(f"Monitoring resumed | {name}")
+        return True
 
     # --------------------------------------------------
-    # STATUS + METRICS UPDATE (URL INTERNAL)
+    # STATUS + METRICS UPDATE (KEY INTERNAL)
     # --------------------------------------------------
     async def update_status(
         self,
         *,
-        url: str,
+        key: str,
         status,
         failed: bool,
         response_time: float | None=None,
+        phases: Dict[str, float] | None=None,
     ):
-        async with self._lock:
-            target = self._targets.get(url)
+        await self.apply_batch(
+            [StatusUpdate(key, status, failed, response_time, phases)]
+        )
+
+    async def apply_batch(self, updates: Sequence[StatusUpdate]) -> List[Target]:
+        """
+        Apply many check results in one pass: one clock read, and
+        dirty / view / flush bookkeeping once per batch instead of
+        once per result. Returns the updated targets (results for
+        removed targets are dropped).
+        """
+        now = time.time()
+        targets = self._targets
+        check_log = self.check_log
+        applied: List[Target] = []
+        touched: Dict[int, List[str]] = {}  # guild -> URLs
+
+        for update in updates:
+            target = targets.get(update.key)
             if not target:
-                return
-
-            now = datetime.utcnow()
-
-            # status
-            target["last_status"] = status
-            target["last_checked"] = now
-
-            # metrics
-            target["checks"] += 1
-
-            if failed:
-                target["fails"] += 1
-            else:
-                target["fails"] = 0
-                target["success"] += 1
-                target["alerted_down"] = False
-
-            if response_time is not None:
-                target["response_times"].append(response_time)
-                target["response_times"] = target["response_times"][-20:]
+                continue
+
+            self._apply(target, update, now)
+            applied.append(target)
+            touched.setdefault(target.guild_id, []).append(target.url)
+
+            if check_log:
+                check_log.append(
+                    target.id,
+                    timestamp=now,
+                    status=update.status,
+                    latency=update.response_time,
+                    failed=update.failed,
+                )
+
+        self._mark_dirty(*(target.key for target in applied))
+        for guild_id, urls in touched.items():
+            self._guilds[guild_id].mark_stale(urls)
+        return applied
+
+    @staticmethod
+    def _apply(target: Target, update: StatusUpdate, now: float):
+        failed = update.failed
+        response_time = update.response_time
+
+        # status
+        target.last_status = update.status
+        target.last_checked = now
+
+        # metrics
+        target.checks += 1
+
+        if failed:
+            target.fails += 1
+        else:
+            target.fails = 0
+            target.success += 1
+            # alerted_down is cleared by alert handling, once the
+            # RECOVERY alert is queued
+
+        # metric structures are allocated by the first check that
+        # writes them
+        if response_time is not None:
+            target.latency_history().append(response_time)
+            if target.latency_sketches is None:
+                target.latency_sketches = LatencySketches()
+            target.latency_sketches.record(now, response_time)
+
+        if update.phases:
+            if target.phase_times is None:
+                target.phase_times = {}
+            for phase, duration in update.phases.items():
+                history = target.phase_times.get(phase)
+                if history is None:
+                    history = target.phase_times[phase] = RingBuffer(
+                        PHASE_HISTORY_DEPTH
+                    )
+                history.append(duration)
+
+        if target.rollups is None:
+            target.rollups = Rollups()
+        target.rollups.record(now, failed=failed, latency=response_time)
+
+    async def reset_metrics(self, guild_id: int, name: str) -> Optional[Target]:
+        target = self._find(guild_id, name)
+        if not target:
+            return None
+
+        target.checks = 0
+        target.success = 0
+        target.fails = 0
+        target.response_times = None
+        target.phase_times = None
+        target.rollups = None
+        target.latency_sketches = None
+
+        self._mark_dirty(target.key)
+        self._guilds[guild_id].touch(target.url)
+        return target
 
     # --------------------------------------------------
     # DERIVED METRICS (NAME)
     # --------------------------------------------------
-    async def uptime_percentage(self, name: str) -> float:
-        async with self._lock:
-            target = self._find_by_name(name)
-            if not target or target["checks"] == 0:
-                return 0.0
-            return (target["success"] / target["checks"]) * 100
-
-    async def average_latency(self, name: str) -> float:
-        async with self._lock:
-            target = self._find_by_name(name)
-            if not target or not target["response_times"]:
-                return 0.0
-            return sum(target["response_times"]) / len(target["response_times"])
+    async def uptime_percentage(self, guild_id: int, name: str) -> float:
+        target = self._find(guild_id, name)
+        if not target or target.checks == 0:
+            return 0.0
+        return (target.success / target.checks) * 100
+
+    async def recent_uptime(self, guild_id: int, name: str, label: str="24h") -> float | None:
+        """
+        Sliding-window uptime (1h / 24h / 7d) from the rollups.
+        """
+        target = self._find(guild_id, name)
+        if not target or not target.rollups:
+            return None
+        now = time.time()
+        return target.rollups.uptime(now - UPTIME_WINDOWS[label], now)
+
+    async def window_summary(self, guild_id: int, name: str, seconds: float) -> dict | None:
+        """
+        Checks, uptime and latency over the last `seconds`, read from
+        a bounded number of rollup buckets.
+        """
+        target = self._find(guild_id, name)
+        if not target or not target.rollups:
+            return None
+        now = time.time()
+        return target.rollups.summarize(now - seconds, now)
+
+    async def latency_percentiles(
+        self, guild_id: int, name: str, seconds: float
+    ) -> Dict[str, float]:
+        """
+        p50 / p90 / p99 / max over the last `seconds` (at most a day),
+        merged from the target's sketches (SKETCH_RESOLUTION buckets).
+        """
+        target = self._find(guild_id, name)
+        if not target or not target.latency_sketches:
+            return {}
+        now = time.time()
+        return target.latency_sketches.window(now - seconds, now).summary()
+
+    async def average_latency(self, guild_id: int, name: str) -> float:
+        target = self._find(guild_id, name)
+        if not target or not target.response_times:
+            return 0.0
+        return target.response_times.mean()
+
+    async def average_phases(self, guild_id: int, name: str) -> Dict[str, float]:
+        target = self._find(guild_id, name)
+        if not target or not target.phase_times:
+            return {}
+        return {
+            phase: history.mean()
+            for phase, history in target.phase_times.items()
+            if history
+        }
+
+    async def history(
+        self,
+        guild_id: int,
+        name: str,
+        *,
+        since: float,
+        until: float | None=None,
+    ) -> dict | None:
+        """
+        Summarize a target's checks in [since, until] from the
+        check log. The scan runs in a thread, off the event loop.
+        """
+        target = self._find(guild_id, name)
+        if not target or not self.check_log:
+            return None
+
+        self.check_log.flush()
+        segments = self.check_log.segments()
+        until = time.time() if until is None else until
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: CheckLog.summarize(
+                segments, target.id, since=since, until=until
+            ),
+        )
 
     # --------------------------------------------------
-    # FUTURE DB HOOKS
+    # DB HOOKS (SQLITE)
     # --------------------------------------------------
-    async def load_from_db(self):
-        pass
+    async def load_from_db(self, path: str=DATABASE_PATH):
+        """
+        Open the database, bulk load every target and start the
+        write-behind flusher. An empty path keeps the store in memory.
+        """
+        if not path:
+            logger.warning("DATABASE_PATH is empty | persistence disabled")
+            return
+
+        self.db = Database(path)
+        await self.db.open()
+
+        started = time.monotonic()
+        targets, self._next_id = await self.db.load()
+        for target in targets:
+            self._index(target)
+        self.revision += 1
+        self._publish_all()
+
+        self._flusher = asyncio.create_task(self._flush_loop())
+        logger.info(
+            f"Targets loaded | {len(targets)} | "
+            f"{time.monotonic() - started:.3f}s"
+        )
+
+        # check ids are only stable with a database behind them
+        if CHECK_LOG_DIR:
+            self.check_log = CheckLog(
+                CHECK_LOG_DIR,
+                segment_bytes=CHECK_LOG_SEGMENT_MB * 1024 * 1024,
+                retention=CHECK_LOG_RETENTION_DAYS * 86400,
+            )
+            self.check_log.open()
+            self._compactor = asyncio.create_task(self._compact_loop())
+
+    async def save_to_db(self, *, full: bool=False):
+        """
+        Flush dirty targets (or every target) in one transaction.
+        Rows are copied here, on the event loop; only the write
+        itself runs on the database thread.
+        """
+        if not self.db:
+            return
+
+        keys = list(self._targets) if full else list(self._dirty)
+        self._dirty.clear()
+        if not keys:
+            return
+
+        rows = [
+            target_row(self._targets[key])
+            for key in keys
+            if key in self._targets
+        ]
+        try:
+            await self.db.update(rows)
+        except Exception:
+            # keep them dirty for the next flush
+            self._dirty.update(keys)
+            raise
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_wanted.wait(), DB_FLUSH_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wanted.clear()
+
+            try:
+                await self.save_to_db()
+                if self.check_log:
+                    self.check_log.flush()
+            except Exception as e:
+                logger.error("Write-behind flush failed", exc_info=e)
+
+    async def _compact_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # first pass at startup indexes segments sealed before it
+            try:
+                live_ids = {t.id for t in self._targets.values()}
+                await loop.run_in_executor(
+                    None,
+                    lambda: self.check_log.compact(
+                        self.check_log.sealed_segments(),
+                        live_ids,
+                        now=time.time(),
+                    ),
+                )
+            except Exception as e:
+                logger.error("Check log compaction failed", exc_info=e)
+            await asyncio.sleep(CHECK_LOG_COMPACT_INTERVAL)
+
+    async def close_db(self):
+        """
+        Stop the flusher, write every target and close the database.
+        """
+        if not self.db:
+            return
+
+        for task in (self._flusher, self._compactor):
+            if task:
+                task.cancel()
+        self._flusher = self._compactor = None
+
+        if self.check_log:
+            self.check_log.close()
+            self.check_log = None
+
+        try:
+            await self.save_to_db(full=True)
+        finally:
+            await self.db.close()
+            self.db = None
+            logger.info("Database closed")
+
 
-    async def save_to_db(self):
-        pass
+    # --------------------------------------------------
+    # SNAPSHOTS (WARM RESTART)
+    # --------------------------------------------------
+    async def load_snapshot(self, path: str=SNAPSHOT_PATH):
+        """
+        Restore in-memory state from the last snapshot and start the
+        periodic snapshot task. Call after load_from_db: with a
+        database, it stays the authority on which targets exist and
+        the snapshot only fills in their state; without one, the
+        snapshot restores the targets themselves.
+        """
+        if not path:
+            return
+
+        self._snapshot_path = path
+        self._snapshotter = asyncio.create_task(self._snapshot_loop(path))
+        if not os.path.exists(path):
+            return
+
+        started = time.monotonic()
+        restored = 0
+        # every object built here lives on: collecting mid-load only
+        # rescans the growing heap
+        gc.disable()
+        try:
+            created, targets = await asyncio.get_running_loop().run_in_executor(
+                None, read_snapshot, path
+            )
+
+            for saved in targets:
+                key = target_key(saved.guild_id, saved.url)
+                current = self._targets.get(key)
+
+                if current is None:
+                    if self.db:
+                        continue  # removed since the snapshot was taken
+                    self._targets[key] = saved
+                    self._partition(saved.guild_id).load(saved)
+                    if saved.id >= self._next_id:
+                        self._next_id = saved.id + 1
+                elif current.id == saved.id:
+                    # the database may have flushed a newer status since
+                    newer = (
+                        (saved.last_checked or 0) >= (current.last_checked or 0)
+                    )
+                    restore_state(current, saved, status=newer)
+                else:
+                    continue
+                restored += 1
+        except (OSError, SnapshotError) as e:
+            logger.error(f"Snapshot ignored | {path} | {e}")
+            return
+        finally:
+            gc.enable()
+
+        self.revision += 1
+        # views are rebuilt on first read, not here
+        for partition in self._guilds.values():
+            partition.retune()
+            partition.invalidate()
+        logger.info(
+            f"Snapshot restored | {restored}/{len(targets)} targets | "
+            f"age={time.time() - created:.0f}s | "
+            f"{time.monotonic() - started:.3f}s"
+        )
+
+    async def save_snapshot(self, path: str=SNAPSHOT_PATH):
+        """
+        Encode every target on the event loop (yielding between
+        chunks), then write the file from a thread.
+        """
+        if not path:
+            return
+
+        started = time.monotonic()
+        targets = list(self._targets.values())
+        records: List[EncodedTarget] = []
+
+        for start in range(0, len(targets), SNAPSHOT_CHUNK):
+            records.extend(
+                encode_target(t) for t in targets[start : start + SNAPSHOT_CHUNK]
+            )
+            await asyncio.sleep(0)
+
+        await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: write_snapshot(path, records, created=time.time()),
+        )
+        logger.info(
+            f"Snapshot saved | {len(records)} targets | "
+            f"{sum(len(part) for record in records for part in record)} bytes | "
+            f"{time.monotonic() - started:.3f}s"
+        )
+
+    async def _snapshot_loop(self, path: str):
+        while True:
+            await asyncio.sleep(SNAPSHOT_INTERVAL)
+            try:
+                await self.save_snapshot(path)
+            except Exception as e:
+                logger.error("Periodic snapshot failed", exc_info=e)
+
+    async def close(self):
+        """
+        Final snapshot, then flush and close the database.
+        Safe to call more than once.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._snapshotter:
+            self._snapshotter.cancel()
+            self._snapshotter = None
+            try:
+                await self.save_snapshot(self._snapshot_path)
+            except Exception as e:
+                logger.error("Final snapshot failed", exc_info=e)
+
+        await self.close_db()
 
 
 # --------------------------------------------------
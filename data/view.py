@@ -0,0 +1,141 @@
+"""
+Store Views
+Copyright (c) 2025 Mac GunJon
+Production-Grade Copy-On-Write Read Snapshots
+"""
+
+from datetime import datetime
+from typing import Dict, Iterator, NamedTuple, Optional, Set, Tuple
+
+from data.models import Target
+from data.rollups import UPTIME_WINDOWS
+
+
+class TargetView(NamedTuple):
+    """
+    Immutable copy of the fields commands display.
+    """
+
+    name: str
+    url: str
+    key: str
+    probe: str
+    paused: bool
+    last_status: int | str | None
+    last_checked: float | None
+    fails: int
+    checks: int
+    success: int
+    uptime_24h: float | None
+    created_at: float
+
+    @classmethod
+    def of(cls, target: Target, now: float) -> "TargetView":
+        return cls(
+            target.name,
+            target.url,
+            target.key,
+            target.probe,
+            target.paused,
+            target.last_status,
+            target.last_checked,
+            target.fails,
+            target.checks,
+            target.success,
+            (
+                target.rollups.uptime(now - UPTIME_WINDOWS["24h"], now)
+                if target.rollups else None
+            ),
+            target.created_at,
+        )
+
+    @property
+    def last_checked_at(self) -> datetime | None:
+        if self.last_checked is None:
+            return None
+        return datetime.utcfromtimestamp(self.last_checked)
+
+
+class StoreView:
+    """
+    Consistent, read-only picture of every target at one instant.
+    A view is never mutated after it is built: the store publishes a
+    new one, reusing the previous view's maps and copying only the
+    records that changed, and readers keep whichever view they got.
+    """
+
+    __slots__ = ("revision", "published", "_by_url", "_names", "_targets")
+
+    def __init__(
+        self,
+        by_url: Dict[str, TargetView],
+        names: Dict[str, str],
+        *,
+        revision: int,
+        published: float,
+    ):
+        self._by_url = by_url
+        self._names = names  # casefolded name -> URL, shared until it changes
+        self._targets: Tuple[TargetView, ...] = tuple(by_url.values())
+        self.revision = revision
+        self.published = published  # monotonic
+
+    @classmethod
+    def empty(cls) -> "StoreView":
+        return cls({}, {}, revision=0, published=0.0)
+
+    def replace(
+        self,
+        targets: Dict[str, Target],
+        stale: Set[str],
+        *,
+        names: Dict[str, str] | None,
+        revision: int,
+        now: float,
+        published: float,
+    ) -> "StoreView":
+        """
+        Next view: this one with the `stale` URLs re-copied from
+        `targets`. Pass `names` only when targets were added or
+        removed; the record order then follows `targets` again.
+        """
+        fresh = {
+            url: TargetView.of(targets[url], now)
+            for url in stale
+            if url in targets
+        }
+
+        if names is None:
+            by_url = dict(self._by_url)
+            by_url.update(fresh)
+        else:
+            old = self._by_url
+            by_url = {url: fresh.get(url) or old[url] for url in targets}
+            names = dict(names)
+
+        return StoreView(
+            by_url,
+            self._names if names is None else names,
+            revision=revision,
+            published=published,
+        )
+
+    # --------------------------------------------------
+    # READS
+    # --------------------------------------------------
+    def get_by_name(self, name: str) -> Optional[TargetView]:
+        url = self._names.get(name.casefold())
+        return self._by_url.get(url) if url else None
+
+    def get_by_url(self, url: str) -> Optional[TargetView]:
+        return self._by_url.get(url)
+
+    @property
+    def targets(self) -> Tuple[TargetView, ...]:
+        return self._targets
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def __iter__(self) -> Iterator[TargetView]:
+        return iter(self._targets)
@@ -0,0 +1,125 @@
+"""
+Probe Agent
+Copyright (c) 2025 Mac GunJon
+Production-Grade Remote Probe Node
+"""
+
+import asyncio
+
+from core.config import (
+    CHECK_CONCURRENCY_INITIAL,
+    CHECK_CONCURRENCY_MAX,
+    CHECK_CONCURRENCY_MIN,
+    CHECK_INTERVAL,
+    COORDINATOR_TOKEN,
+)
+from core.logger import setup_logger
+from data.models import Target
+from services.check_engine import CheckEngine, CheckResult
+from services.coordinator import read_message, send_message
+from services.http_pool import create_session
+from services.limiter import AdaptiveLimiter
+from services.scheduler import DeadlineScheduler
+
+logger = setup_logger()
+
+RECONNECT_BACKOFF = 2  # seconds, doubled per failed attempt
+RECONNECT_BACKOFF_MAX = 60
+
+
+async def run_agent(
+    *,
+    name: str,
+    host: str,
+    port: int,
+    token: str=COORDINATOR_TOKEN,
+):
+    """
+    Connect to a coordinator, probe whatever it assigns and stream
+    every final verdict back. Reconnects forever; the coordinator
+    replays the assignment after each reconnect.
+    """
+    writer: asyncio.StreamWriter | None = None
+
+    async def publish(target: Target, result: CheckResult):
+        if writer is None or writer.is_closing():
+            return
+        send_message(
+            writer,
+            {
+                "op": "result",
+                "key": result.key,
+                "status": result.status,
+                "elapsed": result.elapsed,
+                "phases": result.phases,
+                "error": result.error,
+            },
+        )
+
+    async with create_session() as session:
+        engine = CheckEngine(
+            session=session,
+            scheduler=DeadlineScheduler(CHECK_INTERVAL),
+            limiter=AdaptiveLimiter(
+                initial=CHECK_CONCURRENCY_INITIAL,
+                floor=CHECK_CONCURRENCY_MIN,
+                ceiling=CHECK_CONCURRENCY_MAX,
+            ),
+            on_result=publish,
+        )
+        runner = asyncio.create_task(engine.run())
+        backoff = RECONNECT_BACKOFF
+
+        try:
+            while True:
+                try:
+                    reader, writer = await asyncio.open_connection(host, port)
+                    send_message(
+                        writer,
+                        {"op": "hello", "agent": name, "token": token},
+                    )
+
+                    welcome = await read_message(reader)
+                    if not welcome or welcome.get("op") != "welcome":
+                        raise ConnectionError("rejected by coordinator")
+
+                    logger.info(f"Probe agent connected | {name} -> {host}:{port}")
+                    backoff = RECONNECT_BACKOFF
+                    engine.sync({})
+
+                    while True:
+                        message = await read_message(reader)
+                        if message is None:
+                            break
+
+                        op = message.get("op")
+                        if op == "upsert":
+                            engine.upsert(Target(**message["target"]))
+                        elif op == "remove":
+                            engine.remove(message["key"])
+
+                except (OSError, ConnectionError, ValueError) as e:
+                    logger.warning(f"Probe agent link error | {name} | {e}")
+
+                finally:
+                    if writer is not None:
+                        writer.close()
+                        writer = None
+
+                logger.warning(
+                    f"Probe agent disconnected | {name} | retry in {backoff}s"
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX)
+        finally:
+            runner.cancel()
+
+
+def agent_process_main(name: str, host: str, port: int):
+    """
+    Process entrypoint for agents spawned by a local coordinator.
+    """
+    try:
+        asyncio.run(run_agent(name=name, host=host, port=port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,426 @@
+"""
+Alert Dispatch
+Copyright (c) 2025 Mac GunJon
+Production-Grade Coalesced, Rate-Limited Alert Delivery
+"""
+
+import asyncio
+import time
+from typing import Dict, List
+
+import discord
+
+from core.config import (
+    ALERT_BURST,
+    ALERT_CHANNEL_ID,
+    ALERT_COALESCE_MS,
+    ALERT_MESSAGES_PER_MINUTE,
+    ALERT_QUEUE_SIZE,
+)
+from core.embeds import ERROR, SUCCESS, build_embed, error, success
+from core.logger import setup_logger
+from data.models import Alert
+from services.correlation import (
+    Correlator,
+    IncidentEvent,
+    correlator,
+    describe_cause,
+)
+
+logger = setup_logger()
+
+# --------------------------------------------------
+# DISCORD EMBED LIMITS
+# --------------------------------------------------
+EMBED_MAX_CHARS = 6000  # title + description + fields + footer + author
+EMBED_MAX_FIELDS = 25
+FIELD_MAX_CHARS = 1024
+LINE_MAX_CHARS = 200  # one service line in a digest field
+TITLE_RESERVE = 16  # room for the " (12/34)" page suffix
+
+SEND_ATTEMPTS = 3  # per message, when Discord answers 429
+
+
+# --------------------------------------------------
+# EMBEDS
+# --------------------------------------------------
+def alert_embed(alert: Alert) -> discord.Embed:
+    """
+    Single alert: the same embed as before alerts were batched.
+    """
+    if alert.kind == "DOWN":
+        return error(
+            (
+                "🚨 **Service DOWN**\n\n"
+                f"**Service:** `{alert.name}`\n"
+                f"**Failures:** `{alert.fails}` consecutive checks"
+            ),
+            service_name=alert.name,
+            service_url=alert.url,
+            status="DOWN",
+        )
+
+    return success(
+        (
+            "✅ **Service RECOVERED**\n\n"
+            f"**Service:** `{alert.name}` is back online."
+        ),
+        service_name=alert.name,
+        service_url=alert.url,
+        status="UP",
+    )
+
+
+def _line(alert: Alert) -> str:
+    line = f"`{alert.name}` · {alert.url}"
+    if alert.kind == "DOWN":
+        line += f" · {alert.fails} fails"
+    if len(line) > LINE_MAX_CHARS:
+        line = line[: LINE_MAX_CHARS - 1] + "…"
+    return line
+
+
+def _fields(title: str, alerts: List[Alert]) -> List[tuple]:
+    """
+    (name, value) fields listing `alerts`, each within FIELD_MAX_CHARS.
+    """
+    fields = []
+    lines: List[str] = []
+    size = 0
+
+    for alert in alerts:
+        line = _line(alert)
+        if lines and size + 1 + len(line) > FIELD_MAX_CHARS:
+            fields.append("\n".join(lines))
+            lines, size = [], 0
+        lines.append(line)
+        size += len(line) + (1 if size else 0)
+
+    if lines:
+        fields.append("\n".join(lines))
+
+    return [
+        (title if i == 0 else f"{title} (cont.)", value)
+        for i, value in enumerate(fields)
+    ]
+
+
+def _pages(
+    *,
+    title: str,
+    description: str,
+    color: int,
+    fields: List[tuple],
+) -> List[discord.Embed]:
+    """
+    Spread `fields` over as many embeds as Discord's per-embed
+    character and field limits require.
+    """
+    def page() -> discord.Embed:
+        return build_embed(title=title, description=description, color=color)
+
+    pages = [page()]
+    for name, value in fields:
+        embed = pages[-1]
+        if (
+            len(embed.fields) >= EMBED_MAX_FIELDS
+            or len(embed) + len(name) + len(value) + TITLE_RESERVE
+            > EMBED_MAX_CHARS
+        ):
+            embed = page()
+            pages.append(embed)
+        embed.add_field(name=name, value=value, inline=False)
+
+    if len(pages) > 1:
+        for i, embed in enumerate(pages, 1):
+            embed.title = f"{embed.title} ({i}/{len(pages)})"
+    return pages
+
+
+def digest_embeds(alerts: List[Alert]) -> List[discord.Embed]:
+    """
+    One embed per message: a lone alert keeps its own embed, several
+    are listed in digest pages.
+    """
+    if len(alerts) == 1:
+        return [alert_embed(alerts[0])]
+
+    down = [a for a in alerts if a.kind == "DOWN"]
+    up = [a for a in alerts if a.kind != "DOWN"]
+
+    return _pages(
+        title="📣 Alert Digest",
+        description=f"**{len(down)}** down · **{len(up)}** recovered",
+        color=ERROR if down else SUCCESS,
+        fields=_fields("🚨 DOWN", down) + _fields("✅ RECOVERED", up),
+    )
+
+
+def incident_embeds(event: IncidentEvent) -> List[discord.Embed]:
+    incident = event.incident
+    cause = describe_cause(incident.cause)
+    affected = len(incident.members)
+
+    if event.kind == "resolved":
+        minutes = (time.time() - incident.opened) / 60
+        return [
+            build_embed(
+                title=f"🧩 Incident #{incident.id} Resolved",
+                description=(
+                    f"All **{affected}** services are back online.\n"
+                    f"**Cause:** {cause}\n"
+                    f"**Duration:** `{minutes:.0f}m`"
+                ),
+                color=SUCCESS,
+            )
+        ]
+
+    if event.kind == "opened":
+        title = f"🧩 Incident #{incident.id}"
+        description = f"**{affected}** services DOWN together"
+    else:
+        title = f"🧩 Incident #{incident.id} Updated"
+        description = (
+            f"**+{len(event.alerts)}** services · **{affected}** affected"
+        )
+
+    return _pages(
+        title=title,
+        description=f"{description}\n**Cause:** {cause}",
+        color=ERROR,
+        fields=_fields("🚨 AFFECTED", event.alerts),
+    )
+
+
+# --------------------------------------------------
+# SEND PACING
+# --------------------------------------------------
+class TokenBucket:
+    """
+    `burst` sends back to back, then `rate` per second. A 429 from
+    Discord drains the bucket for its retry_after.
+    """
+
+    def __init__(self, *, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def take(self) -> float:
+        """
+        Wait for a token; returns the seconds waited.
+        """
+        self._refill()
+        waited = 0.0
+        if self.tokens < 1:
+            waited = (1 - self.tokens) / self.rate
+            await asyncio.sleep(waited)
+            self._refill()
+        self.tokens -= 1
+        return waited
+
+    def pause(self, seconds: float):
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+# --------------------------------------------------
+# DISPATCHER
+# --------------------------------------------------
+class AlertDispatcher:
+    """
+    Background delivery of DOWN / RECOVERY alerts.
+    Alert handling only enqueues, so a slow or rate-limited Discord
+    never holds up result processing. The drainer collects alerts for
+    `window` seconds after the first one, keeps the newest alert per
+    target (a DOWN and a RECOVERY for the same target cancel out),
+    and sends them as a digest paced by a token bucket.
+    While sends are paced, new alerts pile up and join the next
+    digest instead of becoming messages of their own.
+    With a correlator, alerts that share a cause are reported as one
+    incident (see services.correlation).
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        window: float,
+        rate: float,
+        burst: int,
+        correlator: Correlator | None=None,
+    ):
+        self.capacity = capacity
+        self.window = window
+        self.correlator = correlator
+        self.bucket = TokenBucket(rate=rate, burst=burst)
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=capacity)
+
+        # metrics
+        self.submitted = 0
+        self.dropped = 0  # queue full
+        self.coalesced = 0  # superseded by a newer alert for the target
+        self.cancelled = 0  # DOWN / RECOVERY pairs that cancelled out
+        self.delivered = 0  # alerts whose digest was sent in full
+        self.messages = 0
+        self.failed = 0  # messages that could not be sent
+        self.rate_limited = 0  # 429 answers
+        self.throttled_time = 0.0  # seconds spent waiting for tokens
+        self.max_depth = 0
+
+    def submit(self, alert: Alert) -> bool:
+        try:
+            self._queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error(f"Alert queue full | dropped {alert.kind} | {alert.name}")
+            return False
+
+        self.submitted += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    async def _collect(self) -> List[Alert]:
+        queue = self._queue
+        pending: Dict[str, Alert] = {}
+        self._merge(pending, await queue.get())
+
+        deadline = time.monotonic() + self.window
+        while True:
+            while not queue.empty():
+                self._merge(pending, queue.get_nowait())
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                alert = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            self._merge(pending, alert)
+
+        return list(pending.values())
+
+    def _merge(self, pending: Dict[str, Alert], alert: Alert):
+        previous = pending.pop(alert.key, None)
+        if previous is None:
+            pending[alert.key] = alert
+        elif previous.kind != alert.kind:
+            # a flap inside the window: the channel was never told
+            # about the first transition, so it needs neither
+            self.cancelled += 2
+        else:
+            self.coalesced += 1
+            pending[alert.key] = alert  # re-inserted in arrival order
+
+    async def _send(self, channel, embed: discord.Embed) -> bool:
+        for _ in range(SEND_ATTEMPTS):
+            self.throttled_time += await self.bucket.take()
+            try:
+                await channel.send(embed=embed)
+                return True
+            except discord.RateLimited as e:
+                retry_after = e.retry_after
+            except discord.HTTPException as e:
+                if e.status != 429:
+                    logger.error(f"Alert send failed | {e.status} | {e.text}")
+                    return False
+                retry_after = getattr(e.response, "headers", {}).get(
+                    "Retry-After", 1.0
+                )
+
+            self.rate_limited += 1
+            self.bucket.pause(float(retry_after))
+            logger.warning(f"Alert channel rate limited | retry in {retry_after}s")
+
+        return False
+
+    async def run(self, bot: discord.Client):
+        """
+        Drain forever, delivering to ALERT_CHANNEL_ID.
+        """
+        while True:
+            alerts = await self._collect()
+            if not alerts:
+                continue  # every alert cancelled out
+            count = len(alerts)
+
+            events: List[IncidentEvent] = []
+            if self.correlator and self.correlator.enabled:
+                try:
+                    alerts, events = await self.correlator.process(alerts)
+                except Exception as e:
+                    logger.exception("Alert correlation crashed", exc_info=e)
+
+            embeds = [
+                embed for event in events for embed in incident_embeds(event)
+            ]
+            if alerts:
+                embeds.extend(digest_embeds(alerts))
+
+            channel = bot.get_channel(ALERT_CHANNEL_ID)
+            if not channel:
+                self.failed += 1
+                logger.warning(
+                    f"Alert channel not found | {count} alerts lost"
+                )
+                continue
+
+            complete = True
+            for embed in embeds:
+                try:
+                    sent = await self._send(channel, embed)
+                except Exception as e:
+                    logger.exception("Alert send crashed", exc_info=e)
+                    sent = False
+
+                if sent:
+                    self.messages += 1
+                else:
+                    self.failed += 1
+                    complete = False
+
+            if complete:
+                self.delivered += count
+            if count > 1:
+                logger.info(
+                    f"Alert digest sent | {count} alerts | "
+                    f"{len(events)} incident updates"
+                )
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self.capacity,
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+            "delivered": self.delivered,
+            "messages": self.messages,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+            "throttled_time": self.throttled_time,
+        }
+
+
+# --------------------------------------------------
+# SINGLETON INSTANCE
+# --------------------------------------------------
+dispatcher = AlertDispatcher(
+    capacity=ALERT_QUEUE_SIZE,
+    window=ALERT_COALESCE_MS / 1000,
+    rate=ALERT_MESSAGES_PER_MINUTE / 60,
+    burst=ALERT_BURST,
+    correlator=correlator,
+)
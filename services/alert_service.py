@@ -8,79 +8,65 @@ import discord
 
 from core.logger import setup_logger
 from core.config import ALERT_FAILURE_THRESHOLD, ALERT_CHANNEL_ID
-from core.embeds import error, success
-from data.store import store
+from data.models import Alert, Target
+from services.alert_dispatch import dispatcher
 
 logger = setup_logger()
 
 
-async def handle_alerts(bot: discord.Client, *, url: str):
+async def handle_alerts(
+    bot: discord.Client,
+    *,
+    target: Target,
+    error: str | None=None,
+):
     """
     Handle DOWN and RECOVERY alerts for a monitored service.
-    Internal lookup is done by URL, user-facing alerts use SERVICE NAME.
+    The caller passes the store's target directly (no lookup),
+    user-facing alerts use SERVICE NAME.
+    Alerts are only queued here; the dispatcher coalesces and
+    delivers them in the background. `error` is the failure class of
+    the check, used to correlate outages.
     """
 
     # Alerts disabled
     if not ALERT_CHANNEL_ID:
         return
 
-    # Resolve target by URL (internal key)
-    target = None
-    targets = await store.all()
-    for t in targets:
-        if t["url"] == url:
-            target = t
-            break
-
-    if not target:
-        return
-
-    channel = bot.get_channel(ALERT_CHANNEL_ID)
-    if not channel:
+    if not bot.get_channel(ALERT_CHANNEL_ID):
         logger.warning("Alert channel not found or bot lacks access")
         return
 
-    service_name = target["name"]
-    service_url = target["url"]
+    service_name = target.name
 
     # --------------------------------------------------
     # DOWN ALERT
     # --------------------------------------------------
     if (
-        target["fails"] >= ALERT_FAILURE_THRESHOLD
-        and not target["alerted_down"]
+        target.fails >= ALERT_FAILURE_THRESHOLD
+        and not target.alerted_down
     ):
-        await channel.send(
-            embed=error(
-                (
-                    "🚨 **Service DOWN**\n\n"
-                    f"**Service:** `{service_name}`\n"
-                    f"**Failures:** `{target['fails']}` consecutive checks"
-                ),
-                service_name=service_name,
-                service_url=service_url,
-                status="DOWN",
+        # a full queue drops the alert: leave the flag so the next
+        # check retries it
+        if dispatcher.submit(
+            Alert(
+                "DOWN",
+                target.key,
+                service_name,
+                target.url,
+                target.fails,
+                error,
             )
-        )
-
-        target["alerted_down"] = True
-        logger.warning(f"DOWN alert sent | {service_name}")
+        ):
+            target.alerted_down = True
+            logger.warning(f"DOWN alert queued | {service_name}")
 
     # --------------------------------------------------
     # RECOVERY ALERT
     # --------------------------------------------------
-    if target["fails"] == 0 and target["alerted_down"]:
-        await channel.send(
-            embed=success(
-                (
-                    "✅ **Service RECOVERED**\n\n"
-                    f"**Service:** `{service_name}` is back online."
-                ),
-                service_name=service_name,
-                service_url=service_url,
-                status="UP",
-            )
-        )
-
-        target["alerted_down"] = False
-        logger.info(f"RECOVERY alert sent | {service_name}")
+    if target.fails == 0 and target.alerted_down:
+        if dispatcher.submit(
+            Alert("UP", target.key, service_name, target.url, 0)
+        ):
+            target.alerted_down = False
+            logger.info(f"RECOVERY alert queued | {service_name}")
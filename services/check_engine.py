@@ -0,0 +1,345 @@
+"""
+Check Engine
+Copyright (c) 2025 Mac GunJon
+Production-Grade Probe Scheduling & Retry Engine
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Set
+
+import aiohttp
+
+from core.config import COALESCE_WINDOW
+from core.logger import setup_logger
+from data.models import Target
+from services.circuit_breaker import CLOSED, CircuitBreaker
+from services.limiter import AdaptiveLimiter
+from services.http_pool import POOL_WAIT
+from services.probes import ERROR_LOCAL, PROBE_TCP, error_class, run_probe
+from services.scheduler import DeadlineScheduler
+from services.single_flight import SingleFlight
+
+logger = setup_logger()
+
+# --------------------------------------------------
+# ENGINE CONFIG
+# --------------------------------------------------
+MAX_RETRIES = 2
+RETRY_BACKOFF = 2  # exponential base (seconds)
+SCHEDULER_TICK = 1.0  # max idle sleep, bounds pickup delay of new targets
+
+
+class CheckResult(NamedTuple):
+    """
+    Final verdict of one check (after retries).
+    Compact and picklable so it can cross process boundaries.
+    """
+    key: str  # Target.key
+    status: object  # HTTP code or socket probe status, None when failed
+    elapsed: float | None
+    phases: Dict[str, float]
+    error: str | None=None  # probes.ERROR_* class when failed
+
+    @property
+    def failed(self) -> bool:
+        return self.status is None
+
+
+ResultHandler = Callable[[Target, CheckResult], Awaitable[None]]
+
+
+class CheckEngine:
+    """
+    Runs probes for a set of targets on a deadline scheduler.
+    Knows nothing about the store or alerts: every final verdict is
+    handed to `on_result`, which lets the same engine run in-process
+    or inside a worker process.
+
+    Targets are data.models.Target records, keyed by Target.key;
+    only url, guild_id, name, probe, paused and interval are read.
+    """
+
+    def __init__(
+        self,
+        *,
+        session: aiohttp.ClientSession,
+        scheduler: DeadlineScheduler,
+        limiter: AdaptiveLimiter,
+        on_result: ResultHandler,
+    ):
+        self.session = session
+        self.scheduler = scheduler
+        self.limiter = limiter
+        self.on_result = on_result
+
+        self.targets: Dict[str, Target] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.flights = SingleFlight(COALESCE_WINDOW)
+
+        # strong refs so in-flight checks are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    # --------------------------------------------------
+    # TARGET SET
+    # --------------------------------------------------
+    def first_due(self, target: Target) -> float:
+        """
+        Monotonic time of a target's first check in this process.
+        A target checked before (restored from a snapshot) keeps its
+        phase within the interval, so a restart spreads the first
+        checks out instead of firing them all at once.
+        """
+        now = time.monotonic()
+        if target.last_checked is None:
+            return now
+
+        interval = target.interval or self.scheduler.interval
+        return now + (target.last_checked - time.time()) % interval
+
+    def sync(self, targets: Dict[str, Target]):
+        self.targets = targets
+        self.scheduler.sync(
+            targets, first_due=lambda key: self.first_due(targets[key])
+        )
+        for key, target in targets.items():
+            self.scheduler.set_interval(key, target.interval)
+
+        for key in list(self.breakers):
+            if key not in targets:
+                del self.breakers[key]
+
+    def upsert(self, target: Target):
+        key = target.key
+        is_new = key not in self.targets
+
+        self.targets[key] = target
+        self.scheduler.set_interval(key, target.interval)
+        if is_new:
+            self.scheduler.schedule(key, self.first_due(target))
+
+    def remove(self, key: str):
+        self.targets.pop(key, None)
+        self.breakers.pop(key, None)
+        self.scheduler.discard(key)
+
+    # --------------------------------------------------
+    # SINGLE PROBE (COALESCED PER URL + MODE)
+    # --------------------------------------------------
+    async def _attempt(self, target: Target, *, mode: str, feedback: bool=True):
+        """
+        Checks of the same URL and mode that overlap, or land within
+        the coalescing window after a success, share one request.
+        Every subscriber still gets its own copy of the result.
+        """
+        status, elapsed, phases, error = await self.flights.do(
+            (mode, target.url),
+            lambda: self._probe(target, mode=mode, feedback=feedback),
+            cacheable=lambda value: value[0] is not None,
+        )
+        return status, elapsed, dict(phases), error
+
+    # --------------------------------------------------
+    # SINGLE PROBE (HOLDS ONE CONCURRENCY SLOT)
+    # --------------------------------------------------
+    async def _probe(self, target: Target, *, mode: str, feedback: bool=True):
+        """
+        `feedback=False` keeps the attempt out of the limiter's
+        saturation signals (open-circuit probes of dead targets).
+        """
+        status = None
+        elapsed = None
+        phases: Dict[str, float] = {}
+        error = None
+
+        async with self.limiter:
+            start_time = time.monotonic()
+
+            try:
+                status = await run_probe(
+                    self.session,
+                    url=target.url,
+                    mode=mode,
+                    phases=phases,
+                )
+                elapsed = round(time.monotonic() - start_time, 3)
+                phases["total"] = elapsed
+
+            except asyncio.TimeoutError as e:
+                error = error_class(e)
+                logger.warning(f"Timeout | {target.name}")
+
+            except aiohttp.ClientError as e:
+                error = error_class(e)
+                logger.warning(f"HTTP error | {target.name} | {e}")
+
+            except OSError as e:
+                error = error_class(e)
+                logger.warning(f"Connection error | {target.name} | {e}")
+
+            except Exception as e:
+                error = error_class(e)
+                logger.exception(
+                    f"Unexpected error | {target.name}", exc_info=e
+                )
+
+        pool_wait = phases.pop(POOL_WAIT, 0.0)
+        if feedback:
+            self.limiter.record(
+                local_error=error == ERROR_LOCAL, pool_wait=pool_wait
+            )
+        return status, elapsed, phases, error
+
+    # --------------------------------------------------
+    # SINGLE TARGET CHECK (ONE ATTEMPT)
+    # --------------------------------------------------
+    async def check_target(self, target: Target, *, attempt: int=0) -> bool:
+        """
+        Run one attempt against a target.
+        The concurrency slot is held only for the request itself; a
+        failed attempt is re-queued on the scheduler with backoff
+        instead of sleeping inside the slot.
+        While the target's circuit is open, the check is a single cheap
+        TCP connect; only if that passes is one full trial check run.
+        Returns False while a retry is pending, True once the check is final.
+        """
+        key = target.key
+
+        # absolute safety: paused services do nothing
+        if target.paused:
+            logger.debug(f"Skipped paused service: {target.name}")
+            return True
+
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = self.breakers[key] = CircuitBreaker()
+
+        # --------------------------------------------------
+        # OPEN CIRCUIT → CHEAP PROBE FIRST
+        # --------------------------------------------------
+        if breaker.is_open:
+            status, _, _, error = await self._attempt(
+                target, mode=PROBE_TCP, feedback=False
+            )
+            if status is None:
+                return await self._finish(
+                    target, breaker, None, None, {}, error
+                )
+
+            breaker.half_open()
+            logger.info(f"Circuit half-open | {target.name}")
+            attempt = MAX_RETRIES  # one trial, no retries
+
+        status, elapsed, phases, error = await self._attempt(
+            target, mode=target.probe
+        )
+
+        # --------------------------------------------------
+        # FAILED ATTEMPT → RE-QUEUE WITH BACKOFF
+        # --------------------------------------------------
+        if status is None and attempt < MAX_RETRIES:
+            attempt += 1
+            self.scheduler.retry(
+                key, attempt=attempt, delay=RETRY_BACKOFF ** attempt
+            )
+            return False
+
+        return await self._finish(
+            target, breaker, status, elapsed, phases, error
+        )
+
+    async def _finish(
+        self,
+        target: Target,
+        breaker: CircuitBreaker,
+        status,
+        elapsed: float | None,
+        phases: Dict[str, float],
+        error: str | None=None,
+    ) -> bool:
+        key = target.key
+
+        # --------------------------------------------------
+        # CIRCUIT BOOKKEEPING
+        # --------------------------------------------------
+        if status is None:
+            if breaker.record_failure() and key in self.targets:
+                delay = breaker.delay(self.scheduler.interval_of(key))
+                self.scheduler.schedule(key, time.monotonic() + delay)
+                logger.warning(
+                    f"Circuit open | {target.name} | "
+                    f"next probe in {delay:.0f}s"
+                )
+        else:
+            if breaker.state != CLOSED:
+                logger.info(f"Circuit closed | {target.name}")
+            breaker.record_success()
+
+        # --------------------------------------------------
+        # FINAL VERDICT (UP, OR DOWN AFTER RETRIES)
+        # --------------------------------------------------
+        await self.on_result(
+            target,
+            CheckResult(
+                key=key,
+                status=status,
+                elapsed=elapsed,
+                phases=phases if status is not None else {},
+                error=error if status is None else None,
+            ),
+        )
+        return True
+
+    def breaker_state(self, key: str) -> str:
+        breaker = self.breakers.get(key)
+        return breaker.state if breaker else CLOSED
+
+    def open_circuits(self) -> int:
+        return sum(1 for b in self.breakers.values() if b.state != CLOSED)
+
+    # --------------------------------------------------
+    # DISPATCH (DEADLINE DRIVEN)
+    # --------------------------------------------------
+    async def _run_check(self, target: Target, attempt: int):
+        done = True
+        try:
+            done = await self.check_target(target, attempt=attempt)
+        finally:
+            # the target stays busy until its final verdict
+            if done:
+                self.scheduler.release(target.key)
+
+    def dispatch_due(self):
+        for key, attempt in self.scheduler.pop_due():
+            target = self.targets.get(key)
+            if not target:
+                self.scheduler.release(key)
+                continue
+
+            task = asyncio.create_task(self._run_check(target, attempt))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    # --------------------------------------------------
+    # MAIN LOOP (IMMORTAL)
+    # --------------------------------------------------
+    async def run(self, *, refresh: Callable[[], Awaitable[None]] | None=None):
+        """
+        Dispatch due checks forever.
+        `refresh` runs once per tick, before dispatch, to pull
+        target set changes into the engine.
+        """
+        while True:
+            try:
+                if refresh:
+                    await refresh()
+                self.dispatch_due()
+            except Exception as e:
+                logger.critical("Check engine tick crashed", exc_info=e)
+
+            delay = self.scheduler.sleep_time(ceiling=SCHEDULER_TICK)
+            wake_at = time.monotonic() + delay
+            await asyncio.sleep(delay)
+
+            # oversleep is a direct measure of event loop saturation
+            self.limiter.observe_loop_lag(time.monotonic() - wake_at)
@@ -0,0 +1,71 @@
+"""
+Circuit Breaker
+Copyright (c) 2025 Mac GunJon
+Production-Grade Per-Target Failure Isolation
+"""
+
+from core.config import BREAKER_MAX_DELAY, BREAKER_THRESHOLD
+
+# --------------------------------------------------
+# STATES
+# --------------------------------------------------
+CLOSED = "closed"        # normal checks with retries
+OPEN = "open"            # single cheap probe at a decaying rate
+HALF_OPEN = "half_open"  # cheap probe passed, one full trial check
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive DOWN verdicts for one target.
+    After `threshold` of them the circuit opens: the target is only
+    touched by one cheap probe per period, and the period doubles on
+    every further failure up to `max_delay`.
+    """
+
+    __slots__ = ("threshold", "max_delay", "state", "failures", "level")
+
+    def __init__(
+        self,
+        *,
+        threshold: int=BREAKER_THRESHOLD,
+        max_delay: float=BREAKER_MAX_DELAY,
+    ):
+        self.threshold = threshold
+        self.max_delay = max_delay
+
+        self.state = CLOSED
+        self.failures = 0
+        self.level = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def half_open(self):
+        self.state = HALF_OPEN
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.level = 0
+
+    def record_failure(self) -> bool:
+        """
+        Returns True when the circuit is (still) open afterwards.
+        """
+        self.failures += 1
+
+        if self.state in (OPEN, HALF_OPEN):
+            self.state = OPEN
+            self.level += 1
+            return True
+
+        if self.failures >= self.threshold:
+            self.state = OPEN
+            self.level = 0
+            return True
+
+        return False
+
+    def delay(self, interval: float) -> float:
+        return min(interval * (2 ** self.level), max(self.max_delay, interval))
@@ -0,0 +1,277 @@
+"""
+Probe Coordinator
+Copyright (c) 2025 Mac GunJon
+Production-Grade Multi-Node Probe Coordination
+"""
+
+import asyncio
+import hmac
+import ipaddress
+import json
+from typing import Dict, List
+
+from core.config import (
+    COORDINATOR_TOKEN,
+    PROBE_QUORUM,
+    PROBE_REPLICAS,
+)
+from core.logger import setup_logger
+from data.models import Target
+from services.check_engine import CheckResult, ResultHandler
+from services.hash_ring import HashRing
+from services.workers import target_spec, upsert_payload
+
+logger = setup_logger()
+
+HELLO_TIMEOUT = 10  # seconds an agent has to introduce itself
+
+
+# --------------------------------------------------
+# WIRE PROTOCOL (NEWLINE DELIMITED JSON)
+# --------------------------------------------------
+def send_message(writer: asyncio.StreamWriter, message: dict):
+    writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+
+async def read_message(reader: asyncio.StreamReader) -> dict | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False  # hostnames and "" (all interfaces)
+
+
+class _AgentLink:
+    def __init__(self, name: str, writer: asyncio.StreamWriter):
+        self.name = name
+        self.writer = writer
+        self.assigned: Dict[str, dict] = {}
+
+
+class Coordinator:
+    """
+    Assigns every target to PROBE_REPLICAS agents on a consistent
+    hash ring and merges their result streams.
+    The first replica is the target's primary: its results drive the
+    store, so checks are not double counted. A failure is only passed
+    on once PROBE_QUORUM replicas currently see the target failing.
+    """
+
+    def __init__(
+        self,
+        *,
+        on_result: ResultHandler,
+        replicas: int=PROBE_REPLICAS,
+        quorum: int=PROBE_QUORUM,
+        token: str=COORDINATOR_TOKEN,
+    ):
+        self.on_result = on_result
+        self.replicas = replicas
+        self.quorum = quorum
+        self.token = token
+
+        self.ring = HashRing()
+        self._agents: Dict[str, _AgentLink] = {}
+        self._targets: Dict[str, Target] = {}
+        self._placement: Dict[str, List[str]] = {}
+        self._votes: Dict[str, Dict[str, bool]] = {}
+
+        self._server = None
+
+        # metrics
+        self.received = 0
+        self.confirmed_down = 0
+        self.unconfirmed = 0
+
+    # --------------------------------------------------
+    # LIFECYCLE
+    # --------------------------------------------------
+    async def start(self, host: str, port: int):
+        # agents receive every target and their results drive alerts
+        if not self.token and not is_loopback(host):
+            raise RuntimeError(
+                f"COORDINATOR_TOKEN is required to listen on {host!r}"
+            )
+
+        self._server = await asyncio.start_server(self._handle_agent, host, port)
+        logger.info(
+            f"Probe coordinator listening | {host}:{port} | "
+            f"replicas={self.replicas} | quorum={self.quorum}"
+        )
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+        for link in list(self._agents.values()):
+            link.writer.close()
+
+    # --------------------------------------------------
+    # TARGET SET
+    # --------------------------------------------------
+    def sync(self, targets: Dict[str, Target]):
+        self._targets = targets
+        self._reassign()
+
+    def _reassign(self):
+        """
+        Recompute placements and send each agent only its diff.
+        """
+        desired: Dict[str, Dict[str, dict]] = {name: {} for name in self._agents}
+        placement: Dict[str, List[str]] = {}
+
+        for key, target in self._targets.items():
+            # placed by URL: one guild's copy lands with another's
+            nodes = self.ring.lookup(target.url, self.replicas)
+            placement[key] = nodes
+
+            spec = target_spec(target)
+            for name in nodes:
+                desired[name][key] = spec
+
+        for name, link in self._agents.items():
+            wanted = desired[name]
+
+            for key in list(link.assigned):
+                if key not in wanted:
+                    del link.assigned[key]
+                    send_message(link.writer, {"op": "remove", "key": key})
+
+            for key, spec in wanted.items():
+                if link.assigned.get(key) != spec:
+                    link.assigned[key] = spec
+                    send_message(
+                        link.writer,
+                        {
+                            "op": "upsert",
+                            "target": upsert_payload(spec, self._targets[key]),
+                        },
+                    )
+
+        # drop votes from agents that no longer probe a target
+        for key in list(self._votes):
+            nodes = placement.get(key)
+            if not nodes:
+                del self._votes[key]
+                continue
+            votes = self._votes[key]
+            for name in list(votes):
+                if name not in nodes:
+                    del votes[name]
+
+        self._placement = placement
+
+    # --------------------------------------------------
+    # AGENT CONNECTIONS
+    # --------------------------------------------------
+    async def _handle_agent(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ):
+        name = None
+        try:
+            hello = await asyncio.wait_for(read_message(reader), HELLO_TIMEOUT)
+            if not hello or hello.get("op") != "hello":
+                return
+
+            if not hmac.compare_digest(
+                str(hello.get("token", "")), self.token
+            ):
+                logger.warning("Probe agent rejected | bad token")
+                return
+
+            name = str(hello.get("agent") or "")
+            if not name or name in self._agents:
+                logger.warning(f"Probe agent rejected | name={name!r}")
+                name = None
+                return
+
+            self._agents[name] = _AgentLink(name, writer)
+            self.ring.add(name)
+            send_message(writer, {"op": "welcome"})
+            self._reassign()
+
+            logger.info(f"Probe agent joined | {name} | agents={len(self._agents)}")
+
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                if message.get("op") == "result":
+                    await self._on_agent_result(name, message)
+
+        except (asyncio.TimeoutError, ConnectionError, ValueError) as e:
+            logger.warning(f"Probe agent connection error | {name} | {e}")
+
+        finally:
+            if name:
+                self._agents.pop(name, None)
+                self.ring.remove(name)
+                self._reassign()
+                logger.warning(
+                    f"Probe agent left | {name} | agents={len(self._agents)}"
+                )
+            writer.close()
+
+    # --------------------------------------------------
+    # QUORUM
+    # --------------------------------------------------
+    async def _on_agent_result(self, agent: str, message: dict):
+        key = message.get("key")
+        nodes = self._placement.get(key)
+        target = self._targets.get(key)
+
+        # stale result from an agent that no longer owns the target
+        if not target or not nodes or agent not in nodes:
+            return
+
+        self.received += 1
+        result = CheckResult(
+            key=key,
+            status=message.get("status"),
+            elapsed=message.get("elapsed"),
+            phases=message.get("phases") or {},
+            error=message.get("error"),
+        )
+
+        votes = self._votes.setdefault(key, {})
+        votes[agent] = result.failed
+
+        # only the primary replica drives the store
+        if agent != nodes[0]:
+            return
+
+        if result.failed:
+            needed = min(self.quorum, len(nodes))
+            failing = sum(1 for name in nodes if votes.get(name))
+            if failing < needed:
+                self.unconfirmed += 1
+                logger.info(
+                    f"Unconfirmed failure | {target.name} | "
+                    f"{failing}/{needed} agents"
+                )
+                return
+            self.confirmed_down += 1
+
+        await self.on_result(target, result)
+
+    # --------------------------------------------------
+    # METRICS
+    # --------------------------------------------------
+    def stats(self) -> dict:
+        return {
+            "agents": sorted(self._agents),
+            "received": self.received,
+            "confirmed_down": self.confirmed_down,
+            "unconfirmed": self.unconfirmed,
+        }
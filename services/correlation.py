@@ -0,0 +1,356 @@
+"""
+Outage Correlation
+Copyright (c) 2025 Mac GunJon
+Production-Grade Incident Grouping
+"""
+
+import asyncio
+import ipaddress
+import itertools
+import socket
+import time
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+from urllib.parse import urlparse
+
+from core.config import DNS_CACHE_TTL, INCIDENT_MIN_TARGETS, INCIDENT_WINDOW
+from core.logger import setup_logger
+from data.models import Alert
+
+logger = setup_logger()
+
+# --------------------------------------------------
+# CORRELATION CONFIG
+# --------------------------------------------------
+RESOLVE_TIMEOUT = 2.0  # seconds per host lookup
+RESOLVE_NEGATIVE_TTL = 30  # seconds an unresolvable host is not retried
+HOST_CACHE_PRUNE = 10000  # cached hosts before expired entries are dropped
+ERROR_CAUSE_FACTOR = 3  # a failure class alone is weak evidence
+
+# causes, most specific first
+CAUSE_IP = "ip"
+CAUSE_DOMAIN = "domain"
+CAUSE_ERROR = "error"
+
+CAUSE_LABELS = {
+    CAUSE_IP: "shared IP",
+    CAUSE_DOMAIN: "shared domain",
+    CAUSE_ERROR: "same failure",
+}
+
+
+def describe_cause(cause: str) -> str:
+    kind, _, value = cause.partition(":")
+    return f"{CAUSE_LABELS.get(kind, kind)} `{value}`"
+
+
+def _domain(host: str) -> str | None:
+    """
+    Registrable-ish suffix of a hostname: the last two labels, or
+    three under short ccTLD second levels (example.co.uk). No public
+    suffix list, so this is a heuristic.
+    """
+    labels = host.rstrip(".").lower().split(".")
+    if len(labels) < 2:
+        return None
+    if len(labels) >= 3 and len(labels[-1]) == 2 and len(labels[-2]) <= 3:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class Incident:
+    """
+    A correlated outage: targets that went DOWN within the window and
+    share a cause. Open until every member has recovered.
+    """
+
+    __slots__ = ("id", "cause", "opened", "latest", "members", "down")
+
+    def __init__(self, incident_id: int, cause: str, opened: float):
+        self.id = incident_id
+        self.cause = cause
+        self.opened = opened
+        self.latest = 0.0  # monotonic time the newest member went DOWN
+        self.members: Dict[str, Alert] = {}  # key -> first DOWN alert
+        self.down: Set[str] = set()
+
+    def add(self, alert: Alert, now: float):
+        self.members.setdefault(alert.key, alert)
+        self.down.add(alert.key)
+        self.latest = max(self.latest, now)
+
+
+class IncidentEvent(NamedTuple):
+    kind: str  # "opened" | "joined" | "resolved"
+    incident: Incident
+    alerts: List[Alert]  # targets that opened / joined the incident
+
+
+class Correlator:
+    """
+    Groups DOWN alerts by shared resolved IP, hostname suffix or
+    failure class. Once `min_targets` DOWN targets share a cause
+    within `window` seconds, they become one incident: further DOWN
+    alerts with that cause join it while they fall within `window` of
+    its newest member, and members' recoveries are folded in until
+    the last one resolves the incident.
+
+    State is updated per alert (O(causes of that alert)), so the cost
+    follows the alert rate, not the number of targets.
+    """
+
+    def __init__(self, *, min_targets: int, window: float):
+        self.min_targets = min_targets
+        self.window = window
+
+        self._hosts: Dict[str, Tuple[float, Tuple[str, ...]]] = {}  # host -> (expires, IPs)
+
+        # DOWN targets not in an incident, and who shares their causes
+        self._pending: Dict[str, Tuple[Alert, Tuple[str, ...]]] = {}
+        self._recent: Dict[str, Dict[str, float]] = {}  # cause -> key -> time (oldest first)
+
+        self._open: Dict[str, Incident] = {}  # cause -> incident
+        self._member_of: Dict[str, Incident] = {}  # key -> incident
+        self._ids = itertools.count(1)
+
+        # metrics
+        self.opened = 0
+        self.resolved = 0
+        self.absorbed = 0  # alerts folded into an incident
+
+    @property
+    def enabled(self) -> bool:
+        return self.min_targets > 0
+
+    # --------------------------------------------------
+    # CAUSES
+    # --------------------------------------------------
+    async def _resolve(self, host: str) -> Tuple[str, ...]:
+        now = time.monotonic()
+        cached = self._hosts.get(host)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        try:
+            infos = await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(
+                    host, None, type=socket.SOCK_STREAM
+                ),
+                RESOLVE_TIMEOUT,
+            )
+            ips = tuple(sorted({info[4][0] for info in infos}))
+            ttl = DNS_CACHE_TTL
+        except (OSError, asyncio.TimeoutError):
+            ips, ttl = (), RESOLVE_NEGATIVE_TTL
+
+        if len(self._hosts) >= HOST_CACHE_PRUNE:
+            self._hosts = {
+                h: entry for h, entry in self._hosts.items() if entry[0] > now
+            }
+        self._hosts[host] = (now + ttl, ips)
+        return ips
+
+    async def _causes(self, alerts: List[Alert]) -> Dict[str, Tuple[str, ...]]:
+        hosts = {
+            alert.key: (urlparse(alert.url).hostname or "").lower()
+            for alert in alerts
+        }
+        lookups = sorted({h for h in hosts.values() if h and not _is_ip(h)})
+        resolved = dict(
+            zip(lookups, await asyncio.gather(*map(self._resolve, lookups)))
+        )
+
+        causes = {}
+        for alert in alerts:
+            host = hosts[alert.key]
+            found: List[str] = []
+
+            if host and _is_ip(host):
+                found.append(f"{CAUSE_IP}:{host}")
+            elif host:
+                found.extend(f"{CAUSE_IP}:{ip}" for ip in resolved[host])
+                domain = _domain(host)
+                if domain:
+                    found.append(f"{CAUSE_DOMAIN}:{domain}")
+
+            if alert.error:
+                found.append(f"{CAUSE_ERROR}:{alert.error}")
+            causes[alert.key] = tuple(found)
+
+        return causes
+
+    def _threshold(self, cause: str) -> int:
+        if cause.startswith(CAUSE_ERROR):
+            return self.min_targets * ERROR_CAUSE_FACTOR
+        return self.min_targets
+
+    # --------------------------------------------------
+    # INCREMENTAL GROUPING
+    # --------------------------------------------------
+    async def process(
+        self, alerts: List[Alert]
+    ) -> Tuple[List[Alert], List[IncidentEvent]]:
+        """
+        Fold a batch of alerts into incidents. Returns the alerts to
+        send on their own and the incident events to send instead of
+        the rest.
+        """
+        down = [alert for alert in alerts if alert.kind == "DOWN"]
+        causes = await self._causes(down) if down else {}
+
+        now = time.monotonic()
+        absorbed: Set[str] = set()
+        events: Dict[Tuple[str, int], IncidentEvent] = {}
+
+        for alert in alerts:
+            if alert.kind == "DOWN":
+                self._down(alert, causes[alert.key], now, absorbed, events)
+            else:
+                self._up(alert, absorbed, events)
+
+        plain = [alert for alert in alerts if alert.key not in absorbed]
+        self.absorbed += len(alerts) - len(plain)
+        return plain, list(events.values())
+
+    def _down(self, alert: Alert, causes, now: float, absorbed, events):
+        key = alert.key
+        self._forget(key)
+
+        # an open incident with the same cause takes it in, unless the
+        # incident has gone quiet: a later failure is a new outage
+        for cause in causes:
+            incident = self._open.get(cause)
+            if incident and now - incident.latest <= self.window:
+                incident.add(alert, now)
+                self._member_of[key] = incident
+                absorbed.add(key)
+
+                opened = events.get(("opened", incident.id))
+                if opened:
+                    opened.alerts.append(alert)
+                else:
+                    events.setdefault(
+                        ("joined", incident.id),
+                        IncidentEvent("joined", incident, []),
+                    ).alerts.append(alert)
+                return
+
+        self._pending[key] = (alert, causes)
+        for cause in causes:
+            group = self._recent.setdefault(cause, {})
+            group[key] = now
+            self._expire(cause, group, now)
+
+        for cause in causes:
+            group = self._recent.get(cause)
+            if group and len(group) >= self._threshold(cause):
+                incident = self._open_incident(cause, list(group), now)
+                absorbed.update(incident.members)
+                events[("opened", incident.id)] = IncidentEvent(
+                    "opened", incident, list(incident.members.values())
+                )
+                return
+
+    def _up(self, alert: Alert, absorbed, events):
+        key = alert.key
+        incident = self._member_of.pop(key, None)
+        if incident is None:
+            self._forget(key)
+            return
+
+        absorbed.add(key)
+        incident.down.discard(key)
+        if not incident.down:
+            self._close(incident)
+            events[("resolved", incident.id)] = IncidentEvent(
+                "resolved", incident, []
+            )
+
+    def _expire(self, cause: str, group: Dict[str, float], now: float):
+        while group:
+            key, since = next(iter(group.items()))
+            if now - since <= self.window:
+                return
+            del group[key]
+        del self._recent[cause]
+
+    def _forget(self, key: str):
+        entry = self._pending.pop(key, None)
+        if not entry:
+            return
+        for cause in entry[1]:
+            group = self._recent.get(cause)
+            if group is not None:
+                group.pop(key, None)
+                if not group:
+                    del self._recent[cause]
+
+    def _open_incident(self, cause: str, keys: List[str], now: float) -> Incident:
+        incident = Incident(next(self._ids), cause, time.time())
+        for key in keys:
+            alert = self._pending[key][0]
+            self._forget(key)
+            incident.add(alert, now)
+            self._member_of[key] = incident
+
+        # a quiet incident with the same cause stays open for its
+        # members' recoveries but takes no new ones
+        self._open[cause] = incident
+        self.opened += 1
+        logger.warning(
+            f"Incident opened | #{incident.id} | {cause} | "
+            f"{len(incident.members)} targets"
+        )
+        return incident
+
+    def _close(self, incident: Incident):
+        if self._open.get(incident.cause) is incident:
+            del self._open[incident.cause]
+        self.resolved += 1
+        logger.info(
+            f"Incident resolved | #{incident.id} | {incident.cause} | "
+            f"{time.time() - incident.opened:.0f}s"
+        )
+
+    def retain(self, keys: Iterable[str]):
+        """
+        Drop targets that were removed or paused: they will never
+        report a recovery. Incidents left without DOWN members close
+        silently.
+        """
+        live = set(keys)
+
+        for key in [k for k in self._pending if k not in live]:
+            self._forget(key)
+
+        for key in [k for k in self._member_of if k not in live]:
+            incident = self._member_of.pop(key)
+            incident.down.discard(key)
+            if not incident.down:
+                self._close(incident)
+
+    def stats(self) -> dict:
+        return {
+            # quiet incidents drop out of _open but stay open
+            "open": len({id(i) for i in self._member_of.values()}),
+            "opened": self.opened,
+            "resolved": self.resolved,
+            "absorbed": self.absorbed,
+            "pending": len(self._pending),
+        }
+
+
+# --------------------------------------------------
+# SINGLETON INSTANCE
+# --------------------------------------------------
+correlator = Correlator(
+    min_targets=INCIDENT_MIN_TARGETS,
+    window=INCIDENT_WINDOW,
+)
@@ -0,0 +1,82 @@
+"""
+Consistent Hash Ring
+Copyright (c) 2025 Mac GunJon
+Production-Grade Target → Probe Agent Assignment
+"""
+
+import bisect
+import hashlib
+from typing import Dict, List
+
+VIRTUAL_NODES = 64  # ring points per node, smooths the distribution
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(),
+        "big",
+    )
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes.
+    Adding or removing a node only moves the keys that land on
+    that node's ring points.
+    """
+
+    def __init__(self, vnodes: int=VIRTUAL_NODES):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self._nodes: set = set()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node: str):
+        return node in self._nodes
+
+    def add(self, node: str):
+        if node in self._nodes:
+            return
+
+        self._nodes.add(node)
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove(self, node: str):
+        if node not in self._nodes:
+            return
+
+        self._nodes.discard(node)
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            if self._owners.pop(point, None) is not None:
+                index = bisect.bisect_left(self._points, point)
+                del self._points[index]
+
+    def lookup(self, key: str, count: int=1) -> List[str]:
+        """
+        Return up to `count` distinct nodes for a key, walking the
+        ring clockwise from the key's position. The first node is
+        the key's primary.
+        """
+        if not self._points:
+            return []
+
+        count = min(count, len(self._nodes))
+        nodes: List[str] = []
+
+        index = bisect.bisect(self._points, _hash(key))
+        for step in range(len(self._points)):
+            point = self._points[(index + step) % len(self._points)]
+            node = self._owners[point]
+            if node not in nodes:
+                nodes.append(node)
+                if len(nodes) == count:
+                    break
+
+        return nodes
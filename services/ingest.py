@@ -0,0 +1,121 @@
+"""
+Result Ingestion
+Copyright (c) 2025 Mac GunJon
+Production-Grade Batched Result Application
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from core.config import INGEST_BATCH, INGEST_FLUSH_MS, INGEST_QUEUE_SIZE
+from core.logger import setup_logger
+from data.models import Target
+from services.check_engine import CheckResult
+
+logger = setup_logger()
+
+Batch = List[Tuple[Target, CheckResult]]
+BatchHandler = Callable[[Batch], Awaitable[None]]
+
+
+class ResultIngestor:
+    """
+    Bounded queue between the check path and the store.
+    Results are drained in batches of up to `batch_size`, waiting at
+    most `flush_interval` seconds for a batch to fill. When the queue
+    is full, submit() waits, which slows the checks producing
+    results instead of letting the backlog grow without bound.
+    """
+
+    def __init__(self, *, capacity: int, batch_size: int, flush_interval: float):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=capacity)
+        self._filled = asyncio.Event()
+
+        # metrics
+        self.submitted = 0
+        self.applied = 0
+        self.batches = 0
+        self.blocked = 0  # submits that waited for queue space
+        self.blocked_time = 0.0
+        self.max_depth = 0
+
+    async def submit(self, target: Target, result: CheckResult):
+        queue = self._queue
+
+        if queue.full():
+            self.blocked += 1
+            started = time.monotonic()
+            await queue.put((target, result))
+            self.blocked_time += time.monotonic() - started
+        else:
+            queue.put_nowait((target, result))
+
+        self.submitted += 1
+        depth = queue.qsize()
+        self.max_depth = max(self.max_depth, depth)
+        if depth + 1 >= self.batch_size:  # the drainer holds one more
+            self._filled.set()
+
+    async def _next_batch(self) -> Batch:
+        queue = self._queue
+        batch = [await queue.get()]
+
+        # give a partial batch up to flush_interval to fill
+        if queue.qsize() + 1 < self.batch_size:
+            self._filled.clear()
+            try:
+                await asyncio.wait_for(self._filled.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+        while len(batch) < self.batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    async def run(self, handler: BatchHandler):
+        """
+        Drain forever, handing each batch to `handler`.
+        """
+        while True:
+            batch = await self._next_batch()
+            try:
+                await handler(batch)
+            except Exception as e:
+                logger.exception(
+                    f"Failed to apply result batch | {len(batch)} results",
+                    exc_info=e,
+                )
+
+            self.applied += len(batch)
+            self.batches += 1
+
+            # let commands run between batches of a deep backlog
+            await asyncio.sleep(0)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self.capacity,
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "applied": self.applied,
+            "batches": self.batches,
+            "avg_batch": self.applied / self.batches if self.batches else 0.0,
+            "blocked": self.blocked,
+            "blocked_time": self.blocked_time,
+        }
+
+
+# --------------------------------------------------
+# SINGLETON INSTANCE
+# --------------------------------------------------
+ingestor = ResultIngestor(
+    capacity=INGEST_QUEUE_SIZE,
+    batch_size=INGEST_BATCH,
+    flush_interval=INGEST_FLUSH_MS / 1000,
+)
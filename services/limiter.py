@@ -0,0 +1,184 @@
+"""
+Adaptive Concurrency Limiter
+Copyright (c) 2025 Mac GunJon
+Production-Grade AIMD Check Concurrency Control
+"""
+
+import asyncio
+from collections import deque
+from typing import Deque
+
+from core.config import (
+    CHECK_CONCURRENCY_INITIAL,
+    CHECK_CONCURRENCY_MAX,
+    CHECK_CONCURRENCY_MIN,
+)
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+# --------------------------------------------------
+# LIMITER CONFIG
+# --------------------------------------------------
+ADJUST_WINDOW = 20  # completed attempts per adjustment decision
+LOCAL_ERROR_TOLERANCE = 0.05  # share of attempts failing with local OS errors
+POOL_WAIT_LIMIT = 0.5  # connection pool wait (seconds) that counts as saturated
+LOOP_LAG_LIMIT = 0.25  # event loop lag (seconds) that counts as saturated
+DECREASE_FACTOR = 0.75
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter used in place of a fixed semaphore.
+    The limit grows by one per healthy window while slots are in
+    demand, and is cut multiplicatively when the host itself is
+    saturated: event loop lag, connection pool wait, or local OS
+    errors (out of sockets, buffers or ports).
+    Remote failures (timeouts, refusals, dead targets) say nothing
+    about this host and never lower the limit.
+    """
+
+    def __init__(self, *, initial: int, floor: int, ceiling: int):
+        self.floor = max(1, floor)
+        self.ceiling = max(self.floor, ceiling)
+        self.limit = min(max(initial, self.floor), self.ceiling)
+
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # current window
+        self._samples = 0
+        self._local_errors = 0
+        self._pool_wait = 0.0
+        self._loop_lag = 0.0
+        self._saturated_demand = False
+
+        # metrics
+        self.increases = 0
+        self.decreases = 0
+
+    # --------------------------------------------------
+    # SLOT HANDLING
+    # --------------------------------------------------
+    async def acquire(self):
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        self._saturated_demand = True
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # slot was handed over just before cancellation
+                self.release()
+            else:
+                self._waiters.remove(future)
+            raise
+
+    def release(self):
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    # --------------------------------------------------
+    # FEEDBACK
+    # --------------------------------------------------
+    def record(self, *, local_error: bool=False, pool_wait: float=0.0):
+        """
+        Feed one completed attempt into the current window.
+        `local_error` marks failures caused by this host (see
+        probes.ERROR_LOCAL); `pool_wait` is the time spent waiting
+        for a pooled connection.
+        """
+        self._samples += 1
+
+        if local_error:
+            self._local_errors += 1
+        self._pool_wait = max(self._pool_wait, pool_wait)
+
+        if self._in_flight >= self.limit:
+            self._saturated_demand = True
+
+        if self._samples >= ADJUST_WINDOW:
+            self._adjust()
+
+    def observe_loop_lag(self, lag: float):
+        self._loop_lag = max(self._loop_lag, lag)
+
+    def _adjust(self):
+        local_ratio = self._local_errors / self._samples
+
+        saturated = (
+            self._loop_lag > LOOP_LAG_LIMIT
+            or self._pool_wait > POOL_WAIT_LIMIT
+            or local_ratio > LOCAL_ERROR_TOLERANCE
+        )
+
+        if saturated:
+            new_limit = max(self.floor, int(self.limit * DECREASE_FACTOR))
+            if new_limit < self.limit:
+                self.decreases += 1
+                logger.warning(
+                    f"Check concurrency decreased | {self.limit} -> "
+                    f"{new_limit} | local_errors={local_ratio:.2f} | "
+                    f"pool_wait={self._pool_wait:.3f}s | "
+                    f"loop_lag={self._loop_lag:.3f}s"
+                )
+                self.limit = new_limit
+
+        # only grow when the current limit is actually in demand
+        elif self._saturated_demand and self.limit < self.ceiling:
+            self.limit += 1
+            self.increases += 1
+            self._wake()
+
+        self._reset_window()
+
+    def _reset_window(self):
+        self._samples = 0
+        self._local_errors = 0
+        self._pool_wait = 0.0
+        self._loop_lag = 0.0
+        self._saturated_demand = bool(self._waiters)
+
+    # --------------------------------------------------
+    # METRICS
+    # --------------------------------------------------
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "floor": self.floor,
+            "ceiling": self.ceiling,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+# --------------------------------------------------
+# SINGLETON INSTANCE
+# --------------------------------------------------
+limiter = AdaptiveLimiter(
+    initial=CHECK_CONCURRENCY_INITIAL,
+    floor=CHECK_CONCURRENCY_MIN,
+    ceiling=CHECK_CONCURRENCY_MAX,
+)
@@ -5,151 +5,225 @@ Production-Grade Uptime Monitoring Engine
 """
 
 import asyncio
-import time
-from typing import List
+import multiprocessing
+from typing import Dict
 
-import aiohttp
 import discord
 
-from core.config import CHECK_INTERVAL, REQUEST_TIMEOUT
+from core.config import (
+    COORDINATOR_HOST,
+    COORDINATOR_LOCAL_AGENTS,
+    COORDINATOR_PORT,
+)
 from core.logger import setup_logger
+from data.models import StatusUpdate, Target
 from data.store import store
+from services.agent import agent_process_main
+from services.alert_dispatch import dispatcher
 from services.alert_service import handle_alerts
+from services.check_engine import SCHEDULER_TICK, CheckEngine, CheckResult
+from services.coordinator import Coordinator
+from services.correlation import correlator
+from services.http_pool import create_session
+from services.ingest import Batch, ingestor
+from services.limiter import limiter
+from services.scheduler import scheduler
+from services.workers import worker_pool
 
 logger = setup_logger()
 
+
 # --------------------------------------------------
-# ENGINE CONFIG
+# RESULT HANDLING (SINGLE WRITER)
 # --------------------------------------------------
-MAX_CONCURRENT_CHECKS = 10
-MAX_RETRIES = 2
-RETRY_BACKOFF = 2  # exponential base (seconds)
+def status_update(result: CheckResult) -> StatusUpdate:
+    # all retries failed → DOWN
+    if result.failed:
+        return StatusUpdate(result.key, "DOWN", True)
+
+    return StatusUpdate(
+        result.key,
+        result.status,
+        False,
+        response_time=result.elapsed,
+        phases=result.phases,
+    )
+
+
+async def apply_results(bot: discord.Client, batch: Batch):
+    """
+    Apply a batch of results to the store in one pass, then log and
+    run alert handling (DOWN / RECOVERY) per result.
+    """
+    await store.apply_batch([status_update(result) for _, result in batch])
+
+    for target, result in batch:
+        if result.failed:
+            logger.error(f"DOWN | {target.name} | retries exhausted")
+        else:
+            logger.info(
+                f"UP | {target.name} | {result.status} | {result.elapsed}s"
+            )
+
+        await handle_alerts(bot, target=target, error=result.error)
+
+
+async def _live_targets() -> Dict[str, Target]:
+    """
+    Current targets by key. Removed and paused targets will never
+    recover, so the correlator lets go of them here.
+    """
+    targets = {t.key: t for t in await store.all()}
+    correlator.retain(key for key, t in targets.items() if not t.paused)
+    return targets
+
+
+def _start_ingest(bot: discord.Client) -> asyncio.Task:
+    async def handler(batch: Batch):
+        await apply_results(bot, batch)
+
+    return asyncio.create_task(ingestor.run(handler))
 
 
 # --------------------------------------------------
-# SINGLE TARGET CHECK
+# IN-PROCESS MODE
 # --------------------------------------------------
-async def check_target(
-    *,
-    bot: discord.Client,
-    session: aiohttp.ClientSession,
-    target: dict,
-    semaphore: asyncio.Semaphore,
-):
-    url = target["url"]
-
-    # absolute safety: paused services do nothing
-    if target.get("paused"):
-        logger.debug(f"Skipped paused service: {target['name']}")
-        return
+engine: CheckEngine | None = None
 
-    async with semaphore:
-        attempt = 0
 
-        while attempt <= MAX_RETRIES:
-            start_time = time.monotonic()
+async def _local_loop(bot: discord.Client):
+    global engine
 
-            try:
-                async with session.get(
-                    url,
-                    allow_redirects=True,
-                    timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
-                ) as response:
-                    elapsed = round(time.monotonic() - start_time, 3)
-
-                    await store.update_status(
-                        url=url,
-                        status=response.status,
-                        failed=False,
-                        response_time=elapsed,
-                    )
-
-                    logger.info(
-                        f"UP | {target['name']} | {response.status} | {elapsed}s"
-                    )
-
-                    # alert handling (RECOVERY)
-                    await handle_alerts(bot, url=url)
-                    return
-
-            except asyncio.TimeoutError:
-                logger.warning(f"Timeout | {target['name']}")
-
-            except aiohttp.ClientError as e:
-                logger.warning(f"HTTP error | {target['name']} | {e}")
+    revision = None
 
-            except Exception as e:
-                logger.exception(
-                    f"Unexpected error | {target['name']}", exc_info=e
-                )
-
-            attempt += 1
-
-            if attempt <= MAX_RETRIES:
-                await asyncio.sleep(RETRY_BACKOFF ** attempt)
-
-        # --------------------------------------------------
-        # ALL RETRIES FAILED → MARK DOWN
-        # --------------------------------------------------
-        await store.update_status(
-            url=url,
-            status="DOWN",
-            failed=True,
+    ingest = _start_ingest(bot)
+
+    async with create_session() as session:
+        engine = CheckEngine(
+            session=session,
+            scheduler=scheduler,
+            limiter=limiter,
+            on_result=ingestor.submit,
         )
 
-        logger.error(f"DOWN | {target['name']} | retries exhausted")
+        async def refresh():
+            nonlocal revision
+
+            # re-sync only when the target set changed
+            if store.revision != revision:
+                revision = store.revision
+                engine.sync(await _live_targets())
 
-        # alert handling (DOWN)
-        await handle_alerts(bot, url=url)
+        logger.info("Uptime monitoring loop started")
+        try:
+            await engine.run(refresh=refresh)
+        finally:
+            ingest.cancel()
 
 
 # --------------------------------------------------
-# ONE MONITOR CYCLE
+# SHARDED MODE (WORKER PROCESSES)
 # --------------------------------------------------
-async def monitor_cycle(
-    *,
-    bot: discord.Client,
-    session: aiohttp.ClientSession,
-):
-    targets = await store.all()
-
-    if not targets:
-        logger.debug("No monitored services found")
-        return
+async def _sharded_loop(bot: discord.Client):
+    revision = None
 
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+    async def consume():
+        async for result in worker_pool.results():
+            target = await store.get_by_key(result.key)
+            if target:
+                await ingestor.submit(target, result)
 
-    tasks: List[asyncio.Task] = [
-        asyncio.create_task(
-            check_target(
-                bot=bot,
-                session=session,
-                target=target,
-                semaphore=semaphore,
-            )
-        )
-        for target in targets
-    ]
+    worker_pool.start()
+    ingest = _start_ingest(bot)
+    consumer = asyncio.create_task(consume())
 
-    await asyncio.gather(*tasks, return_exceptions=True)
+    logger.info(
+        f"Uptime monitoring loop started | workers={worker_pool.size}"
+    )
+
+    try:
+        while True:
+            try:
+                worker_pool.ensure_alive()
+
+                if store.revision != revision:
+                    revision = store.revision
+                    worker_pool.sync(await _live_targets())
+            except Exception as e:
+                logger.critical("Worker shard sync crashed", exc_info=e)
+
+            await asyncio.sleep(SCHEDULER_TICK)
+    finally:
+        consumer.cancel()
+        ingest.cancel()
+        worker_pool.stop()
 
 
 # --------------------------------------------------
-# MAIN LOOP (IMMORTAL)
+# DISTRIBUTED MODE (COORDINATOR + PROBE AGENTS)
 # --------------------------------------------------
-async def monitor_loop(bot: discord.Client):
-    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+coordinator: Coordinator | None = None
 
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        logger.info("Uptime monitoring loop started")
 
+def _spawn_local_agents(count: int) -> list:
+    ctx = multiprocessing.get_context("spawn")
+    agents = []
+
+    for i in range(count):
+        process = ctx.Process(
+            target=agent_process_main,
+            args=(f"local-{i}", "127.0.0.1", COORDINATOR_PORT),
+            name=f"ProbeAgent-{i}",
+            daemon=True,
+        )
+        process.start()
+        agents.append(process)
+
+    return agents
+
+
+async def _distributed_loop(bot: discord.Client):
+    global coordinator
+
+    revision = None
+
+    ingest = _start_ingest(bot)
+    coordinator = Coordinator(on_result=ingestor.submit)
+    await coordinator.start(COORDINATOR_HOST, COORDINATOR_PORT)
+    local_agents = _spawn_local_agents(COORDINATOR_LOCAL_AGENTS)
+
+    try:
         while True:
             try:
-                await monitor_cycle(bot=bot, session=session)
+                if store.revision != revision:
+                    revision = store.revision
+                    coordinator.sync(await _live_targets())
             except Exception as e:
-                logger.critical("Monitor cycle crashed", exc_info=e)
+                logger.critical("Coordinator sync crashed", exc_info=e)
+
+            await asyncio.sleep(SCHEDULER_TICK)
+    finally:
+        ingest.cancel()
+        for process in local_agents:
+            process.terminate()
+        await coordinator.stop()
 
-            await asyncio.sleep(CHECK_INTERVAL)
+
+# --------------------------------------------------
+# MAIN LOOP (IMMORTAL)
+# --------------------------------------------------
+async def monitor_loop(bot: discord.Client):
+    alerts = asyncio.create_task(dispatcher.run(bot))
+
+    try:
+        if COORDINATOR_PORT:
+            await _distributed_loop(bot)
+        elif worker_pool.enabled:
+            await _sharded_loop(bot)
+        else:
+            await _local_loop(bot)
+    finally:
+        alerts.cancel()
 
 
 # --------------------------------------------------
@@ -0,0 +1,225 @@
+"""
+Probe Modes
+Copyright (c) 2025 Mac GunJon
+Production-Grade Lightweight Health Probes
+"""
+
+import asyncio
+import errno
+import socket
+import ssl
+from urllib.parse import urlparse
+
+import aiohttp
+
+from core.config import REQUEST_TIMEOUT
+from data.models import STATUS_TCP_OPEN, STATUS_TLS_OK
+from services.http_pool import drain_response
+
+# --------------------------------------------------
+# PROBE MODES
+# --------------------------------------------------
+PROBE_GET = "get"    # GET, body read up to the drain cap then closed
+PROBE_HEAD = "head"  # HEAD, status line + headers only
+PROBE_TCP = "tcp"    # plain TCP connect
+PROBE_TLS = "tls"    # TCP connect + TLS handshake
+
+PROBE_MODES = (PROBE_GET, PROBE_HEAD, PROBE_TCP, PROBE_TLS)
+DEFAULT_PROBE = PROBE_GET
+
+PROBE_LABELS = {
+    PROBE_GET: "HTTP GET (capped body)",
+    PROBE_HEAD: "HTTP HEAD",
+    PROBE_TCP: "TCP connect",
+    PROBE_TLS: "TLS handshake",
+}
+
+# latency phases in display order; HTTP probes fold TLS into "connect"
+LATENCY_PHASES = ("dns", "connect", "tls", "ttfb", "total")
+
+PHASE_LABELS = {
+    "dns": "DNS",
+    "connect": "Connect",
+    "tls": "TLS",
+    "ttfb": "TTFB",
+    "total": "Total",
+}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# coarse failure classes, used to correlate outages
+ERROR_TIMEOUT = "timeout"
+ERROR_DNS = "dns"
+ERROR_TLS = "tls"
+ERROR_REFUSED = "refused"
+ERROR_RESET = "reset"
+ERROR_HTTP = "http"
+ERROR_CONNECTION = "connection"
+ERROR_LOCAL = "local"  # this host ran out of sockets, buffers or ports
+ERROR_OTHER = "error"
+
+LOCAL_ERRNOS = frozenset({
+    errno.EMFILE,  # per-process file descriptor limit
+    errno.ENFILE,  # system file descriptor limit
+    errno.ENOBUFS,
+    errno.ENOMEM,
+    errno.EADDRNOTAVAIL,  # ephemeral ports exhausted
+})
+
+# built once; creating an SSL context per check is expensive
+_tls_context = ssl.create_default_context()
+
+
+def _host_port(url: str, *, default_port: int | None=None) -> tuple[str, int]:
+    parsed = urlparse(url)
+    port = parsed.port or default_port or DEFAULT_PORTS.get(parsed.scheme, 443)
+    return parsed.hostname, port
+
+
+# --------------------------------------------------
+# HTTP PROBES
+# --------------------------------------------------
+async def _probe_http(
+    session: aiohttp.ClientSession,
+    url: str,
+    *,
+    method: str,
+    phases: dict,
+):
+    async with session.request(
+        method,
+        url,
+        allow_redirects=True,
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        trace_request_ctx=phases,
+    ) as response:
+        status = response.status
+
+        # a pooled connection skips DNS and connect entirely
+        phases.setdefault("dns", 0.0)
+        phases.setdefault("connect", 0.0)
+
+        # hand the socket back to the pool (no-op body for HEAD)
+        await drain_response(response)
+        return status
+
+
+# --------------------------------------------------
+# SOCKET PROBES
+# --------------------------------------------------
+async def _open_socket(
+    host: str,
+    port: int,
+    *,
+    phases: dict,
+    tls: bool,
+):
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    family, _, _, _, address = infos[0]
+    resolved = loop.time()
+    phases["dns"] = resolved - start
+
+    transport, protocol = await loop.create_connection(
+        asyncio.Protocol,
+        host=address[0],
+        port=address[1],
+        family=family,
+    )
+    connected = loop.time()
+    phases["connect"] = connected - resolved
+
+    if tls:
+        try:
+            transport = await loop.start_tls(
+                transport,
+                protocol,
+                _tls_context,
+                server_hostname=host,
+            )
+        except BaseException:
+            transport.close()
+            raise
+        phases["tls"] = loop.time() - connected
+
+    transport.close()
+
+
+async def _probe_tcp(url: str, *, phases: dict):
+    host, port = _host_port(url)
+
+    await asyncio.wait_for(
+        _open_socket(host, port, phases=phases, tls=False),
+        timeout=REQUEST_TIMEOUT,
+    )
+    return STATUS_TCP_OPEN
+
+
+async def _probe_tls(url: str, *, phases: dict):
+    host, port = _host_port(url, default_port=443)
+
+    await asyncio.wait_for(
+        _open_socket(host, port, phases=phases, tls=True),
+        timeout=REQUEST_TIMEOUT,
+    )
+    return STATUS_TLS_OK
+
+
+# --------------------------------------------------
+# FAILURE CLASSIFICATION
+# --------------------------------------------------
+def error_class(exc: BaseException) -> str:
+    """
+    Map a probe exception to a coarse failure class (ERROR_*).
+    Targets failing the same way at the same time often share a cause.
+    """
+    if isinstance(exc, asyncio.TimeoutError):
+        return ERROR_TIMEOUT
+    if isinstance(exc, (ssl.SSLError, aiohttp.ClientSSLError)):
+        return ERROR_TLS
+    if isinstance(exc, aiohttp.ClientConnectorError):
+        exc = exc.os_error
+    if isinstance(exc, OSError) and exc.errno in LOCAL_ERRNOS:
+        return ERROR_LOCAL
+    if isinstance(exc, socket.gaierror):
+        return ERROR_DNS
+    if isinstance(exc, ConnectionRefusedError):
+        return ERROR_REFUSED
+    if isinstance(exc, (ConnectionResetError, aiohttp.ServerDisconnectedError)):
+        return ERROR_RESET
+    if isinstance(exc, aiohttp.ClientError):
+        return ERROR_HTTP
+    if isinstance(exc, OSError):
+        return ERROR_CONNECTION
+    return ERROR_OTHER
+
+
+# --------------------------------------------------
+# DISPATCH
+# --------------------------------------------------
+async def run_probe(
+    session: aiohttp.ClientSession,
+    *,
+    url: str,
+    mode: str,
+    phases: dict | None=None,
+):
+    """
+    Run one probe and return the status to record.
+    Measured latency phases are written into `phases`.
+    Raises on timeout or connection failure.
+    """
+    phases = {} if phases is None else phases
+
+    if mode == PROBE_HEAD:
+        return await _probe_http(session, url, method="HEAD", phases=phases)
+
+    if mode == PROBE_TCP:
+        return await _probe_tcp(url, phases=phases)
+
+    if mode == PROBE_TLS:
+        return await _probe_tls(url, phases=phases)
+
+    return await _probe_http(session, url, method="GET", phases=phases)
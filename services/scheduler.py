@@ -0,0 +1,215 @@
+"""
+Deadline Scheduler
+Copyright (c) 2025 Mac GunJon
+Production-Grade Per-Target Check Scheduling
+"""
+
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.config import CHECK_INTERVAL
+from core.logger import setup_logger
+
+logger = setup_logger()
+
+# --------------------------------------------------
+# SCHEDULER CONFIG
+# --------------------------------------------------
+LATENESS_EWMA_ALPHA = 0.1  # weight of the newest lateness sample
+
+
+class DeadlineScheduler:
+    """
+    Min-heap of per-target deadlines (monotonic seconds).
+    Each target is dispatched when it is due, so a slow check
+    never delays any other target.
+    Retry attempts share the heap as one-shot entries.
+    Superseded heap entries are skipped lazily on pop.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval  # default cadence
+
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._deadlines: Dict[str, float] = {}
+        self._intervals: Dict[str, float] = {}  # per-target overrides
+        self._busy: Set[str] = set()
+        self._seq = itertools.count()
+
+        # lateness metrics (seconds between deadline and dispatch)
+        self._lateness: Dict[str, float] = {}
+        self.dispatched = 0
+        self.skipped = 0
+        self.retries = 0
+        self.lateness_avg = 0.0
+        self.lateness_max = 0.0
+
+    # --------------------------------------------------
+    # TARGET MEMBERSHIP
+    # --------------------------------------------------
+    def schedule(self, key: str, due: float):
+        self._deadlines[key] = due
+        heapq.heappush(self._heap, (due, next(self._seq), key, 0))
+
+    def retry(
+        self,
+        key: str,
+        *,
+        attempt: int,
+        delay: float,
+        now: float | None=None,
+    ):
+        """
+        Queue a retry attempt for a busy target.
+        The target keeps its busy flag until release().
+        """
+        now = time.monotonic() if now is None else now
+        self.retries += 1
+        heapq.heappush(
+            self._heap, (now + delay, next(self._seq), key, attempt)
+        )
+
+    def discard(self, key: str):
+        self._deadlines.pop(key, None)
+        self._intervals.pop(key, None)
+        self._lateness.pop(key, None)
+
+    def set_interval(self, key: str, interval: float | None):
+        """
+        Cadence of one target; None restores the default. Applies
+        from the target's next booked deadline.
+        """
+        if interval is None:
+            self._intervals.pop(key, None)
+        else:
+            self._intervals[key] = interval
+
+    def interval_of(self, key: str) -> float:
+        return self._intervals.get(key, self.interval)
+
+    def sync(
+        self,
+        keys: Iterable[str],
+        now: float | None=None,
+        *,
+        first_due: Callable[[str], float] | None=None,
+    ):
+        """
+        Align the schedule with the current target set.
+        New targets are due at `first_due(key)` (immediately by
+        default), removed ones are dropped.
+        """
+        now = time.monotonic() if now is None else now
+        current = set(keys)
+
+        for key in list(self._deadlines):
+            if key not in current:
+                self.discard(key)
+
+        for key in current:
+            if key not in self._deadlines:
+                self.schedule(key, first_due(key) if first_due else now)
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    # --------------------------------------------------
+    # DISPATCH
+    # --------------------------------------------------
+    def pop_due(self, now: float | None=None) -> List[Tuple[str, int]]:
+        """
+        Return (key, attempt) for every entry whose deadline has passed
+        and book the next regular deadline. Targets with a check still
+        in flight are skipped for this slot instead of being stacked up.
+        """
+        now = time.monotonic() if now is None else now
+        due_keys: List[Tuple[str, int]] = []
+
+        while self._heap and self._heap[0][0] <= now:
+            due, _, key, attempt = heapq.heappop(self._heap)
+
+            # retry of an in-flight check (dropped if target was removed)
+            if attempt:
+                if key in self._deadlines:
+                    due_keys.append((key, attempt))
+                else:
+                    self._busy.discard(key)
+                continue
+
+            # superseded or removed entry
+            if self._deadlines.get(key) != due:
+                continue
+
+            # fixed-rate cadence; missed slots are not replayed
+            interval = self._intervals.get(key, self.interval)
+            next_due = due + interval
+            if next_due <= now:
+                next_due = now + interval
+            self.schedule(key, next_due)
+
+            if key in self._busy:
+                self.skipped += 1
+                continue
+
+            self._record_lateness(key, now - due)
+            self._busy.add(key)
+            due_keys.append((key, 0))
+
+        return due_keys
+
+    def release(self, key: str):
+        self._busy.discard(key)
+
+    def next_deadline(self) -> Optional[float]:
+        while self._heap:
+            due, _, key, attempt = self._heap[0]
+            if attempt or self._deadlines.get(key) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def sleep_time(self, *, ceiling: float, now: float | None=None) -> float:
+        now = time.monotonic() if now is None else now
+        deadline = self.next_deadline()
+        if deadline is None:
+            return ceiling
+        return min(max(deadline - now, 0.0), ceiling)
+
+    # --------------------------------------------------
+    # LATENESS METRICS
+    # --------------------------------------------------
+    def _record_lateness(self, key: str, lateness: float):
+        lateness = max(lateness, 0.0)
+
+        self._lateness[key] = lateness
+        self.dispatched += 1
+        self.lateness_max = max(self.lateness_max, lateness)
+
+        if self.dispatched == 1:
+            self.lateness_avg = lateness
+        else:
+            self.lateness_avg += LATENESS_EWMA_ALPHA * (
+                lateness - self.lateness_avg
+            )
+
+    def lateness(self, key: str) -> Optional[float]:
+        return self._lateness.get(key)
+
+    def stats(self) -> dict:
+        return {
+            "scheduled": len(self._deadlines),
+            "in_flight": len(self._busy),
+            "dispatched": self.dispatched,
+            "skipped": self.skipped,
+            "retries": self.retries,
+            "lateness_avg": self.lateness_avg,
+            "lateness_max": self.lateness_max,
+        }
+
+
+# --------------------------------------------------
+# SINGLETON INSTANCE
+# --------------------------------------------------
+scheduler = DeadlineScheduler(CHECK_INTERVAL)
@@ -0,0 +1,80 @@
+"""
+Single-Flight Request Coalescing
+Copyright (c) 2025 Mac GunJon
+Production-Grade Duplicate Probe Suppression
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+PRUNE_EVERY = 256  # calls between sweeps of expired results
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution
+    and fans the value out to every caller.
+    Values accepted by `cacheable` are also reused for `window`
+    seconds, so near-simultaneous checks share a single request.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._recent: Dict[Hashable, Tuple[float, object]] = {}
+        self._calls = 0
+
+        # metrics
+        self.executed = 0
+        self.shared = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[object]],
+        *,
+        cacheable: Callable[[object], bool]=lambda value: True,
+    ):
+        now = time.monotonic()
+        self._calls += 1
+        if self._calls % PRUNE_EVERY == 0:
+            self._prune(now)
+
+        cached = self._recent.get(key)
+        if cached and cached[0] > now:
+            self.shared += 1
+            return cached[1]
+
+        future = self._inflight.get(key)
+        if future:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.executed += 1
+
+        try:
+            value = await fn()
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+
+        future.set_result(value)
+        if self.window > 0 and cacheable(value):
+            self._recent[key] = (time.monotonic() + self.window, value)
+        return value
+
+    def _prune(self, now: float):
+        for key in [k for k, (expires, _) in self._recent.items() if expires <= now]:
+            del self._recent[key]
+
+    def stats(self) -> dict:
+        return {
+            "executed": self.executed,
+            "shared": self.shared,
+        }
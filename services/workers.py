@@ -0,0 +1,279 @@
+"""
+Sharded Check Workers
+Copyright (c) 2025 Mac GunJon
+Production-Grade Multi-Process Check Execution
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from typing import AsyncIterator, Callable, Dict, List
+
+from core.config import (
+    CHECK_CONCURRENCY_INITIAL,
+    CHECK_CONCURRENCY_MAX,
+    CHECK_CONCURRENCY_MIN,
+    CHECK_INTERVAL,
+    CHECK_WORKERS,
+)
+from core.logger import setup_logger
+from data.models import Target
+from services.check_engine import CheckEngine, CheckResult
+from services.http_pool import create_session
+from services.limiter import AdaptiveLimiter
+from services.scheduler import DeadlineScheduler
+
+logger = setup_logger()
+
+STOP_TIMEOUT = 5  # seconds to wait for a worker to exit cleanly
+
+# fields a worker needs to run a target
+SPEC_FIELDS = ("url", "guild_id", "name", "probe", "paused", "interval")
+
+
+def target_spec(target: Target) -> dict:
+    return {field: getattr(target, field) for field in SPEC_FIELDS}
+
+
+def upsert_payload(spec: dict, target: Target) -> dict:
+    """
+    Spec plus last_checked, so the receiving engine can stagger the
+    first check. Kept out of the spec itself, which is compared to
+    detect changes.
+    """
+    return dict(spec, last_checked=target.last_checked)
+
+
+def _pump(source, loop: asyncio.AbstractEventLoop, handler: Callable):
+    """
+    Blocking queue reader (daemon thread) that forwards every item
+    onto the event loop.
+    """
+    while True:
+        try:
+            item = source.get()
+        except (EOFError, OSError):
+            return
+        loop.call_soon_threadsafe(handler, item)
+
+
+# --------------------------------------------------
+# WORKER PROCESS
+# --------------------------------------------------
+def _worker_main(index: int, commands, results):
+    try:
+        asyncio.run(_worker_loop(index, commands, results))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _worker_loop(index: int, commands, results):
+    loop = asyncio.get_running_loop()
+    stopped = asyncio.Event()
+
+    async def publish(target: Target, result: CheckResult):
+        results.put(result)
+
+    async with create_session() as session:
+        engine = CheckEngine(
+            session=session,
+            scheduler=DeadlineScheduler(CHECK_INTERVAL),
+            limiter=AdaptiveLimiter(
+                initial=CHECK_CONCURRENCY_INITIAL,
+                floor=CHECK_CONCURRENCY_MIN,
+                ceiling=CHECK_CONCURRENCY_MAX,
+            ),
+            on_result=publish,
+        )
+
+        def apply(command):
+            op, payload = command
+            if op == "upsert":
+                engine.upsert(Target(**payload))
+            elif op == "remove":
+                engine.remove(payload)
+            elif op == "stop":
+                stopped.set()
+
+        threading.Thread(
+            target=_pump,
+            args=(commands, loop, apply),
+            name=f"WorkerCommands-{index}",
+            daemon=True,
+        ).start()
+
+        logger.info(f"Check worker {index} started")
+
+        runner = asyncio.create_task(engine.run())
+        await stopped.wait()
+        runner.cancel()
+
+    logger.info(f"Check worker {index} stopped")
+
+
+# --------------------------------------------------
+# WORKER POOL (BOT PROCESS SIDE)
+# --------------------------------------------------
+class _Worker:
+    def __init__(self, index: int):
+        self.index = index
+        self.process = None
+        self.commands = None
+        self.assigned: Dict[str, dict] = {}
+
+
+class WorkerPool:
+    """
+    Splits targets across N check worker processes.
+    The bot process stays the only writer to the store: workers
+    just stream CheckResult tuples back.
+    Targets are placed on the least loaded worker and shards are
+    evened out (moving as few targets as possible) after removals.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.received = 0
+        self.moved = 0
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers: List[_Worker] = [_Worker(i) for i in range(size)]
+        self._owner: Dict[str, int] = {}
+        self._results = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    # --------------------------------------------------
+    # LIFECYCLE
+    # --------------------------------------------------
+    def start(self):
+        self._results = self._ctx.Queue()
+        for worker in self._workers:
+            self._spawn(worker)
+
+        logger.info(f"Check worker pool started | workers={self.size}")
+
+    def _spawn(self, worker: _Worker):
+        worker.commands = self._ctx.Queue()
+        worker.process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker.index, worker.commands, self._results),
+            name=f"CheckWorker-{worker.index}",
+            daemon=True,
+        )
+        worker.process.start()
+
+        # a respawned worker starts empty; replay its shard
+        for spec in worker.assigned.values():
+            worker.commands.put(("upsert", spec))
+
+    def ensure_alive(self):
+        for worker in self._workers:
+            if worker.process and not worker.process.is_alive():
+                logger.error(
+                    f"Check worker {worker.index} died "
+                    f"(exit={worker.process.exitcode}), respawning"
+                )
+                self._spawn(worker)
+
+    def stop(self):
+        for worker in self._workers:
+            if worker.process and worker.process.is_alive():
+                worker.commands.put(("stop", None))
+
+        for worker in self._workers:
+            if not worker.process:
+                continue
+            worker.process.join(STOP_TIMEOUT)
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+        logger.info("Check worker pool stopped")
+
+    # --------------------------------------------------
+    # SHARD ASSIGNMENT
+    # --------------------------------------------------
+    def sync(self, targets: Dict[str, Target]):
+        # removed targets
+        for key in list(self._owner):
+            if key not in targets:
+                worker = self._workers[self._owner.pop(key)]
+                del worker.assigned[key]
+                worker.commands.put(("remove", key))
+
+        # new or changed targets
+        for key, target in targets.items():
+            spec = target_spec(target)
+
+            index = self._owner.get(key)
+            if index is None:
+                index = self._least_loaded().index
+                self._owner[key] = index
+            elif self._workers[index].assigned.get(key) == spec:
+                continue
+
+            worker = self._workers[index]
+            worker.assigned[key] = spec
+            worker.commands.put(("upsert", upsert_payload(spec, target)))
+
+        self._rebalance()
+
+    def _least_loaded(self) -> _Worker:
+        return min(self._workers, key=lambda w: len(w.assigned))
+
+    def _rebalance(self):
+        while True:
+            busiest = max(self._workers, key=lambda w: len(w.assigned))
+            idlest = self._least_loaded()
+            if len(busiest.assigned) - len(idlest.assigned) <= 1:
+                return
+
+            key, spec = busiest.assigned.popitem()
+            busiest.commands.put(("remove", key))
+
+            idlest.assigned[key] = spec
+            idlest.commands.put(("upsert", spec))
+            self._owner[key] = idlest.index
+            self.moved += 1
+
+    # --------------------------------------------------
+    # RESULTS
+    # --------------------------------------------------
+    async def results(self) -> AsyncIterator[CheckResult]:
+        loop = asyncio.get_running_loop()
+        inbox: asyncio.Queue = asyncio.Queue()
+
+        threading.Thread(
+            target=_pump,
+            args=(self._results, loop, inbox.put_nowait),
+            name="WorkerResults",
+            daemon=True,
+        ).start()
+
+        while True:
+            result = await inbox.get()
+            self.received += 1
+            yield result
+
+    # --------------------------------------------------
+    # METRICS
+    # --------------------------------------------------
+    def stats(self) -> dict:
+        return {
+            "workers": self.size,
+            "alive": sum(
+                1 for w in self._workers
+                if w.process and w.process.is_alive()
+            ),
+            "assigned": [len(w.assigned) for w in self._workers],
+            "received": self.received,
+            "moved": self.moved,
+        }
+
+
+# --------------------------------------------------
+# SINGLETON INSTANCE
+# --------------------------------------------------
+worker_pool = WorkerPool(CHECK_WORKERS)
@@ -0,0 +1,74 @@
+"""
+Alert Dispatch Tests
+Copyright (c) 2025 Mac GunJon
+Coalescing and queue-full handling
+"""
+
+import asyncio
+
+from core.config import ALERT_FAILURE_THRESHOLD
+from data.models import Alert, Target
+from services import alert_service
+from services.alert_dispatch import AlertDispatcher
+
+
+class FakeBot:
+    def get_channel(self, channel_id):
+        return object()
+
+
+def alert(kind: str, key: str) -> Alert:
+    return Alert(kind, key, key, f"https://{key}.test", 0)
+
+
+def collect(*alerts: Alert) -> list:
+    async def run():
+        dispatcher = AlertDispatcher(capacity=10, window=0.01, rate=1, burst=1)
+        for item in alerts:
+            dispatcher.submit(item)
+        return await dispatcher._collect(), dispatcher
+
+    return asyncio.run(run())
+
+
+def test_flap_inside_window_cancels_out():
+    collected, dispatcher = collect(
+        alert("DOWN", "a"), alert("DOWN", "b"), alert("UP", "a")
+    )
+    assert collected == [alert("DOWN", "b")]
+    assert dispatcher.cancelled == 2
+
+
+def test_repeated_alert_keeps_newest():
+    first, second = alert("DOWN", "a"), alert("DOWN", "a")._replace(fails=5)
+    collected, dispatcher = collect(first, second)
+    assert collected == [second]
+    assert dispatcher.coalesced == 1
+
+
+def test_full_queue_leaves_alert_to_retry(monkeypatch):
+    async def run():
+        dispatcher = AlertDispatcher(capacity=1, window=0, rate=1, burst=1)
+        dispatcher.submit(alert("DOWN", "other"))  # queue now full
+        monkeypatch.setattr(alert_service, "dispatcher", dispatcher)
+        monkeypatch.setattr(alert_service, "ALERT_CHANNEL_ID", 1)
+
+        target = Target(name="svc", url="https://svc.test")
+        target.fails = ALERT_FAILURE_THRESHOLD
+        await alert_service.handle_alerts(FakeBot(), target=target)
+        assert not target.alerted_down and dispatcher.dropped == 1
+
+        dispatcher._queue.get_nowait()
+        await alert_service.handle_alerts(FakeBot(), target=target)
+        assert target.alerted_down
+
+        # the RECOVERY is retried the same way (the DOWN fills the queue)
+        target.fails = 0
+        await alert_service.handle_alerts(FakeBot(), target=target)
+        assert target.alerted_down
+
+        dispatcher._queue.get_nowait()
+        await alert_service.handle_alerts(FakeBot(), target=target)
+        assert not target.alerted_down
+
+    asyncio.run(run())
@@ -0,0 +1,78 @@
+"""
+Check Engine Tests
+Copyright (c) 2025 Mac GunJon
+Throughput under partial outages
+"""
+
+import asyncio
+
+from data.models import Target
+from services import check_engine
+from services.check_engine import CheckEngine
+from services.limiter import AdaptiveLimiter
+from services.scheduler import DeadlineScheduler
+from services.single_flight import SingleFlight
+
+INTERVAL = 0.25  # seconds between checks of one target
+HEALTHY_LATENCY = 0.02
+TIMEOUT = 0.05  # dead targets fail after this long
+RUN_FOR = 1.5
+TARGETS = 20  # healthy targets (and as many dead ones when half fail)
+
+
+async def fake_probe(session, *, url, mode, phases):
+    if "dead" in url:
+        await asyncio.sleep(TIMEOUT)
+        raise asyncio.TimeoutError()
+    await asyncio.sleep(HEALTHY_LATENCY)
+    return 200
+
+
+async def healthy_checks(*, dead: int) -> tuple:
+    """
+    Final results for healthy targets within RUN_FOR, and the
+    concurrency limit at the end.
+    """
+    limiter = AdaptiveLimiter(initial=16, floor=2, ceiling=16)
+    completed = 0
+
+    async def on_result(target, result):
+        nonlocal completed
+        if "healthy" in target.url:
+            completed += 1
+
+    engine = CheckEngine(
+        session=None,
+        scheduler=DeadlineScheduler(INTERVAL),
+        limiter=limiter,
+        on_result=on_result,
+    )
+    engine.flights = SingleFlight(0)  # every check really probes
+
+    targets = [
+        Target(name=f"h{i}", url=f"https://healthy-{i}.test")
+        for i in range(TARGETS)
+    ] + [
+        Target(name=f"d{i}", url=f"https://dead-{i}.test")
+        for i in range(dead)
+    ]
+    engine.sync({t.key: t for t in targets})
+
+    runner = asyncio.create_task(engine.run())
+    await asyncio.sleep(RUN_FOR)
+    runner.cancel()
+    return completed, limiter.limit
+
+
+def test_throughput_flat_when_half_the_targets_time_out(monkeypatch):
+    monkeypatch.setattr(check_engine, "run_probe", fake_probe)
+    monkeypatch.setattr(check_engine, "RETRY_BACKOFF", 0.05)
+
+    baseline, _ = asyncio.run(healthy_checks(dead=0))
+    degraded, limit = asyncio.run(healthy_checks(dead=TARGETS))
+
+    # retries back off outside the slot and remote timeouts do not
+    # shrink the limit, so healthy targets keep their cadence
+    assert baseline > 0
+    assert degraded >= baseline * 0.9
+    assert limit == 16
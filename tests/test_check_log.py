@@ -0,0 +1,69 @@
+"""
+Check Log Tests
+Copyright (c) 2025 Mac GunJon
+Per-target segment index
+"""
+
+import os
+
+from data.check_log import INDEX_SUFFIX, RECORD, CheckLog
+
+TARGETS = 5
+RECORDS = 600
+
+
+def fill(directory) -> CheckLog:
+    log = CheckLog(
+        str(directory), segment_bytes=RECORD.size * 100, retention=86400
+    )
+    log.open()
+    for i in range(RECORDS):
+        log.append(
+            i % TARGETS + 1,
+            timestamp=1000.0 + i,
+            status=200 if i % 7 else "DOWN",
+            latency=None if i % 7 == 0 else i / 1000,
+            failed=i % 7 == 0,
+        )
+    log.flush()
+    return log
+
+
+def scan(log: CheckLog, target_id: int, since: float, until: float) -> list:
+    return list(
+        CheckLog.scan(log.segments(), target_id, since=since, until=until)
+    )
+
+
+def test_indexed_scan_matches_full_scan(tmp_path):
+    log = fill(tmp_path)
+    windows = [(0, 5000), (1050.5, 1333), (1299, 1301), (1599, 9999)]
+    expected = {
+        (tid, window): scan(log, tid, *window)
+        for tid in range(1, TARGETS + 2)
+        for window in windows
+    }
+
+    log.compact(log.sealed_segments(), range(1, TARGETS + 1), now=1600)
+    indexes = [n for n in os.listdir(tmp_path) if n.endswith(INDEX_SUFFIX)]
+    assert len(indexes) == len(log.sealed_segments()) == RECORDS // 100
+
+    for (tid, window), records in expected.items():
+        assert scan(log, tid, *window) == records
+    assert len(expected[(1, (0, 5000))]) == RECORDS // TARGETS
+    log.close()
+
+
+def test_compaction_reindexes_rewritten_segments(tmp_path):
+    log = fill(tmp_path)
+    log.compact(log.sealed_segments(), range(1, TARGETS + 1), now=1600)
+
+    # target 2 removed: its records go, the index follows
+    log.compact(log.sealed_segments(), {1, 3, 4, 5}, now=1600)
+
+    assert scan(log, 2, 0, 1499) == []
+    records = scan(log, 3, 0, 5000)
+    assert [r.timestamp for r in records] == [
+        1000.0 + i for i in range(2, RECORDS, TARGETS)
+    ]
+    log.close()
@@ -0,0 +1,110 @@
+"""
+Correlation Tests
+Copyright (c) 2025 Mac GunJon
+Incidents open and resolve through the result path
+"""
+
+import asyncio
+
+from core.config import ALERT_FAILURE_THRESHOLD
+from data.models import Alert
+from data.store import MonitorStore
+from services import alert_service, correlation, monitor_service
+from services.alert_dispatch import AlertDispatcher
+from services.check_engine import CheckResult
+from services.correlation import Correlator
+
+GUILD = 1
+MEMBERS = 3
+
+
+class FakeBot:
+    def get_channel(self, channel_id):
+        return object()
+
+
+def drain(dispatcher: AlertDispatcher) -> list:
+    alerts = []
+    while not dispatcher._queue.empty():
+        alerts.append(dispatcher._queue.get_nowait())
+    return alerts
+
+
+def test_incident_resolves_when_last_member_recovers(monkeypatch):
+    async def run():
+        store = MonitorStore()
+        dispatcher = AlertDispatcher(capacity=100, window=0, rate=1, burst=1)
+        correlator = Correlator(min_targets=MEMBERS, window=60)
+        monkeypatch.setattr(monitor_service, "store", store)
+        monkeypatch.setattr(alert_service, "dispatcher", dispatcher)
+        monkeypatch.setattr(alert_service, "ALERT_CHANNEL_ID", 1)
+
+        # IP literals share a cause without DNS
+        for i in range(MEMBERS):
+            await store.add(
+                guild_id=GUILD, name=f"svc-{i}", url=f"http://192.0.2.1/{i}"
+            )
+        targets = await store.all()
+        bot = FakeBot()
+
+        async def check(target, *, failed: bool):
+            result = (
+                CheckResult(target.key, None, None, {}, "timeout") if failed
+                else CheckResult(target.key, 200, 0.1, {})
+            )
+            await monitor_service.apply_results(bot, [(target, result)])
+            return await correlator.process(drain(dispatcher))
+
+        for _ in range(ALERT_FAILURE_THRESHOLD):
+            events = [await check(t, failed=True) for t in targets]
+        assert [e.kind for e in events[-1][1]] == ["opened"]
+        assert all(t.alerted_down for t in targets)
+
+        for target in targets[:-1]:
+            plain, events = await check(target, failed=False)
+            assert plain == [] and events == []
+            assert not target.alerted_down
+
+        plain, events = await check(targets[-1], failed=False)
+        assert plain == []
+        assert [e.kind for e in events] == ["resolved"]
+        assert correlator.stats()["open"] == 0
+        assert not targets[-1].alerted_down
+
+    asyncio.run(run())
+
+
+def test_quiet_error_incident_takes_no_new_members(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(correlation.time, "monotonic", lambda: clock[0])
+    correlator = Correlator(min_targets=2, window=60)
+    needed = 2 * correlation.ERROR_CAUSE_FACTOR
+
+    def down(i: int) -> Alert:
+        # distinct IPs: only the failure class is shared
+        return Alert(
+            "DOWN", f"k{i}", f"svc-{i}", f"http://192.0.2.{i}/", 3, "timeout"
+        )
+
+    async def run():
+        _, events = await correlator.process([down(i) for i in range(needed)])
+        incident = events[0].incident
+        assert incident.cause == "error:timeout"
+
+        clock[0] += 30  # within the window of the newest member
+        plain, _ = await correlator.process([down(needed)])
+        assert plain == [] and f"k{needed}" in incident.members
+
+        clock[0] += 61  # the incident has gone quiet
+        plain, events = await correlator.process([down(needed + 1)])
+        assert plain == [down(needed + 1)] and events == []
+        assert f"k{needed + 1}" not in incident.members
+
+        # its members still resolve it
+        for i in range(needed + 1):
+            _, events = await correlator.process(
+                [Alert("UP", f"k{i}", f"svc-{i}", f"http://192.0.2.{i}/", 0)]
+            )
+        assert [e.kind for e in events] == ["resolved"]
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+"""
+Rollup Tests
+Copyright (c) 2025 Mac GunJon
+Sliding uptime from the rollup tiers
+"""
+
+from data.rollups import UPTIME_WINDOWS, Rollups
+
+START = 1_700_000_000 // 86400 * 86400  # midnight, so windows align
+
+
+def test_uptime_windows_match_summaries():
+    rollups = Rollups()
+    # a week at 60s, failing for the last 30 minutes of each hour
+    for i in range(7 * 1440):
+        now = START + i * 60
+        rollups.record(now, failed=i % 60 >= 30, latency=0.1)
+    now = START + 7 * 86400 - 1
+
+    for seconds in UPTIME_WINDOWS.values():
+        since = now - seconds + 1
+        assert rollups.uptime(since, now) == rollups.summarize(since, now)["uptime"]
+        assert rollups.uptime(since, now) == 50.0
+
+    assert rollups.uptime(now + 3600, now + 7200) is None
+
+
+def test_stale_buckets_are_ignored():
+    rollups = Rollups()
+    rollups.record(START, failed=True, latency=None)
+    later = START + 3 * 86400
+    rollups.record(later, failed=False, latency=0.2)
+
+    assert rollups.uptime(later - UPTIME_WINDOWS["24h"], later) == 100.0
+    assert rollups.uptime(later - UPTIME_WINDOWS["7d"], later) == 50.0
+
+
+def test_packed_rollups_match_live_ones():
+    rollups = Rollups()
+    for i in range(10 * 24):  # hourly for 10 days, with a 2 day gap
+        if not 100 <= i < 148:
+            rollups.record(START + i * 3600, failed=i % 4 == 0, latency=0.1)
+    now = START + 10 * 86400 - 1
+
+    packed = Rollups.packed(rollups.to_bytes(first_tier=1))
+    for seconds in (86400, 3 * 86400, 7 * 86400, 60 * 86400):
+        since = now - seconds + 1
+        assert packed.uptime(since, now) == rollups.uptime(since, now)
+
+    # first write unpacks; the minute tier starts empty
+    assert packed.summarize(now - 86400, now) == rollups.summarize(now - 86400, now)
+    packed.record(now, failed=False, latency=0.1)
+    assert packed.summarize(now - 600, now)["checks"] == 1
@@ -0,0 +1,92 @@
+"""
+Latency Sketch Tests
+Copyright (c) 2025 Mac GunJon
+Relative error guarantee and merging
+"""
+
+import random
+
+from data.sketch import (
+    SKETCH_ALPHA,
+    SKETCH_BUCKETS,
+    SKETCH_RESOLUTION,
+    DDSketch,
+    LatencySketches,
+)
+
+QUANTILES = [i / 100 for i in range(101)]
+
+
+def samples(seed: int, count: int=5000) -> list:
+    rng = random.Random(seed)
+    return [rng.lognormvariate(-2.0, 1.0) for _ in range(count)]
+
+
+def sketch_of(values) -> DDSketch:
+    sketch = DDSketch()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def assert_within_alpha(sketch: DDSketch, values):
+    ordered = sorted(values)
+    for q in QUANTILES:
+        exact = ordered[int(q * (len(ordered) - 1))]
+        estimate = sketch.quantile(q)
+        assert abs(estimate - exact) <= SKETCH_ALPHA * exact, (q, exact, estimate)
+
+
+def test_quantiles_within_relative_error():
+    values = samples(1)
+    assert_within_alpha(sketch_of(values), values)
+
+
+def test_high_quantiles_hold_after_low_bins_collapse():
+    # 1µs..100s spans more bins than SKETCH_MAX_BINS keeps
+    rng = random.Random(2)
+    values = [10 ** rng.uniform(-6, 2) for _ in range(5000)]
+    sketch = sketch_of(values)
+    ordered = sorted(values)
+
+    for q in (0.5, 0.9, 0.99, 1.0):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= SKETCH_ALPHA * exact
+
+
+def test_merge_equals_sketch_of_union():
+    left, right = samples(3), [v * 10 for v in samples(4, 2000)]
+    merged = sketch_of(left)
+    merged.merge(sketch_of(right))
+    union = sketch_of(left + right)
+
+    assert merged.count == union.count == len(left) + len(right)
+    assert merged.min == union.min and merged.max == union.max
+    assert merged._offset == union._offset and merged._bins == union._bins
+    for q in QUANTILES:
+        assert merged.quantile(q) == union.quantile(q)
+    assert_within_alpha(merged, left + right)
+
+
+def test_window_merges_buckets_it_spans():
+    sketches = LatencySketches()
+    values = samples(5, SKETCH_BUCKETS * 100)
+    start = 100 * SKETCH_RESOLUTION
+    step = SKETCH_RESOLUTION / 100
+    for i, value in enumerate(values):
+        sketches.record(start + i * step, value)
+    end = start + len(values) * step - 1
+
+    last = sketches.window(end - 1, end)
+    assert last.count == 100
+    assert_within_alpha(last, values[-100:])
+
+    day = sketches.window(end - SKETCH_BUCKETS * SKETCH_RESOLUTION, end)
+    assert day.count == len(values)
+    assert_within_alpha(day, values)
+
+    # a bucket's slot is reused once it falls out of the window
+    sketches.record(end + SKETCH_RESOLUTION, 1.0)
+    assert sketches.window(start, end + SKETCH_RESOLUTION).count == (
+        len(values) - 100 + 1
+    )
@@ -0,0 +1,51 @@
+"""
+Snapshot Tests
+Copyright (c) 2025 Mac GunJon
+Warm restart round trip
+"""
+
+import asyncio
+
+from data.store import MonitorStore
+
+GUILD = 42
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "state.snap")
+
+    async def run():
+        store = MonitorStore()
+        await store.add(guild_id=GUILD, name="Api", url="https://api.example")
+        await store.add(guild_id=GUILD, name="Ünïcode", url="https://u.example")
+        await store.update_status(
+            key=f"{GUILD}:https://api.example", status=503, failed=True,
+        )
+        await store.update_status(
+            key=f"{GUILD}:https://u.example", status=200, failed=False,
+            response_time=0.1,
+        )
+        await store.save_snapshot(path)
+
+        restored = MonitorStore()
+        await restored.load_snapshot(path)
+        restored._snapshotter.cancel()
+
+        api = await restored.get_by_name(GUILD, "api")
+        assert (api.last_status, api.fails, api.checks) == (503, 1, 1)
+        unicode = await restored.get_by_name(GUILD, "ünïcode")
+        assert unicode.success == 1
+        assert unicode.rollups.uptime(0, unicode.last_checked + 1) == 100.0
+
+        view = {t.name: t for t in await restored.view(GUILD)}
+        assert sorted(view) == ["Api", "Ünïcode"]
+        assert view["Ünïcode"].uptime_24h == 100.0
+
+        # still packed: saving again writes the same rollups
+        await restored.save_snapshot(path)
+        again = MonitorStore()
+        await again.load_snapshot(path)
+        again._snapshotter.cancel()
+        assert (await again.get_by_name(GUILD, "api")).fails == 1
+
+    asyncio.run(run())
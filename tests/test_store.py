@@ -0,0 +1,59 @@
+"""
+Store Tests
+Copyright (c) 2025 Mac GunJon
+Claiming services created before guild partitioning
+"""
+
+import asyncio
+
+from data.partition import NO_GUILD
+from data.store import MonitorStore
+
+GUILD = 42
+URL = "https://legacy.example"
+
+
+async def legacy_store() -> MonitorStore:
+    store = MonitorStore()
+    await store.add(guild_id=NO_GUILD, name="Legacy", url=URL)
+    await store.update_status(key=URL, status=200, failed=False, response_time=0.1)
+    return store
+
+
+def test_claim_moves_legacy_target_into_guild():
+    async def run():
+        store = await legacy_store()
+        target = await store.get_by_name(NO_GUILD, "legacy")
+        revision = store.revision
+
+        assert await store.claim(GUILD, "legacy")
+
+        assert await store.get_by_name(NO_GUILD, "Legacy") is None
+        assert await store.get_by_name(GUILD, "Legacy") is target
+        assert target.key == f"{GUILD}:{URL}"
+        assert await store.get_by_key(URL) is None
+        assert await store.get_by_key(target.key) is target
+        assert target.checks == 1
+        assert store.revision > revision
+
+        assert [t.name for t in await store.view(GUILD)] == ["Legacy"]
+        assert len(await store.view(NO_GUILD)) == 0
+
+        # results now land under the guild key
+        await store.update_status(key=target.key, status=200, failed=False)
+        assert target.checks == 2
+
+    asyncio.run(run())
+
+
+def test_claim_refused_on_conflict_or_missing():
+    async def run():
+        store = await legacy_store()
+        await store.add(guild_id=GUILD, name="Other", url=URL)
+
+        assert not await store.claim(GUILD, "Legacy")  # URL taken
+        assert not await store.claim(GUILD, "Missing")
+        assert not await store.claim(NO_GUILD, "Legacy")
+        assert await store.get_by_name(NO_GUILD, "Legacy")
+
+    asyncio.run(run())